@@ -0,0 +1,216 @@
+"""
+Export API
+
+Bulk downloads of games and the feature matrix as CSV, NDJSON, Arrow or
+Parquet. Rows are read with a server-side cursor in batches of
+export_batch_size and each batch is encoded and sent before the next is
+fetched, so memory stays flat however many rows are exported.
+
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Select, and_, case, or_, select
+
+from app.config import get_settings
+from app.database.session import SessionLocal
+from app.models import Game
+from app.services.team_features import GAME_COLUMNS, matchup_select
+from app.services.team_registry import get_team_registry
+
+# pyarrow is only loaded by the first Arrow or Parquet export
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+    arrow = "arrow"
+    parquet = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv",
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.arrow: "application/vnd.apache.arrow.stream",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+
+def _arrow_type(sql_type) -> "pa.DataType":
+    import pyarrow as pa
+
+    # Explicit types so every batch has the same schema, even when a batch is all nulls
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def arrow_schema(stmt: Select) -> "pa.Schema":
+    import pyarrow as pa
+
+    return pa.schema([(column.name, _arrow_type(column.type)) for column in stmt.selected_columns])
+
+
+def stream_rows(stmt: Select, batch_size: int) -> Iterator[tuple[list[str], list[tuple]]]:
+    """
+    Yield (column names, rows) one batch at a time from a server-side cursor.
+
+    An empty result still yields one empty batch, so CSV gets its header.
+    """
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        columns = list(result.keys())
+        empty = True
+        for partition in result.partitions():
+            empty = False
+            yield columns, partition
+        if empty:
+            yield columns, []
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that hands written bytes back to the generator instead of keeping them.
+    """
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def encode_csv(batches: Iterator[tuple[list[str], list[tuple]]]) -> Iterator[str]:
+    header_written = False
+    for columns, rows in batches:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+def encode_ndjson(batches: Iterator[tuple[list[str], list[tuple]]]) -> Iterator[str]:
+    for columns, rows in batches:
+        yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows)
+
+
+def encode_arrow(batches: Iterator[tuple[list[str], list[tuple]]], schema: "pa.Schema", parquet: bool) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    if parquet:
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        for _, rows in batches:
+            if not rows:
+                continue
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)]
+            batch = pa.RecordBatch.from_arrays(arrays, schema=schema)
+            if parquet:
+                # One row group per batch, flushed as soon as it's written
+                writer.write_batch(batch, row_group_size=len(rows))
+            else:
+                writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_response(stmt: Select, fmt: ExportFormat, name: str) -> StreamingResponse:
+    batches = stream_rows(stmt, get_settings().export_batch_size)
+
+    if fmt is ExportFormat.csv:
+        body = encode_csv(batches)
+    elif fmt is ExportFormat.ndjson:
+        body = encode_ndjson(batches)
+    else:
+        body = encode_arrow(batches, arrow_schema(stmt), parquet=fmt is ExportFormat.parquet)
+
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt.value}"'},
+    )
+
+
+def _filter(stmt: Select, season: int | None, team: str | None) -> tuple[Select, str]:
+    """
+    Apply the season and team filters, and build a file name from them.
+    """
+    parts = []
+    if season is not None:
+        stmt = stmt.where(Game.season == season)
+        parts.append(str(season))
+    if team is not None:
+        info = get_team_registry().by_abbreviation(team)
+        if info is None:
+            raise HTTPException(status_code=404, detail=f"Unknown team {team}")
+        stmt = stmt.where(or_(Game.home_team_id == info.team_id, Game.away_team_id == info.team_id))
+        parts.append(info.team_abbreviation)
+    return stmt.order_by(Game.game_date, Game.game_id), "_".join(parts) or "all"
+
+
+@router.get("/games")
+def export_games(
+    format: ExportFormat = ExportFormat.csv,
+    season: int | None = None,
+    team: str | None = None,
+) -> StreamingResponse:
+    stmt = select(*(getattr(Game, column) for column in GAME_COLUMNS), Game.is_playoffs)
+    stmt, suffix = _filter(stmt, season, team)
+    return export_response(stmt, format, f"games_{suffix}")
+
+
+@router.get("/features")
+def export_features(
+    format: ExportFormat = ExportFormat.csv,
+    season: int | None = None,
+    team: str | None = None,
+) -> StreamingResponse:
+    played = and_(Game.game_status == "final", Game.home_score.is_not(None), Game.away_score.is_not(None))
+    home_win = case((played, case((Game.home_score > Game.away_score, 1), else_=0)), else_=None)
+
+    stmt = matchup_select().add_columns(home_win.label("home_win"))
+    stmt, suffix = _filter(stmt, season, team)
+    return export_response(stmt, format, f"features_{suffix}")
@@ -0,0 +1,136 @@
+"""
+Games API
+
+Game listings, newest first, with keyset pagination on
+(game_date, game_id). The cursor encodes the last row of the previous
+page, so every page is an index range scan no matter how deep it is.
+Teams come from the in-memory registry, so only games are queried.
+
+Responses carry an ETag for the newest games.updated_at, so a client
+polling for changes gets a 304 after one index lookup.
+
+"""
+
+import base64
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Select, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.session import get_async_db
+from app.models import Game
+from app.schemas.game import GameOut, GamePage
+from app.services.team_registry import TeamRegistry, get_team_registry
+from app.utils.http_cache import not_modified_response
+
+router = APIRouter(tags=["games"])
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(game: Game) -> str:
+    raw = f"{game.game_date.isoformat()}|{game.game_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[date, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        game_date, game_id = raw.split("|", 1)
+        return date.fromisoformat(game_date), game_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def game_out(game: Game, registry: TeamRegistry) -> GameOut:
+    """
+    Build the response for a game, filling in its teams from the registry.
+    """
+    return GameOut(
+        game_id=game.game_id,
+        game_date=game.game_date,
+        season=game.season,
+        home_team=registry.by_id(game.home_team_id),
+        away_team=registry.by_id(game.away_team_id),
+        home_score=game.home_score,
+        away_score=game.away_score,
+        game_status=game.game_status,
+        is_playoffs=game.is_playoffs,
+    )
+
+
+async def games_version(db: AsyncSession) -> datetime | None:
+    # Served by ix_games_updated_at, whatever the filters
+    return await db.scalar(select(func.max(Game.updated_at)))
+
+
+async def _page(db: AsyncSession, stmt: Select, limit: int, cursor: str | None) -> GamePage:
+    """
+    Apply the cursor and ordering to a games query and fetch one page.
+    """
+    if cursor:
+        stmt = stmt.where(tuple_(Game.game_date, Game.game_id) < decode_cursor(cursor))
+
+    stmt = (
+        stmt.order_by(Game.game_date.desc(), Game.game_id.desc())
+        .limit(limit + 1)  # One extra row tells us if there's another page
+    )
+
+    games = (await db.scalars(stmt)).all()
+    has_more = len(games) > limit
+    games = games[:limit]
+
+    registry = get_team_registry()
+    return GamePage(
+        items=[game_out(game, registry) for game in games],
+        next_cursor=encode_cursor(games[-1]) if has_more else None,
+    )
+
+
+@router.get("/games", response_model=GamePage)
+async def list_games(
+    request: Request,
+    response: Response,
+    season: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> GamePage | Response:
+    version = await games_version(db)
+    not_modified = not_modified_response(request, response, version, get_team_registry().version)
+    if not_modified is not None:
+        return not_modified
+
+    stmt = select(Game)
+    if season is not None:
+        stmt = stmt.where(Game.season == season)
+    return await _page(db, stmt, limit, cursor)
+
+
+@router.get("/teams/{abbr}/games", response_model=GamePage)
+async def list_team_games(
+    request: Request,
+    response: Response,
+    abbr: str,
+    season: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> GamePage | Response:
+    team = get_team_registry().by_abbreviation(abbr)
+    if team is None:
+        raise HTTPException(status_code=404, detail=f"Unknown team {abbr}")
+    team_id = team.team_id
+
+    version = await games_version(db)
+    not_modified = not_modified_response(request, response, version, get_team_registry().version)
+    if not_modified is not None:
+        return not_modified
+
+    # Served by the (home_team_id, game_date) and (away_team_id, game_date) indexes
+    stmt = select(Game).where(or_(Game.home_team_id == team_id, Game.away_team_id == team_id))
+    if season is not None:
+        stmt = stmt.where(Game.season == season)
+    return await _page(db, stmt, limit, cursor)
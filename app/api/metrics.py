@@ -0,0 +1,32 @@
+"""
+Metrics API
+
+Request latency, throughput and database usage per route, in the
+Prometheus text format for scraping, plus the query profiler's
+statements ranked by total time.
+
+"""
+
+from fastapi import APIRouter, Query
+from fastapi.responses import PlainTextResponse
+
+from app.database.session import get_engine
+from app.utils.metrics import CONTENT_TYPE, registry
+from app.utils.query_profiler import get_query_profiler
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    # Async so it renders on the event loop, the thread the middleware writes from
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
+@router.get("/metrics/queries")
+def get_query_report(
+    top: int = Query(20, ge=1, le=200),
+    explain: bool = False,
+) -> list[dict]:
+    # EXPLAIN runs each plan query now, on the sync engine
+    return get_query_profiler().report(top, explain_engine=get_engine() if explain else None)
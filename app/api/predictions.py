@@ -0,0 +1,112 @@
+"""
+Predictions API
+
+Home win probabilities for a day's games. The model stays loaded in
+memory, so a request is one feature query plus one batched
+predict_proba call for the games not already in the prediction cache.
+A repeat request for the same date is served from the cached slate.
+
+The date's data version is the newest update to its games and their Elo
+ratings, which build_team_stats rewrites along with the games' team
+stats. Together with the model version it gives the response's ETag and
+keys the slate cache, so a 304 or a cached slate is never older than
+the data.
+
+"""
+
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database.session import get_async_db
+from app.ml.prediction_cache import get_prediction_cache
+from app.ml.predictor import ModelNotAvailableError, Predictor, get_predictor, predict_slate
+from app.models import Game, GameRating
+from app.schemas.prediction import PredictionOut, PredictionSlate
+from app.services.team_registry import TeamRegistry, get_team_registry
+from app.utils.http_cache import not_modified_response
+
+router = APIRouter(tags=["predictions"])
+
+
+def prediction_out(game, registry: TeamRegistry, threshold: float) -> PredictionOut:
+    """
+    Build the response for one scored row of the slate.
+    """
+    home_team = registry.by_id(game.home_team_id)
+    away_team = registry.by_id(game.away_team_id)
+    probability = float(game.home_win_probability)
+
+    return PredictionOut(
+        game_id=game.game_id,
+        game_date=game.game_date.date() if isinstance(game.game_date, datetime) else game.game_date,
+        home_team=home_team,
+        away_team=away_team,
+        game_status=game.game_status,
+        home_win_probability=probability,
+        predicted_winner=home_team if probability >= 0.5 else away_team,
+        confident=max(probability, 1 - probability) >= threshold,
+    )
+
+
+def _predictor() -> Predictor:
+    try:
+        return get_predictor()
+    except ModelNotAvailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+async def slate_version(db: AsyncSession, game_date: date) -> datetime | None:
+    # Served by the game_date index and the game_ratings primary key
+    row = (await db.execute(
+        select(func.max(Game.updated_at), func.max(GameRating.updated_at))
+        .select_from(Game)
+        .outerjoin(GameRating, GameRating.game_id == Game.game_id)
+        .where(Game.game_date == game_date)
+    )).one()
+    return max((moment for moment in row if moment is not None), default=None)
+
+
+@router.get("/predictions", response_model=PredictionSlate)
+async def list_predictions(
+    request: Request,
+    response: Response,
+    game_date: date | None = Query(None, alias="date", description="Defaults to today"),
+    db: AsyncSession = Depends(get_async_db),
+) -> PredictionSlate | Response:
+    predictor = _predictor()
+    game_date = game_date or date.today()
+    threshold = get_settings().prediction_confidence_threshold
+
+    # Teams are embedded in the response, so a reloaded registry is a new version too
+    version = (await slate_version(db, game_date), get_team_registry().version)
+    not_modified = not_modified_response(request, response, *version, predictor.version, threshold)
+    if not_modified is not None:
+        return not_modified
+
+    cache = get_prediction_cache()
+    cached = cache.get_slate(game_date, predictor.version, version)
+    if cached is not None:
+        return cached
+
+    # The feature query goes through pandas, which needs a sync connection
+    slate = await db.run_sync(predict_slate, predictor, game_date, cache)
+
+    registry = get_team_registry()
+    result = PredictionSlate(
+        date=game_date,
+        model_version=predictor.version,
+        predictions=[prediction_out(game, registry, threshold) for game in slate.itertuples(index=False)],
+    )
+
+    team_ids = {int(team_id) for column in ("home_team_id", "away_team_id") for team_id in slate[column]}
+    cache.put_slate(game_date, predictor.version, result, team_ids, version)
+    return result
+
+
+@router.get("/predictions/cache")
+def prediction_cache_stats() -> dict:
+    return get_prediction_cache().summary()
@@ -0,0 +1,106 @@
+"""
+Standings API
+
+Season standings read from team_season_summary, which fetch_games keeps
+up to date. A request is one primary key range read of at most 30 rows;
+ranks and games behind are worked out in memory.
+
+The ETag follows the season's newest summary row and the number of
+rows, so a repeat request between refreshes is a 304 after reading one
+column of the same rows, and a deleted row still changes it.
+
+"""
+
+from datetime import datetime
+from itertools import groupby
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.session import get_async_db
+from app.models import TeamSeasonSummary
+from app.schemas.standings import StandingOut, Standings
+from app.services.team_registry import TeamRegistry, get_team_registry
+from app.utils.http_cache import not_modified_response
+
+router = APIRouter(tags=["standings"])
+
+
+# Copied from each summary row onto the response
+RECORD_FIELDS = [
+    "games_played", "wins", "losses", "win_pct",
+    "home_wins", "home_losses", "away_wins", "away_losses",
+    "points_for", "points_against", "avg_margin", "last_game_date",
+]
+
+
+def empty_summary(season: int, team_id: int) -> TeamSeasonSummary:
+    return TeamSeasonSummary(
+        season=season,
+        team_id=team_id,
+        **{field: 0 for field in RECORD_FIELDS if field != "last_game_date"},
+        last_game_date=None,
+    )
+
+
+def conference_standings(season: int, summaries: list[TeamSeasonSummary], registry: TeamRegistry) -> list[StandingOut]:
+    """
+    Rank teams within their conference and add games behind the leader.
+
+    Teams in the registry without any final games yet are listed at 0-0.
+    """
+    by_team = {summary.team_id: summary for summary in summaries}
+    rows = [(team, by_team.get(team.team_id) or empty_summary(season, team.team_id)) for team in registry]
+    rows.sort(key=lambda row: (row[0].conference or "", -row[1].win_pct, -row[1].wins, row[0].team_abbreviation))
+
+    standings = []
+    for _, conference_rows in groupby(rows, key=lambda row: row[0].conference or ""):
+        conference_rows = list(conference_rows)
+        leader = conference_rows[0][1]
+
+        for rank, (team, summary) in enumerate(conference_rows, start=1):
+            standings.append(StandingOut(
+                team=team,
+                conference=team.conference,
+                division=team.division,
+                conference_rank=rank,
+                games_behind=((leader.wins - summary.wins) + (summary.losses - leader.losses)) / 2,
+                **{field: getattr(summary, field) for field in RECORD_FIELDS},
+            ))
+
+    return standings
+
+
+async def standings_version(db: AsyncSession, season: int) -> tuple[datetime | None, int]:
+    """
+    Returns: Newest updated_at of the season's summary rows, and how many there are
+    """
+    # refresh_team_summaries rewrites a team's row whenever its record changes;
+    # the count catches rows that were deleted
+    last_modified, rows = (await db.execute(
+        select(func.max(TeamSeasonSummary.updated_at), func.count()).where(TeamSeasonSummary.season == season)
+    )).one()
+    return last_modified, rows
+
+
+@router.get("/standings", response_model=Standings)
+async def get_standings(
+    request: Request,
+    response: Response,
+    season: int,
+    db: AsyncSession = Depends(get_async_db),
+) -> Standings | Response:
+    last_modified, rows = await standings_version(db, season)
+    not_modified = not_modified_response(request, response, last_modified, rows, get_team_registry().version)
+    if not_modified is not None:
+        return not_modified
+
+    # Served by the (season, team_id) primary key
+    summaries = (await db.scalars(
+        select(TeamSeasonSummary).where(TeamSeasonSummary.season == season)
+    )).all()
+    if not summaries:
+        raise HTTPException(status_code=404, detail=f"No standings for season {season}")
+
+    return Standings(season=season, standings=conference_standings(season, summaries, get_team_registry()))
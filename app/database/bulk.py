@@ -0,0 +1,299 @@
+"""
+Bulk write helpers
+
+Set-based upserts so loaders don't need one existence query per row.
+PostgreSQL uses INSERT ... ON CONFLICT DO UPDATE, SQLite (used for local
+testing) uses its equivalent upsert syntax. team_stats, the largest
+table, is streamed with COPY into a staging table on PostgreSQL.
+
+"""
+
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Table, func, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import Game, GameRating, Odds, TeamStats
+from app.services.elo import RATING_COLUMNS
+from app.services.team_features import FEATURE_COLUMNS
+
+# Frames only come in from loaders, which have pandas loaded already
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Columns that change once a scheduled game is played
+GAME_UPDATE_COLUMNS = ("game_date", "home_score", "away_score", "game_status")
+
+# Returned by upsert_games for the games it changed
+CHANGED_GAME_COLUMNS = ("game_id", "season", "home_team_id", "away_team_id", "game_status")
+
+TEAM_STATS_COLUMNS = ("team_id", "game_id", "season", *FEATURE_COLUMNS)
+
+# Everything about a bookmaker line that can move
+ODDS_UPDATE_COLUMNS = (
+    "home_price", "away_price", "home_point", "away_point",
+    "total_point", "over_price", "under_price", "last_update",
+)
+
+# Python tuples/dicts take a few times the memory of the same rows in a DataFrame
+PYTHON_ROW_OVERHEAD = 4
+
+# SQLite refuses statements with more bound parameters than this
+SQLITE_MAX_PARAMS = 32766
+
+# Called with the team_ids whose team_stats rows were just rewritten
+_team_stats_listeners: list[Callable[[set[int]], None]] = []
+
+
+def on_team_stats_written(listener: Callable[[set[int]], None]) -> Callable[[set[int]], None]:
+    """
+    Register a callback fired after write_team_stats, e.g. to drop cached predictions.
+    """
+    _team_stats_listeners.append(listener)
+    return listener
+
+
+@dataclass
+class BulkWriteReport:
+    rows: int
+    seconds: float
+    chunks: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.rows} rows in {self.seconds:.2f}s "
+            f"({self.rows_per_second:,.0f} rows/sec, {self.chunks} chunks)"
+        )
+
+
+def frame_to_records(frame: "pd.DataFrame") -> list[dict]:
+    """
+    Convert a DataFrame into plain dicts, with missing values as None.
+    """
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def rows_per_chunk(frame: "pd.DataFrame", memory_budget_mb: float) -> int:
+    """
+    How many rows of frame can be converted to Python objects within the budget.
+    """
+    if frame.empty:
+        return 1
+    bytes_per_row = frame.memory_usage(deep=True, index=False).sum() / len(frame)
+    budget = memory_budget_mb * 1024 * 1024
+    return max(1, int(budget // (bytes_per_row * PYTHON_ROW_OVERHEAD)))
+
+
+def _insert_for(db: Session, table: Table):
+    # Pick the dialect specific insert that supports ON CONFLICT
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table)
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Bulk upsert is not supported for {dialect}")
+
+
+def _chunks(rows: Sequence[dict], size: int) -> Iterable[Sequence[dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def upsert_rows(
+    db: Session,
+    table: Table,
+    rows: Sequence[dict],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    extra_updates: dict | None = None,
+    chunk_size: int = 500,
+    returning: Sequence[str] | None = None,
+) -> list:
+    """
+    Insert rows, updating the given columns when the conflict key already exists.
+
+    Rows whose update columns are unchanged are left alone, so re-loading
+    the same data does not rewrite it.
+
+    Returns: The returning columns (default: the conflict columns) of each
+    row inserted or updated
+    """
+    stmt = _insert_for(db, table)
+    excluded = stmt.excluded
+
+    set_ = {column: excluded[column] for column in update_columns}
+    set_.update(extra_updates or {})
+
+    # Only touch rows where something actually changed
+    differs = or_(*(table.c[column].is_distinct_from(excluded[column]) for column in update_columns))
+
+    # RETURNING only yields inserted or updated rows, which gives a reliable
+    # count (drivers don't agree on rowcount for executemany)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_=set_,
+        where=differs,
+    ).returning(*(table.c[column] for column in returning or conflict_columns))
+
+    # One compiled statement, sent in batches
+    changed = []
+    for chunk in _chunks(rows, chunk_size):
+        changed.extend(db.execute(stmt, list(chunk)).all())
+
+    return changed
+
+
+def upsert_games(db: Session, rows: Sequence[dict], chunk_size: int = 500) -> list:
+    """
+    Bulk insert games, updating scores and status of games that already exist.
+
+    Scheduled games become final when the loader sees their result.
+    Caller is responsible for committing.
+
+    Returns: Rows of CHANGED_GAME_COLUMNS for each game inserted or updated,
+    e.g. for standings.refresh_affected
+    """
+    return upsert_rows(
+        db,
+        Game.__table__,
+        rows,
+        conflict_columns=["game_id"],
+        update_columns=GAME_UPDATE_COLUMNS,
+        extra_updates={"updated_at": func.now()},
+        chunk_size=chunk_size,
+        returning=CHANGED_GAME_COLUMNS,
+    )
+
+
+def upsert_game_ratings(db: Session, ratings: "pd.DataFrame", chunk_size: int = 500) -> int:
+    """
+    Bulk insert or update pre-game Elo ratings from EloEngine.process.
+
+    Caller is responsible for committing.
+
+    Returns: Number of games inserted or updated
+    """
+    return len(upsert_rows(
+        db,
+        GameRating.__table__,
+        frame_to_records(ratings.loc[:, ["game_id", "season", *RATING_COLUMNS]]),
+        conflict_columns=["game_id"],
+        update_columns=["season", *RATING_COLUMNS],
+        extra_updates={"updated_at": func.now()},
+        chunk_size=chunk_size,
+    ))
+
+
+def upsert_odds(db: Session, rows: Sequence[dict], chunk_size: int = 500) -> int:
+    """
+    Bulk insert or update bookmaker lines on (game_id, bookmaker, market).
+
+    rows come from odds_client.odds_rows. Caller is responsible for committing.
+
+    Returns: Number of lines inserted or changed
+    """
+    return len(upsert_rows(
+        db,
+        Odds.__table__,
+        rows,
+        conflict_columns=["game_id", "bookmaker", "market"],
+        update_columns=ODDS_UPDATE_COLUMNS,
+        extra_updates={"updated_at": func.now()},
+        chunk_size=chunk_size,
+    ))
+
+
+def write_team_stats(db: Session, stats: "pd.DataFrame", memory_budget_mb: float = 64) -> BulkWriteReport:
+    """
+    Upsert TeamStats rows on the uq_team_game_stats (team_id, game_id) constraint.
+
+    stats has the columns in TEAM_STATS_COLUMNS. Rows are converted and
+    sent in chunks sized to memory_budget_mb. Caller is responsible for
+    committing.
+
+    Returns: Report with the row count and throughput
+    """
+    stats = stats.loc[:, list(TEAM_STATS_COLUMNS)]
+    chunk_size = rows_per_chunk(stats, memory_budget_mb)
+    dialect = db.get_bind().dialect.name
+
+    start = time.perf_counter()
+    if dialect == "postgresql":
+        chunks = _copy_team_stats(db, stats, chunk_size)
+    else:
+        chunks = 0
+        # Multi-row VALUES statements are capped by the bound parameter limit
+        statement_rows = min(chunk_size, SQLITE_MAX_PARAMS // (len(TEAM_STATS_COLUMNS) + 1))
+        for chunk_start in range(0, len(stats), chunk_size):
+            chunk = stats.iloc[chunk_start:chunk_start + chunk_size]
+            upsert_rows(
+                db,
+                TeamStats.__table__,
+                frame_to_records(chunk),
+                conflict_columns=["team_id", "game_id"],
+                update_columns=["season", *FEATURE_COLUMNS],
+                chunk_size=statement_rows,
+            )
+            chunks += 1
+
+    report = BulkWriteReport(rows=len(stats), seconds=time.perf_counter() - start, chunks=chunks)
+
+    team_ids = {int(team_id) for team_id in stats["team_id"].unique()}
+    for listener in _team_stats_listeners:
+        listener(team_ids)
+
+    return report
+
+
+def _copy_team_stats(db: Session, stats: "pd.DataFrame", chunk_size: int) -> int:
+    """
+    COPY rows into a temp staging table, then merge them into team_stats in one statement.
+
+    Returns: Number of chunks streamed
+    """
+    columns = ", ".join(TEAM_STATS_COLUMNS)
+    update_columns = ("season", *FEATURE_COLUMNS)
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+    current = ", ".join(f"team_stats.{column}" for column in update_columns)
+    incoming = ", ".join(f"EXCLUDED.{column}" for column in update_columns)
+
+    # Raw psycopg connection for COPY, inside the session's transaction
+    cursor = db.connection().connection.dbapi_connection.cursor()
+    try:
+        # Only the data columns, so staging rows don't draw from the stat_id sequence
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS team_stats_staging ON COMMIT DELETE ROWS "
+            f"AS SELECT {columns} FROM team_stats WITH NO DATA"
+        )
+        cursor.execute("TRUNCATE team_stats_staging")
+
+        chunks = 0
+        for chunk_start in range(0, len(stats), chunk_size):
+            chunk = stats.iloc[chunk_start:chunk_start + chunk_size]
+            rows = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+            with cursor.copy(f"COPY team_stats_staging ({columns}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+            chunks += 1
+
+        cursor.execute(
+            f"INSERT INTO team_stats ({columns}, created_at) "
+            f"SELECT {columns}, %s FROM team_stats_staging "
+            f"ON CONFLICT ON CONSTRAINT uq_team_game_stats DO UPDATE SET {updates} "
+            f"WHERE ({current}) IS DISTINCT FROM ({incoming})",
+            (datetime.now(timezone.utc),),
+        )
+        cursor.execute("TRUNCATE team_stats_staging")
+    finally:
+        cursor.close()
+
+    return chunks
@@ -11,7 +11,7 @@ from sqlalchemy import pool
 from alembic import context
 
 from app.database.session import Base
-from app.models import Team, Game
+from app.models import Team, Game, TeamStats, GameRating, Odds, TeamSeasonSummary
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
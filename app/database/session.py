@@ -1,28 +1,170 @@
-#This module provides the SQLAlchemy engine and session factory
-#for connecting to PostgreSQL.
+#This module provides the SQLAlchemy engines and session factories
+#for connecting to PostgreSQL, both sync (scripts) and async (the API).
+#Engines are created on first use, so importing the models or the app
+#needs neither a reachable database nor the driver loaded.
 
-from collections.abc import Generator
+import asyncio
+import threading
+from collections.abc import AsyncGenerator, Callable, Generator
+from contextlib import AsyncExitStack
 
 from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.utils.query_profiler import get_query_profiler
 
-settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-)
+def _sync_url(url: str) -> str:
+    # psycopg (v3) is the only PostgreSQL driver we install
+    if url.startswith("postgresql://"):
+        return "postgresql+psycopg://" + url.removeprefix("postgresql://")
+    return url
+
+
+def _async_url(url: str) -> str:
+    # psycopg (v3) speaks asyncio with the same URL; SQLite needs aiosqlite
+    url = _sync_url(url)
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.removeprefix("sqlite://")
+    return url
+
+
+def _pool_options(settings: Settings) -> dict:
+    # SQLite uses its own pool classes that don't take sizing arguments
+    if settings.database_url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+
+
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_engine_lock = threading.Lock()
+
+# Called with each engine as it's created
+_engine_listeners: list[Callable[[Engine], None]] = []
+
+
+def on_engine_created(listener: Callable[[Engine], None]) -> Callable[[Engine], None]:
+    """
+    Register a callback for every engine, e.g. to attach cursor events.
+
+    Engines created before the call are passed to it straight away. The
+    async engine is passed as its sync_engine, which is where events go.
+    """
+    with _engine_lock:
+        _engine_listeners.append(listener)
+        created = [engine for engine in (_engine, _async_engine and _async_engine.sync_engine) if engine is not None]
+    for engine in created:
+        listener(engine)
+    return listener
+
+
+def get_engine() -> Engine:
+    """
+    The sync engine for scripts and threadpool endpoints, created on first use.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                settings = get_settings()
+                engine = create_engine(
+                    _sync_url(settings.database_url),
+                    echo=settings.sql_echo,
+                    pool_pre_ping=True,
+                    **_pool_options(settings),
+                )
+                for listener in _engine_listeners:
+                    listener(engine)
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    The async engine for the FastAPI app, created on first use.
+
+    Async so waiting on the database doesn't tie up a threadpool worker per request.
+    """
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                settings = get_settings()
+                engine = create_async_engine(
+                    _async_url(settings.database_url),
+                    echo=settings.sql_echo,
+                    pool_pre_ping=True,
+                    **_pool_options(settings),
+                )
+                for listener in _engine_listeners:
+                    listener(engine.sync_engine)
+                _async_engine = engine
+    return _async_engine
+
+
+# Slow statements are logged and every statement is aggregated by fingerprint
+on_engine_created(lambda engine: get_query_profiler().instrument(engine))
+
+
+class _LazyBindSession(Session):
+    # Sessions without an explicit bind use get_engine(), so building the
+    # factories below doesn't connect to anything or load the driver
+    def get_bind(self, mapper=None, **kwargs):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(mapper, **kwargs)
+
+
+class _LazyAsyncBindSession(Session):
+    # The sync half of an AsyncSession, bound to the async engine on first use
+    def get_bind(self, mapper=None, **kwargs):
+        if self.bind is None:
+            self.bind = get_async_engine().sync_engine
+        return super().get_bind(mapper, **kwargs)
+
 
 # Use a factory pattern so each request gets its own session.
 SessionLocal = sessionmaker(
+    class_=_LazyBindSession,
     autocommit=False,  # We'll manage transactions explicitly
     autoflush=False,   # Don't auto-flush before queries for more control
-    bind=engine,
 )
 
+AsyncSessionLocal = async_sessionmaker(
+    sync_session_class=_LazyAsyncBindSession,
+    autoflush=False,
+    expire_on_commit=False,  # Objects stay usable after commit without another round trip
+)
+
+
+async def warm_async_pool(connections: int) -> None:
+    """
+    Open connections on the async engine up front, so the first requests
+    don't each wait for a connect.
+    """
+    engine = get_async_engine()
+    async with AsyncExitStack() as stack:
+        # Held open together so each one is a separate pooled connection
+        await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(connections)))
+
+
+async def dispose_engines() -> None:
+    """
+    Close every pooled connection, e.g. on shutdown.
+    """
+    if _engine is not None:
+        _engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
 
 class Base(DeclarativeBase):
     """
@@ -44,4 +186,15 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency that provides an async database session.
+
+    Same contract as get_db, for async endpoints.
+
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
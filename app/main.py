@@ -10,16 +10,78 @@ Author: Kristo
 Project: NBA Game Prediction Platform
 """
 
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.api import export, games, metrics, predictions, standings
+from app.config import get_settings
+from app.database.session import dispose_engines, on_engine_created, warm_async_pool
+from app.ml.predictor import ModelNotAvailableError, load_predictor
+from app.services.team_registry import load_team_registry
+from app.utils.metrics import MetricsMiddleware, instrument_engine
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_pool() -> None:
+    connections = get_settings().db_pool_warmup
+    if connections <= 0:
+        return
+    try:
+        await warm_async_pool(connections)
+    except SQLAlchemyError as e:
+        # Requests connect on their own once the database is reachable
+        logger.warning("Could not warm the connection pool: %s", e)
+
+
+def load_model() -> None:
+    try:
+        load_predictor()
+    except ModelNotAvailableError as e:
+        # The API still serves games, /predictions returns 503 until a model is trained
+        logger.warning("%s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Teams and the model are kept in memory for the life of the process.
+    # Connecting, reading the teams and loading the model overlap, and
+    # happen here rather than at import so `import app.main` stays cheap.
+    await asyncio.gather(
+        warm_pool(),
+        asyncio.to_thread(load_team_registry),
+        asyncio.to_thread(load_model),
+    )
+    yield
+    await dispose_engines()
+
 
 app = FastAPI(
     title="NBA Prediction Dashboard",
     description="Machine learning predictions for NBA games with Vegas odds comparison",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+app.include_router(games.router)
+app.include_router(predictions.router)
+app.include_router(standings.router)
+app.include_router(export.router)
+
+if get_settings().metrics_enabled:
+    # Outermost, so latency covers everything the app does for a request
+    app.add_middleware(MetricsMiddleware)
+    on_engine_created(instrument_engine)
+    app.include_router(metrics.router)
+
+
 @app.get("/health")
 def health_check() -> dict:
     return {"status": "healthy", "version": "0.1.0"}
@@ -31,6 +93,13 @@ def root() -> dict:
         "status": "under construction",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "docs": "/docs",
+            "games": "/games",
+            "team_games": "/teams/{abbr}/games",
+            "predictions": "/predictions?date=YYYY-MM-DD",
+            "standings": "/standings?season=YYYY",
+            "export_games": "/export/games?format=csv",
+            "export_features": "/export/features?format=parquet",
         }
     }
\ No newline at end of file
@@ -0,0 +1,313 @@
+"""
+Prediction Cache
+
+Predictions only change when a game's input features change or a new
+model is deployed, so results are cached under
+
+    (game_id, model_version, hash of the game's feature row)
+
+Changed features give a new key rather than a stale hit. Entries live in
+an in-memory LRU bounded by an approximate byte budget, with an optional
+SQLite file behind it so a restarted process starts warm.
+
+Whole slates (every prediction for a date) are cached as well, so a
+repeat request skips the feature query. Callers can key a slate on a
+data version as well as the model version, so a new version misses it.
+Slates are dropped when write_team_stats rewrites one of their teams in
+this process, and expire after a short TTL to pick up writes made by
+other processes that the version doesn't cover.
+
+"""
+
+import hashlib
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.config import get_settings
+from app.database.bulk import on_team_stats_written
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CacheKey = tuple[str, str, str]
+
+# Rough per-entry cost of the OrderedDict node and team index on top of the key and value
+ENTRY_OVERHEAD_BYTES = 200
+
+# Dates whose whole slate is kept
+MAX_SLATES = 64
+
+
+def feature_hashes(features: "pd.DataFrame") -> list[str]:
+    """
+    Stable hash of each row's feature values, in column order.
+    """
+    import numpy as np
+
+    values = features.astype(float).to_numpy()
+    # Every NaN hashes the same, whatever its bit pattern
+    values = np.ascontiguousarray(np.where(np.isnan(values), np.nan, values))
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest() for row in values]
+
+
+def _entry_size(key: CacheKey) -> int:
+    return sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key) + sys.getsizeof(0.0) + ENTRY_OVERHEAD_BYTES
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    persistent_hits: int = 0
+    slate_hits: int = 0
+    slate_misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class PersistentPredictionStore:
+    """
+    Predictions kept in a local SQLite file.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "game_id TEXT NOT NULL, model_version TEXT NOT NULL, feature_hash TEXT NOT NULL, "
+            "probability REAL NOT NULL, PRIMARY KEY (game_id, model_version, feature_hash))"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: list[CacheKey]) -> dict[CacheKey, float]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT probability FROM predictions WHERE game_id = ? AND model_version = ? AND feature_hash = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    found[key] = row[0]
+        return found
+
+    def put_many(self, items: dict[CacheKey, float]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                [(*key, probability) for key, probability in items.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU of game predictions plus a small cache of whole slates.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        store: PersistentPredictionStore | None = None,
+        slate_ttl_seconds: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.store = store
+        self.slate_ttl_seconds = slate_ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # key -> (probability, size in bytes, team ids)
+        self._entries: OrderedDict[CacheKey, tuple[float, int, tuple[int, int]]] = OrderedDict()
+        self._bytes = 0
+        self._keys_by_team: dict[int, set[CacheKey]] = {}
+
+        # (date, model_version, data_version) -> (result, team ids, stored at)
+        self._slates: OrderedDict[tuple[date, str, Any], tuple[Any, frozenset[int], float]] = OrderedDict()
+
+        self.stats = CacheStats()
+
+    def get_many(self, keys: list[CacheKey]) -> dict[CacheKey, float]:
+        """
+        Cached probabilities for whichever keys are known, checking the persistent store on a miss.
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    missing.append(key)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[0]
+            self.stats.hits += len(found)
+
+        if missing and self.store is not None:
+            stored = self.store.get_many(missing)
+            if stored:
+                # Promote to memory; team ids aren't stored, so these only get evicted by LRU
+                with self._lock:
+                    for key, probability in stored.items():
+                        self._insert(key, probability, ())
+                    self.stats.persistent_hits += len(stored)
+                found.update(stored)
+
+        with self._lock:
+            self.stats.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: dict[CacheKey, float], teams: dict[CacheKey, tuple[int, int]]) -> None:
+        """
+        Cache probabilities. teams maps each key to its (home, away) team ids for invalidation.
+        """
+        with self._lock:
+            for key, probability in items.items():
+                self._insert(key, probability, teams.get(key, ()))
+
+        if self.store is not None:
+            self.store.put_many(items)
+
+    def _insert(self, key: CacheKey, probability: float, team_ids: tuple) -> None:
+        # Caller holds the lock
+        if key in self._entries:
+            self._remove(key)
+
+        size = _entry_size(key)
+        self._entries[key] = (probability, size, team_ids)
+        self._bytes += size
+        for team_id in team_ids:
+            self._keys_by_team.setdefault(team_id, set()).add(key)
+
+        while self._bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        # Caller holds the lock
+        _, size, team_ids = self._entries.pop(key)
+        self._bytes -= size
+        for team_id in team_ids:
+            keys = self._keys_by_team.get(team_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_team[team_id]
+
+    def get_slate(self, game_date: date, model_version: str, data_version: Any = None) -> Any | None:
+        """
+        The cached result for a whole date, or None if missing or expired.
+        """
+        key = (game_date, model_version, data_version)
+        with self._lock:
+            entry = self._slates.get(key)
+            if entry is not None and self._clock() - entry[2] > self.slate_ttl_seconds:
+                del self._slates[key]
+                entry = None
+
+            if entry is None:
+                self.stats.slate_misses += 1
+                return None
+
+            self._slates.move_to_end(key)
+            self.stats.slate_hits += 1
+            return entry[0]
+
+    def put_slate(
+        self,
+        game_date: date,
+        model_version: str,
+        result: Any,
+        team_ids: Iterable[int],
+        data_version: Any = None,
+    ) -> None:
+        key = (game_date, model_version, data_version)
+        with self._lock:
+            self._slates[key] = (result, frozenset(team_ids), self._clock())
+            self._slates.move_to_end(key)
+            while len(self._slates) > MAX_SLATES:
+                self._slates.popitem(last=False)
+
+    def invalidate_teams(self, team_ids: set[int]) -> None:
+        """
+        Drop cached predictions and slates involving any of team_ids.
+        """
+        with self._lock:
+            for team_id in team_ids:
+                for key in list(self._keys_by_team.get(team_id, ())):
+                    self._remove(key)
+                    self.stats.invalidations += 1
+
+            for key, (_, slate_teams, _) in list(self._slates.items()):
+                if slate_teams & team_ids:
+                    del self._slates[key]
+                    self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_team.clear()
+            self._slates.clear()
+            self._bytes = 0
+
+    def summary(self) -> dict:
+        """
+        Counters and sizes, for the stats endpoint.
+        """
+        with self._lock:
+            stats = asdict(self.stats)
+            served = stats["hits"] + stats["persistent_hits"]
+            lookups = served + stats["misses"]
+            return {
+                **stats,
+                "hit_rate": served / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "slates": len(self._slates),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "persistent": self.store is not None,
+            }
+
+
+_cache: PredictionCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    """
+    The process-wide cache, created from settings on first use.
+    """
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            settings = get_settings()
+            store = None
+            if settings.prediction_cache_path:
+                store = PersistentPredictionStore(settings.resolve_path(settings.prediction_cache_path))
+
+            _cache = PredictionCache(
+                max_bytes=int(settings.prediction_cache_max_mb * 1024 * 1024),
+                store=store,
+                slate_ttl_seconds=settings.prediction_cache_slate_ttl_seconds,
+            )
+            # Rewritten team stats make that team's cached predictions stale
+            on_team_stats_written(_cache.invalidate_teams)
+
+        return _cache
@@ -0,0 +1,183 @@
+"""
+Game Predictor
+
+Loads the model artifact named by Settings.model_version from the model
+directory and keeps it in memory for the life of the process. A whole
+slate of games is scored with a single predict_proba call on the
+matchup feature rows, so the cost of a request is the feature query.
+
+An artifact is two files:
+
+    <model_dir>/<version>.json       XGBoost model
+    <model_dir>/<version>.meta.json  Feature columns and training info
+
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.ml.prediction_cache import PredictionCache, feature_hashes
+from app.models import Game
+from app.services.team_features import MATCHUP_FEATURES, matchup_select
+
+# NumPy and pandas are imported on first prediction, like xgboost on first load,
+# so importing the app stays fast
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotAvailableError(Exception):
+    """
+    Raised when the configured model artifact doesn't exist.
+    """
+
+
+def artifact_paths(model_dir: Path, version: str) -> tuple[Path, Path]:
+    """
+    Returns: Paths of the model file and its metadata file
+    """
+    return model_dir / f"{version}.json", model_dir / f"{version}.meta.json"
+
+
+def save_artifact(model: Any, features: list[str], model_dir: Path, version: str, meta: dict | None = None) -> Path:
+    """
+    Write a trained XGBClassifier and its metadata under model_dir.
+
+    Returns: Path of the model file
+    """
+    model_path, meta_path = artifact_paths(model_dir, version)
+    model_dir.mkdir(parents=True, exist_ok=True)
+
+    model.save_model(model_path)
+    meta_path.write_text(json.dumps({"version": version, "features": features, **(meta or {})}, indent=2, allow_nan=False))
+    return model_path
+
+
+@dataclass
+class Predictor:
+    """
+    A loaded model and the feature columns it expects, in order.
+    """
+
+    version: str
+    model: Any
+    features: list[str]
+    meta: dict = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, model_dir: Path, version: str) -> "Predictor":
+        model_path, meta_path = artifact_paths(model_dir, version)
+        if not model_path.exists() or not meta_path.exists():
+            raise ModelNotAvailableError(f"No model artifact for version {version} in {model_dir}")
+
+        # Imported here so the API can start without paying for xgboost until a model exists
+        from xgboost import XGBClassifier
+
+        model = XGBClassifier()
+        model.load_model(model_path)
+        meta = json.loads(meta_path.read_text())
+
+        return cls(version=version, model=model, features=meta.get("features", MATCHUP_FEATURES), meta=meta)
+
+    def predict(self, matchups: "pd.DataFrame") -> "np.ndarray":
+        """
+        Home win probability for every row of matchups, in one call.
+
+        Missing features (e.g. a team's first game of the season) are left
+        as NaN, which XGBoost handles natively.
+        """
+        import numpy as np
+
+        if matchups.empty:
+            return np.empty(0)
+
+        X = matchups.reindex(columns=self.features).astype(float).to_numpy()
+        return self.model.predict_proba(X)[:, 1]
+
+
+def load_slate(db: Session, game_date: date) -> "pd.DataFrame":
+    """
+    Feature rows for every game on game_date, one row per game.
+    """
+    import pandas as pd
+
+    stmt = matchup_select().where(Game.game_date == game_date).order_by(Game.game_id)
+    return pd.read_sql(stmt, db.connection())
+
+
+def predict_slate(
+    db: Session,
+    predictor: Predictor,
+    game_date: date,
+    cache: PredictionCache | None = None,
+) -> "pd.DataFrame":
+    """
+    Score all games on game_date.
+
+    With a cache, only games whose features changed since they were last
+    scored go through the model.
+
+    Returns: The slate's matchup rows with a home_win_probability column
+    """
+    import numpy as np
+
+    slate = load_slate(db, game_date)
+    if cache is None:
+        slate["home_win_probability"] = predictor.predict(slate)
+        return slate
+
+    hashes = feature_hashes(slate.reindex(columns=predictor.features))
+    keys = [(game_id, predictor.version, feature_hash) for game_id, feature_hash in zip(slate["game_id"], hashes)]
+    cached = cache.get_many(keys)
+
+    probabilities = np.array([cached.get(key, np.nan) for key in keys], dtype=float)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+        probabilities[missing] = predictor.predict(slate.iloc[missing])
+        cache.put_many(
+            {keys[i]: float(probabilities[i]) for i in missing},
+            teams={keys[i]: (int(slate["home_team_id"].iat[i]), int(slate["away_team_id"].iat[i])) for i in missing},
+        )
+
+    slate["home_win_probability"] = probabilities
+    return slate
+
+
+_predictor: Predictor | None = None
+_lock = threading.Lock()
+
+
+def load_predictor() -> Predictor:
+    """
+    (Re)load the configured model into the process-wide slot.
+
+    Raises ModelNotAvailableError if the artifact doesn't exist.
+    """
+    global _predictor
+    settings = get_settings()
+
+    with _lock:
+        _predictor = Predictor.load(settings.resolve_path(settings.model_dir), settings.model_version)
+        logger.info("Loaded model %s", _predictor.version)
+        return _predictor
+
+
+def get_predictor() -> Predictor:
+    """
+    The warm model, loaded on first use.
+    """
+    predictor = _predictor
+    if predictor is None:
+        predictor = load_predictor()
+    return predictor
@@ -1,5 +1,8 @@
 from app.models.team import Team
 from app.models.game import Game
 from app.models.team_stats import TeamStats
+from app.models.game_rating import GameRating
+from app.models.odds import Odds
+from app.models.team_season_summary import TeamSeasonSummary
 
-__all__ = ["Team", "Game", "TeamStats"]
\ No newline at end of file
+__all__ = ["Team", "Game", "TeamStats", "GameRating", "Odds", "TeamSeasonSummary"]
\ No newline at end of file
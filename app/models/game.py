@@ -8,7 +8,7 @@ Will link to teams by a foreign key
 
 from datetime import date, datetime
 
-from sqlalchemy import String, Integer, Boolean, Date, ForeignKey, DateTime, func
+from sqlalchemy import String, Integer, Boolean, Date, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.session import Base
@@ -82,10 +82,12 @@ class Game(Base):
         server_default=func.now(),
     )
 
+    # Indexed so the API's data version (the newest update) is a single lookup
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
         server_default=func.now(),
         onupdate=func.now(),
+        index=True,
     )
 
     # Relationships to Team model
@@ -101,6 +103,12 @@ class Game(Base):
         foreign_keys=[away_team_id],
     )
 
+    # Per-team history lookups filter on one team and sort by date
+    __table_args__ = (
+        Index("ix_games_home_team_id_game_date", "home_team_id", "game_date"),
+        Index("ix_games_away_team_id_game_date", "away_team_id", "game_date"),
+    )
+
     def __repr__(self) -> str:
         return f"<Game {self.game_id}: {self.game_date}>"
 
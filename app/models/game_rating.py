@@ -0,0 +1,46 @@
+"""
+Game Rating Model
+
+Elo ratings of both teams going into a game, produced by
+app.services.elo. One row per game, used as model features.
+
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, Float, ForeignKey, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.session import Base
+
+
+class GameRating(Base):
+    __tablename__ = 'game_ratings'
+
+    game_id: Mapped[str] = mapped_column(
+        String(20),
+        ForeignKey("games.game_id"),
+        primary_key=True,
+    )
+
+    season: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        index=True,
+    )
+
+    # Pre-game ratings
+    home_elo: Mapped[float] = mapped_column(Float, nullable=False)
+    away_elo: Mapped[float] = mapped_column(Float, nullable=False)
+
+    # Home win probability implied by the ratings, including home advantage
+    elo_home_win_prob: Mapped[float] = mapped_column(Float, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<GameRating {self.game_id}: {self.home_elo:.0f} vs {self.away_elo:.0f}>"
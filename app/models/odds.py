@@ -0,0 +1,75 @@
+"""
+Odds Model
+
+One bookmaker's line for one market of a game, e.g. DraftKings'
+moneyline for a game. Prices are American odds.
+
+Markets:
+    h2h      home_price / away_price
+    spreads  home_point / home_price and away_point / away_price
+    totals   total_point with over_price / under_price
+
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, Float, ForeignKey, DateTime, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.session import Base
+
+
+class Odds(Base):
+    __tablename__ = 'odds'
+
+    odds_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+    )
+
+    game_id: Mapped[str] = mapped_column(
+        String(20),
+        ForeignKey("games.game_id"),
+        nullable=False,
+        index=True,
+    )
+
+    # Bookmaker key from the odds API, e.g. "draftkings"
+    bookmaker: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+    )
+
+    market: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+    )
+
+    home_price: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    away_price: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    home_point: Mapped[float | None] = mapped_column(Float, nullable=True)
+    away_point: Mapped[float | None] = mapped_column(Float, nullable=True)
+    total_point: Mapped[float | None] = mapped_column(Float, nullable=True)
+    over_price: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    under_price: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # When the bookmaker last changed the line
+    last_update: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    # One line per game, bookmaker and market
+    __table_args__ = (
+        UniqueConstraint("game_id", "bookmaker", "market", name="uq_odds_game_bookmaker_market"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Odds {self.game_id} {self.bookmaker} {self.market}>"
@@ -0,0 +1,58 @@
+"""
+Team Season Summary Model
+
+Each team's record for a season, aggregated from its final games by
+app.services.standings. One row per (season, team), so standings are a
+primary key range read instead of an aggregate over games.
+
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Integer, Float, Date, ForeignKey, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.session import Base
+
+
+class TeamSeasonSummary(Base):
+    __tablename__ = 'team_season_summary'
+
+    # Season first so a whole season is one index range
+    season: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+    )
+
+    team_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("teams.team_id"),
+        primary_key=True,
+    )
+
+    games_played: Mapped[int] = mapped_column(Integer, nullable=False)
+    wins: Mapped[int] = mapped_column(Integer, nullable=False)
+    losses: Mapped[int] = mapped_column(Integer, nullable=False)
+    win_pct: Mapped[float] = mapped_column(Float, nullable=False)
+
+    # Home/away splits
+    home_wins: Mapped[int] = mapped_column(Integer, nullable=False)
+    home_losses: Mapped[int] = mapped_column(Integer, nullable=False)
+    away_wins: Mapped[int] = mapped_column(Integer, nullable=False)
+    away_losses: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Scoring totals and average margin per game
+    points_for: Mapped[int] = mapped_column(Integer, nullable=False)
+    points_against: Mapped[int] = mapped_column(Integer, nullable=False)
+    avg_margin: Mapped[float] = mapped_column(Float, nullable=False)
+
+    last_game_date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TeamSeasonSummary {self.season} team {self.team_id}: {self.wins}-{self.losses}>"
@@ -0,0 +1,35 @@
+"""
+Game response schemas
+"""
+
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TeamSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    team_id: int
+    team_abbreviation: str
+    team_name: str
+
+
+class GameOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    game_id: str
+    game_date: date
+    season: int
+    home_team: TeamSummary
+    away_team: TeamSummary
+    home_score: int | None
+    away_score: int | None
+    game_status: str
+    is_playoffs: bool
+
+
+class GamePage(BaseModel):
+    items: list[GameOut]
+    # Pass back as ?cursor= to get the next page, None on the last page
+    next_cursor: str | None
@@ -0,0 +1,30 @@
+"""
+Prediction response schemas
+"""
+
+from datetime import date
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.game import TeamSummary
+
+
+class PredictionOut(BaseModel):
+    game_id: str
+    game_date: date
+    home_team: TeamSummary
+    away_team: TeamSummary
+    game_status: str
+    home_win_probability: float
+    predicted_winner: TeamSummary
+    # Whether the favourite's probability clears the confidence threshold
+    confident: bool
+
+
+class PredictionSlate(BaseModel):
+    # model_version would otherwise clash with pydantic's "model_" namespace
+    model_config = ConfigDict(protected_namespaces=())
+
+    date: date
+    model_version: str
+    predictions: list[PredictionOut]
@@ -0,0 +1,36 @@
+"""
+Standings response schemas
+"""
+
+from datetime import date
+
+from pydantic import BaseModel
+
+from app.schemas.game import TeamSummary
+
+
+class StandingOut(BaseModel):
+    team: TeamSummary
+    conference: str | None
+    division: str | None
+    # Position within the conference, by win percentage
+    conference_rank: int
+    games_played: int
+    wins: int
+    losses: int
+    win_pct: float
+    # Games behind the conference leader
+    games_behind: float
+    home_wins: int
+    home_losses: int
+    away_wins: int
+    away_losses: int
+    points_for: int
+    points_against: int
+    avg_margin: float
+    last_game_date: date | None
+
+
+class Standings(BaseModel):
+    season: int
+    standings: list[StandingOut]
@@ -0,0 +1,258 @@
+"""
+Elo Ratings
+
+Sequential Elo over the games history, with home-court advantage, a
+margin-of-victory multiplier and regression towards the mean between
+seasons.
+
+Ratings live in a NumPy array indexed by team_id and games are read as
+plain arrays, so a pass over the full history takes milliseconds. Every
+game gets the ratings both teams had *going into* it, so the values can
+be used as model features without leaking the result.
+
+Like TeamStatsUpdater, the engine can save its state and later apply only
+the games that finished since. It also keeps the ratings the current
+season started from and the final games applied in it, so a final game
+that turns up after later games were applied (a postponed result, or a
+same-night game with a lower game_id) replays the season from its start.
+
+"""
+
+import json
+import logging
+import math
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+# Importing RATING_COLUMNS shouldn't load NumPy and pandas, the engine imports them when used
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns of the per-game frame produced by EloEngine.process
+RATING_COLUMNS = ["home_elo", "away_elo", "elo_home_win_prob"]
+
+EPOCH = date(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class EloParams:
+    k: float = 20.0
+    home_advantage: float = 100.0
+    initial_rating: float = 1500.0
+    # Share of a team's distance from the mean kept into the next season
+    carryover: float = 0.75
+
+
+def expected_home_win(home_rating: float, away_rating: float, home_advantage: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** ((away_rating - home_rating - home_advantage) / 400.0))
+
+
+def mov_multiplier(margin: float, winner_rating_diff: float) -> float:
+    """
+    Scale the update by the margin of victory, damped when the favourite
+    wins so strong teams don't inflate by running up scores.
+    """
+    return ((abs(margin) + 3.0) ** 0.8) / (7.5 + 0.006 * winner_rating_diff)
+
+
+class EloEngine:
+    """
+    Team ratings as of the last applied game.
+    """
+
+    def __init__(self, params: EloParams | None = None):
+        import numpy as np
+
+        self.params = params or EloParams()
+        self.ratings = np.full(64, self.params.initial_rating)
+        self.season: int | None = None
+        self.last_game_date: date | None = None
+        self.last_game_id: str | None = None
+        # Ratings the current season started from, and its final games applied
+        # so far. None for states saved before these were tracked.
+        self.season_start_ratings: list[float] | None = None
+        self.applied_ids: set[str] | None = None
+
+    def _ensure_capacity(self, max_team_id: int) -> None:
+        import numpy as np
+
+        if max_team_id >= len(self.ratings):
+            grown = np.full(max_team_id * 2, self.params.initial_rating)
+            grown[:len(self.ratings)] = self.ratings
+            self.ratings = grown
+
+    def start_season(self, season: int) -> None:
+        """
+        Regress every rating towards the mean for a new season.
+        """
+        if self.season is not None:
+            mean = self.params.initial_rating
+            self.ratings = mean + self.params.carryover * (self.ratings - mean)
+        self.season = season
+        self.season_start_ratings = self.ratings.tolist()
+        self.applied_ids = set()
+
+    def process(self, games: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Apply new final games in date order and return pre-game ratings.
+
+        games has one row per game with the GAME_COLUMNS of team_features.
+        Final games update the ratings; other games get the current
+        ratings without changing them. Final games already applied are
+        skipped and get no row. A late final game in the current season
+        replays the season, giving rows for all its final games, so games
+        must hold the whole current season.
+
+        Returns: DataFrame with game_id, season and RATING_COLUMNS
+        """
+        import numpy as np
+        import pandas as pd
+
+        games = games.sort_values(["game_date", "game_id"])
+        n = len(games)
+        if n:
+            self._ensure_capacity(int(max(games["home_team_id"].max(), games["away_team_id"].max())))
+
+        # Plain Python lists are much faster than NumPy scalars or pandas rows in the loop.
+        # Dates are compared as day numbers.
+        game_ids = games["game_id"].tolist()
+        game_days = games["game_date"].to_numpy(dtype="datetime64[D]").astype(int).tolist()
+        seasons = games["season"].tolist()
+        home_ids = games["home_team_id"].tolist()
+        away_ids = games["away_team_id"].tolist()
+        final = (
+            (games["game_status"] == "final") & games["home_score"].notna() & games["away_score"].notna()
+        ).tolist()
+        margins = (games["home_score"].astype(float) - games["away_score"].astype(float)).tolist()
+
+        k = self.params.k
+        hca = self.params.home_advantage
+        ratings = self.ratings.tolist()
+        keep = [True] * n
+        home_pre = [math.nan] * n
+        away_pre = [math.nan] * n
+        probability = [math.nan] * n
+
+        last = None
+        if self.last_game_date is not None:
+            last = ((self.last_game_date - EPOCH).days, self.last_game_id)
+
+        late = self._late_games(game_ids, game_days, seasons, final, last)
+        if late:
+            logger.warning(
+                "Final game %s arrived after later games, replaying the %s season's ratings",
+                late[0], self.season,
+            )
+            # Teams added since the season started begin at the initial rating, as they did then
+            start = self.season_start_ratings
+            ratings = start + [self.params.initial_rating] * (len(ratings) - len(start))
+            self.applied_ids = set()
+            last = None
+
+        for i in range(n):
+            season = seasons[i]
+            if self.season is not None and season < self.season and final[i]:
+                keep[i] = False
+                continue
+            if self.season is None or season > self.season:
+                self.ratings = np.asarray(ratings)
+                self.start_season(season)
+                ratings = self.ratings.tolist()
+
+            if final[i] and last is not None and (game_days[i], game_ids[i]) <= last:
+                keep[i] = False
+                continue
+
+            home, away = home_ids[i], away_ids[i]
+            home_rating, away_rating = ratings[home], ratings[away]
+            expected = expected_home_win(home_rating, away_rating, hca)
+            home_pre[i], away_pre[i], probability[i] = home_rating, away_rating, expected
+
+            if not final[i]:
+                continue
+
+            margin = margins[i]
+            actual = 1.0 if margin > 0 else 0.0 if margin < 0 else 0.5
+            diff = home_rating + hca - away_rating
+            winner_diff = diff if margin > 0 else -diff
+            shift = k * mov_multiplier(margin, winner_diff) * (actual - expected)
+            ratings[home] = home_rating + shift
+            ratings[away] = away_rating - shift
+
+            last = (game_days[i], game_ids[i])
+            if self.applied_ids is not None:
+                self.applied_ids.add(game_ids[i])
+
+        self.ratings = np.asarray(ratings)
+        if last is not None:
+            self.last_game_date = EPOCH + timedelta(days=last[0])
+            self.last_game_id = last[1]
+
+        keep = np.asarray(keep, dtype=bool)
+        return pd.DataFrame({
+            "game_id": np.asarray(game_ids, dtype=object)[keep],
+            "season": np.asarray(seasons, dtype=int)[keep],
+            "home_elo": np.asarray(home_pre)[keep],
+            "away_elo": np.asarray(away_pre)[keep],
+            "elo_home_win_prob": np.asarray(probability)[keep],
+        })
+
+    def _late_games(self, game_ids: list, game_days: list, seasons: list, final: list, last) -> list[str]:
+        """
+        Final games of the current season sorting at or before the last
+        applied game that were never applied.
+        """
+        if last is None or self.applied_ids is None or self.season_start_ratings is None:
+            return []
+        return [
+            game_ids[i] for i in range(len(game_ids))
+            if final[i]
+            and seasons[i] == self.season
+            and game_ids[i] not in self.applied_ids
+            and (game_days[i], game_ids[i]) <= last
+        ]
+
+    def rating(self, team_id: int) -> float:
+        return float(self.ratings[team_id]) if team_id < len(self.ratings) else self.params.initial_rating
+
+    def save(self, path: Path | str) -> None:
+        """
+        Write the ratings and sync mark to a JSON file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "params": asdict(self.params),
+            "season": self.season,
+            "last_game_date": self.last_game_date.isoformat() if self.last_game_date else None,
+            "last_game_id": self.last_game_id,
+            "ratings": self.ratings.tolist(),
+            "season_start_ratings": self.season_start_ratings,
+            "applied_ids": sorted(self.applied_ids) if self.applied_ids is not None else None,
+        }, indent=2))
+
+    @classmethod
+    def load(cls, path: Path | str) -> "EloEngine":
+        """
+        Restore an engine from a file written by save(). A missing file gives a fresh engine.
+        """
+        import numpy as np
+
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text())
+
+        engine = cls(EloParams(**data["params"]))
+        engine.ratings = np.asarray(data["ratings"], dtype=float)
+        engine.season = data["season"]
+        engine.last_game_date = date.fromisoformat(data["last_game_date"]) if data["last_game_date"] else None
+        engine.last_game_id = data["last_game_id"]
+        engine.season_start_ratings = data.get("season_start_ratings")
+        applied_ids = data.get("applied_ids")
+        engine.applied_ids = set(applied_ids) if applied_ids is not None else None
+        return engine
@@ -0,0 +1,208 @@
+"""
+Feature Store
+
+Materializes the training matrix (games joined with home and away
+TeamStats) to Parquet under data/processed, one partition per season:
+
+    <root>/season=2023/part-0.parquet
+
+Reads go through pyarrow, so only the requested columns are loaded and
+season filters skip whole partitions. A manifest records a fingerprint of
+each season's source rows, and refresh() only rebuilds seasons whose
+fingerprint changed.
+
+"""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Numeric, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models import Game, GameRating, TeamStats
+from app.services.elo import RATING_COLUMNS
+from app.services.team_features import FEATURE_COLUMNS, add_target, matchup_select
+
+# Leading underscore so pyarrow skips it when reading the dataset
+MANIFEST = "_manifest.json"
+
+# Explicit column types so every partition has the same schema
+_INT_FEATURES = {"wins", "losses", "last_5_wins", "last_10_wins", "days_rest", "win_streak", "loss_streak"}
+
+
+def _feature_type(column: str) -> pa.DataType:
+    if column in _INT_FEATURES:
+        return pa.int32()
+    if column == "is_back_to_back":
+        return pa.bool_()
+    return pa.float64()
+
+
+SCHEMA = pa.schema([
+    ("game_id", pa.string()),
+    ("game_date", pa.date32()),
+    ("home_team_id", pa.int32()),
+    ("away_team_id", pa.int32()),
+    ("home_score", pa.int32()),
+    ("away_score", pa.int32()),
+    ("game_status", pa.string()),
+    ("home_win", pa.int8()),
+    *((f"{side}_{column}", _feature_type(column)) for side in ("home", "away") for column in FEATURE_COLUMNS),
+    *((column, pa.float64()) for column in RATING_COLUMNS),
+])
+
+# Part of every fingerprint, so partitions written with an older schema are rebuilt
+SCHEMA_HASH = hashlib.sha256(str(SCHEMA).encode()).hexdigest()[:12]
+
+
+class FeatureStore:
+    """
+    Season-partitioned Parquet copy of the training matrix.
+    """
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+
+    def _partition_dir(self, season: int) -> Path:
+        return self.root / f"season={season}"
+
+    def _read_manifest(self) -> dict[str, str]:
+        path = self.root / MANIFEST
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def _write_manifest(self, manifest: dict[str, str]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    @staticmethod
+    def source_fingerprints(db: Session) -> dict[str, str]:
+        """
+        One cheap aggregate per season that changes whenever its games or stats do.
+        """
+        games = db.execute(
+            select(
+                Game.season,
+                func.count(),
+                func.max(Game.updated_at),
+                func.sum(func.coalesce(Game.home_score, 0) + func.coalesce(Game.away_score, 0)),
+            ).group_by(Game.season)
+        ).all()
+
+        # TeamStats rows are updated in place (preview rows every time a team
+        # plays) and have no updated_at, so sum a few features. Summed as
+        # numeric so the total doesn't depend on the order rows are added in.
+        points = (
+            func.coalesce(TeamStats.pts_per_game_last10, 0)
+            + func.coalesce(TeamStats.opp_pts_per_game_last10, 0)
+            + func.coalesce(TeamStats.avg_margin, 0)
+        )
+        stats = {
+            season: "|".join(str(value) for value in values)
+            for season, *values in db.execute(
+                select(
+                    TeamStats.season,
+                    func.count(),
+                    func.sum(TeamStats.wins + TeamStats.losses),
+                    func.sum(func.coalesce(TeamStats.days_rest, 0)),
+                    func.round(func.sum(cast(points, Numeric)), 4),
+                ).group_by(TeamStats.season)
+            )
+        }
+
+        ratings = {
+            season: f"{count}|{updated_at}"
+            for season, count, updated_at in db.execute(
+                select(GameRating.season, func.count(), func.max(GameRating.updated_at)).group_by(GameRating.season)
+            )
+        }
+
+        return {
+            str(season): f"{SCHEMA_HASH}|{count}|{updated_at}|{points}|{stats.get(season, 0)}|{ratings.get(season)}"
+            for season, count, updated_at, points in games
+        }
+
+    def stale_seasons(self, db: Session) -> list[int]:
+        """
+        Seasons whose partition is missing or out of date.
+        """
+        manifest = self._read_manifest()
+        current = self.source_fingerprints(db)
+        return sorted(int(season) for season, fingerprint in current.items() if manifest.get(season) != fingerprint)
+
+    def refresh(self, db: Session, force: bool = False) -> list[int]:
+        """
+        Rebuild partitions whose source rows changed, and drop seasons that no longer exist.
+
+        Returns: Seasons that were rebuilt
+        """
+        manifest = self._read_manifest()
+        current = self.source_fingerprints(db)
+
+        rebuilt = []
+        for season, fingerprint in sorted(current.items()):
+            if not force and manifest.get(season) == fingerprint:
+                continue
+            self.write_season(db, int(season))
+            manifest[season] = fingerprint
+            rebuilt.append(int(season))
+
+        for season in set(manifest) - set(current):
+            shutil.rmtree(self._partition_dir(int(season)), ignore_errors=True)
+            del manifest[season]
+
+        self._write_manifest(manifest)
+        return rebuilt
+
+    def write_season(self, db: Session, season: int) -> Path:
+        """
+        Query one season's matchups and write its partition.
+        """
+        stmt = matchup_select().where(Game.season == season).order_by(Game.game_date, Game.game_id)
+        matchups = add_target(pd.read_sql(stmt, db.connection()))
+
+        table = pa.Table.from_pandas(matchups, schema=SCHEMA, preserve_index=False)
+
+        # Write next to the partition then swap, so readers never see a half-written season
+        partition = self._partition_dir(season)
+        staging = self.root / f".season={season}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        pq.write_table(table, staging / "part-0.parquet", compression="zstd")
+
+        shutil.rmtree(partition, ignore_errors=True)
+        staging.rename(partition)
+        return partition
+
+    def load(
+        self,
+        columns: list[str] | None = None,
+        seasons: list[int] | None = None,
+        filters: list[tuple] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Read the training matrix.
+
+        columns limits which columns are read. seasons prunes whole
+        partitions, and filters takes extra pyarrow predicates such as
+        [("game_status", "==", "final")] that are pushed down to the
+        Parquet row groups.
+        """
+        if not self.root.exists():
+            return pd.DataFrame(columns=["season", *SCHEMA.names])
+
+        predicates = list(filters or [])
+        if seasons:
+            predicates.append(("season", "in", list(seasons)))
+
+        table = pq.read_table(
+            self.root,
+            columns=columns,
+            filters=predicates or None,
+            partitioning="hive",
+        )
+        return table.to_pandas()
@@ -0,0 +1,290 @@
+"""
+Odds API Client
+
+Async client for The Odds API (https://the-odds-api.com). A single
+request returns every game in a time window with all bookmakers' lines,
+so a full day of odds is one call rather than one per game.
+
+The client keeps one httpx.AsyncClient with a bounded keep-alive pool for
+its lifetime. Responses are cached on disk with their ETag and
+Last-Modified headers. Within the cache TTL no request is made, and
+after it the request is conditional, so an unchanged response costs a
+304 and no body. Rate limiting (429), server errors and dropped
+connections are retried with exponential backoff, honouring Retry-After.
+
+Pass transport (e.g. httpx.MockTransport) or point base_url at a local
+server to run without the real API.
+
+"""
+
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.bulk import ODDS_UPDATE_COLUMNS
+from app.models import Game
+from app.services.team_registry import TeamRegistry
+from app.utils.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+SPORT = "basketball_nba"
+ODDS_ENDPOINT = "odds"
+
+# Responses worth another try: rate limited or a server-side failure
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Game dates in the games table are US Eastern dates
+EASTERN = ZoneInfo("America/New_York")
+
+
+@dataclass
+class OddsResponse:
+    events: list[dict]
+    # True when the body came from the cache (fresh entry or a 304)
+    from_cache: bool
+    # Quota header sent by the API, None when served from the cache
+    requests_remaining: str | None = None
+
+
+def day_window(day: date, days: int = 1) -> tuple[str, str]:
+    """
+    UTC bounds covering `days` Eastern calendar days starting at day, in the API's format.
+    """
+    start = datetime.combine(day, time.min, tzinfo=EASTERN).astimezone(timezone.utc)
+    end = datetime.combine(day + timedelta(days=days), time.min, tzinfo=EASTERN).astimezone(timezone.utc)
+    return start.strftime("%Y-%m-%dT%H:%M:%SZ"), end.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class OddsClient:
+    """
+    Pooled, cached client. Use as an async context manager so the pool is closed.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        timeout: float = 10,
+        max_connections: int = 4,
+        cache: ResponseCache | None = None,
+        cache_ttl: timedelta = timedelta(minutes=5),
+        transport: httpx.AsyncBaseTransport | None = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.api_key = api_key
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._sleep = sleep
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60,
+            ),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "OddsClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def retry_delay(self, attempt: int, response: httpx.Response | None) -> float:
+        # The API's Retry-After wins, otherwise "full jitter" backoff as in FetchScheduler
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after is not None and retry_after.strip().isdigit():
+            return float(retry_after)
+        return random.uniform(0, self.backoff_seconds * (2 ** attempt))
+
+    async def _get(self, path: str, params: dict[str, Any], headers: dict[str, str]) -> httpx.Response:
+        """
+        GET with retries on RETRY_STATUSES and transport errors.
+
+        Returns: The first response that isn't retried, which may still be an error
+        """
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.get(path, params=params, headers=headers)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                response, reason = None, e.__class__.__name__
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+
+            delay = self.retry_delay(attempt, response)
+            logger.warning("%s failed (%s), retrying in %.1fs", path, reason, delay)
+            await self._sleep(delay)
+            attempt += 1
+
+    async def get_json(self, path: str, params: dict[str, Any]) -> OddsResponse:
+        """
+        GET path with conditional caching.
+
+        The API key is sent with the request but kept out of the cache key,
+        so it's never written to disk.
+        """
+        cache_params = {"path": path, **params}
+        cached = None
+        if self.cache is not None:
+            fresh = self.cache.get(ODDS_ENDPOINT, cache_params, max_age=self.cache_ttl)
+            if fresh is not None:
+                return OddsResponse(events=fresh["body"], from_cache=True)
+            cached = self.cache.get(ODDS_ENDPOINT, cache_params)
+
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await self._get(path, {**params, "apiKey": self.api_key}, headers)
+        remaining = response.headers.get("x-requests-remaining")
+
+        if response.status_code == 304 and cached is not None:
+            # Unchanged, restart the TTL without downloading the body again
+            self.cache.put(ODDS_ENDPOINT, cache_params, cached)
+            logger.debug("%s not modified", path)
+            return OddsResponse(events=cached["body"], from_cache=True, requests_remaining=remaining)
+
+        response.raise_for_status()
+        body = response.json()
+
+        if self.cache is not None:
+            self.cache.put(ODDS_ENDPOINT, cache_params, {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "body": body,
+            })
+
+        return OddsResponse(events=body, from_cache=False, requests_remaining=remaining)
+
+    async def fetch_odds(
+        self,
+        day: date,
+        days: int = 1,
+        regions: str = "us",
+        markets: str = "h2h,spreads,totals",
+    ) -> OddsResponse:
+        """
+        Every bookmaker's lines for all games starting in the given Eastern days, in one request.
+        """
+        commence_from, commence_to = day_window(day, days)
+        params = {
+            "regions": regions,
+            "markets": markets,
+            "oddsFormat": "american",
+            "dateFormat": "iso",
+            "commenceTimeFrom": commence_from,
+            "commenceTimeTo": commence_to,
+        }
+        return await self.get_json(f"/sports/{SPORT}/odds", params)
+
+
+def games_by_matchup(db: Session, dates: list[date]) -> dict[tuple[date, int, int], str]:
+    """
+    Map (game_date, home_team_id, away_team_id) to game_id for the given dates.
+    """
+    rows = db.execute(
+        select(Game.game_date, Game.home_team_id, Game.away_team_id, Game.game_id).where(Game.game_date.in_(dates))
+    ).all()
+    return {(game_date, home, away): game_id for game_date, home, away, game_id in rows}
+
+
+def _american(price: float | None) -> int | None:
+    return None if price is None else int(round(price))
+
+
+def _parse_market(market: dict, home_team: str, away_team: str) -> dict | None:
+    # Outcomes are keyed by team name, or Over/Under for totals
+    outcomes = {outcome["name"]: outcome for outcome in market.get("outcomes", [])}
+    key = market["key"]
+
+    if key == "h2h" and home_team in outcomes and away_team in outcomes:
+        return {
+            "home_price": _american(outcomes[home_team].get("price")),
+            "away_price": _american(outcomes[away_team].get("price")),
+        }
+    if key == "spreads" and home_team in outcomes and away_team in outcomes:
+        return {
+            "home_point": outcomes[home_team].get("point"),
+            "home_price": _american(outcomes[home_team].get("price")),
+            "away_point": outcomes[away_team].get("point"),
+            "away_price": _american(outcomes[away_team].get("price")),
+        }
+    if key == "totals" and "Over" in outcomes and "Under" in outcomes:
+        return {
+            "total_point": outcomes["Over"].get("point"),
+            "over_price": _american(outcomes["Over"].get("price")),
+            "under_price": _american(outcomes["Under"].get("price")),
+        }
+    return None
+
+
+def odds_rows(
+    events: list[dict],
+    games: dict[tuple[date, int, int], str],
+    registry: TeamRegistry,
+) -> tuple[list[dict], int]:
+    """
+    Flatten API events into one row per (game, bookmaker, market).
+
+    Returns: The rows, and the number of events that matched no game
+    """
+    team_ids = {team.team_name: team.team_id for team in registry}
+
+    rows = []
+    unmatched = 0
+    for event in events:
+        commence = datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00"))
+        key = (
+            commence.astimezone(EASTERN).date(),
+            team_ids.get(event["home_team"]),
+            team_ids.get(event["away_team"]),
+        )
+        game_id = games.get(key)
+        if game_id is None:
+            unmatched += 1
+            continue
+
+        for bookmaker in event.get("bookmakers", []):
+            for market in bookmaker.get("markets", []):
+                values = _parse_market(market, event["home_team"], event["away_team"])
+                if values is None:
+                    continue
+
+                last_update = market.get("last_update") or bookmaker.get("last_update")
+                rows.append({
+                    **dict.fromkeys(ODDS_UPDATE_COLUMNS),
+                    **values,
+                    "game_id": game_id,
+                    "bookmaker": bookmaker["key"],
+                    "market": market["key"],
+                    "last_update": datetime.fromisoformat(last_update.replace("Z", "+00:00")) if last_update else None,
+                })
+
+    return rows, unmatched
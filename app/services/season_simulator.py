@@ -0,0 +1,283 @@
+"""
+Season Simulator
+
+Monte Carlo projection of final standings from the season's remaining
+scheduled games and their home win probabilities.
+
+Each chunk of simulations draws one uniform matrix (simulations x games)
+and turns it into wins per team with two matrix products against one-hot
+home/away team matrices. No Python loop runs per game or per simulation.
+Chunks are sized to a memory budget and only small per-team tallies are
+kept, so the number of simulations is bounded by time, not memory.
+
+Seeds are ranked by wins within each conference with ties broken at
+random, which stands in for the NBA's tiebreak rules. Remaining games
+involving a team the registry doesn't know are left out with a warning.
+
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.models import Game
+from app.services.team_features import load_games_frame, matchup_select
+from app.services.team_registry import TeamRegistry
+
+logger = logging.getLogger(__name__)
+
+# Seeds 1-6 go straight to the playoffs, 7-10 to the play-in
+PLAYOFF_SEEDS = 6
+PLAY_IN_SEEDS = 10
+
+PROJECTION_COLUMNS = [
+    "team_id", "team_abbreviation", "conference", "division", "wins", "losses",
+    "projected_wins", "wins_p10", "wins_p90",
+    "top_seed_prob", "playoff_prob", "play_in_prob", "division_prob", "seed_probs",
+]
+
+
+@dataclass
+class League:
+    """
+    Everything the simulation needs, as arrays indexed by team position.
+    """
+
+    team_ids: np.ndarray
+    conferences: np.ndarray
+    divisions: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    home: np.ndarray  # Team position of each remaining game's home team
+    away: np.ndarray
+    home_win_prob: np.ndarray
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.team_ids)
+
+    @property
+    def n_games(self) -> int:
+        return len(self.home)
+
+
+@dataclass
+class SimulationTally:
+    """
+    Per-team counts accumulated over simulations.
+    """
+
+    sims: int
+    win_counts: np.ndarray  # [team, final wins] -> simulations
+    seed_counts: np.ndarray  # [team, seed - 1] -> simulations
+    division_titles: np.ndarray  # [team] -> simulations
+
+    def __add__(self, other: "SimulationTally") -> "SimulationTally":
+        return SimulationTally(
+            sims=self.sims + other.sims,
+            win_counts=self.win_counts + other.win_counts,
+            seed_counts=self.seed_counts + other.seed_counts,
+            division_titles=self.division_titles + other.division_titles,
+        )
+
+
+def remaining_games(db: Session, season: int) -> pd.DataFrame:
+    """
+    The season's scheduled games with their matchup features.
+    """
+    stmt = (
+        matchup_select()
+        .where(Game.season == season, Game.game_status == "scheduled")
+        .order_by(Game.game_date, Game.game_id)
+    )
+    return pd.read_sql(stmt, db.connection())
+
+
+def build_league(
+    db: Session,
+    season: int,
+    registry: TeamRegistry,
+    home_win_prob=None,
+) -> League:
+    """
+    Current records and remaining games for a season.
+
+    home_win_prob maps the remaining games frame to probabilities, e.g.
+    Predictor.predict. Without it the pre-game Elo probability is used,
+    and 0.5 where a game has no rating yet.
+    """
+    games = load_games_frame(db, seasons=[season])
+    final = games[(games["game_status"] == "final") & games["home_score"].notna() & games["away_score"].notna()]
+    home_won = final["home_score"] > final["away_score"]
+
+    teams = sorted(registry, key=lambda team: team.team_id)
+    team_ids = np.array([team.team_id for team in teams])
+    position = pd.Series(np.arange(len(teams)), index=team_ids)
+
+    wins = (
+        final.loc[home_won, "home_team_id"].value_counts()
+        .add(final.loc[~home_won, "away_team_id"].value_counts(), fill_value=0)
+    )
+    played = final["home_team_id"].value_counts().add(final["away_team_id"].value_counts(), fill_value=0)
+    wins = wins.reindex(team_ids, fill_value=0).to_numpy(dtype=int)
+    losses = played.reindex(team_ids, fill_value=0).to_numpy(dtype=int) - wins
+
+    remaining = remaining_games(db, season)
+    known = remaining["home_team_id"].isin(team_ids) & remaining["away_team_id"].isin(team_ids)
+    if not known.all():
+        unknown = remaining.loc[~known, "game_id"]
+        logger.warning(
+            "Leaving out %d remaining games with teams not in the registry: %s",
+            len(unknown), ", ".join(unknown.head(10)),
+        )
+        remaining = remaining[known].reset_index(drop=True)
+
+    if home_win_prob is not None:
+        probability = np.asarray(home_win_prob(remaining), dtype=float)
+    else:
+        probability = remaining["elo_home_win_prob"].fillna(0.5).to_numpy(dtype=float)
+
+    return League(
+        team_ids=team_ids,
+        conferences=np.array([team.conference for team in teams]),
+        divisions=np.array([team.division for team in teams]),
+        wins=wins,
+        losses=losses,
+        home=position.reindex(remaining["home_team_id"]).to_numpy(dtype=int),
+        away=position.reindex(remaining["away_team_id"]).to_numpy(dtype=int),
+        home_win_prob=probability,
+    )
+
+
+def chunk_size_for(league: League, memory_mb: float) -> int:
+    """
+    Simulations per chunk so the sampled (simulations x games) matrices fit the budget.
+    """
+    # Uniform draws (float64) plus the float32 outcome matrix and its complement
+    bytes_per_sim = max(league.n_games, 1) * (8 + 4 + 4) + league.n_teams * 8 * 4
+    return max(1, int(memory_mb * 1024 * 1024 // bytes_per_sim))
+
+
+def simulate(league: League, sims: int, seed: int | None = None, memory_mb: float = 64) -> SimulationTally:
+    """
+    Play out the remaining schedule sims times in memory-bounded chunks.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams, n_games = league.n_teams, league.n_games
+    max_wins = int(league.wins.max()) + n_games + 1 if n_teams else 1
+
+    # One-hot [game, team] matrices: outcomes @ home_matrix = home wins per team
+    home_matrix = np.zeros((n_games, n_teams), dtype=np.float32)
+    away_matrix = np.zeros((n_games, n_teams), dtype=np.float32)
+    home_matrix[np.arange(n_games), league.home] = 1
+    away_matrix[np.arange(n_games), league.away] = 1
+    probability = league.home_win_prob.astype(np.float64)
+
+    conference_members = [np.flatnonzero(league.conferences == c) for c in np.unique(league.conferences)]
+    division_members = [np.flatnonzero(league.divisions == d) for d in np.unique(league.divisions)]
+    max_seeds = max((len(members) for members in conference_members), default=0)
+
+    tally = SimulationTally(
+        sims=0,
+        win_counts=np.zeros((n_teams, max_wins), dtype=np.int64),
+        seed_counts=np.zeros((n_teams, max_seeds), dtype=np.int64),
+        division_titles=np.zeros(n_teams, dtype=np.int64),
+    )
+
+    chunk = chunk_size_for(league, memory_mb)
+    for start in range(0, sims, chunk):
+        size = min(chunk, sims - start)
+
+        home_won = (rng.random((size, n_games)) < probability).astype(np.float32)
+        wins = league.wins + (home_won @ home_matrix + (1 - home_won) @ away_matrix).astype(np.int64)
+
+        # Final win totals histogram: flat index team * max_wins + wins
+        flat = (np.arange(n_teams) * max_wins + wins).ravel()
+        tally.win_counts += np.bincount(flat, minlength=n_teams * max_wins).reshape(n_teams, max_wins)
+
+        # Random fractional jitter breaks ties without changing any win ordering
+        ranking_score = wins + rng.random((size, n_teams)) * 0.5
+
+        for members in conference_members:
+            order = np.argsort(-ranking_score[:, members], axis=1)
+            seeds = np.empty_like(order)
+            np.put_along_axis(seeds, order, np.arange(len(members)), axis=1)
+            flat = (members * max_seeds + seeds).ravel()
+            tally.seed_counts += np.bincount(flat, minlength=n_teams * max_seeds).reshape(n_teams, max_seeds)
+
+        for members in division_members:
+            winners = members[np.argmax(ranking_score[:, members], axis=1)]
+            tally.division_titles += np.bincount(winners, minlength=n_teams)
+
+        tally.sims += size
+
+    return tally
+
+
+def _simulate_part(args: tuple) -> SimulationTally:
+    league, sims, seed, memory_mb = args
+    return simulate(league, sims, seed, memory_mb)
+
+
+def simulate_parallel(
+    league: League,
+    sims: int,
+    workers: int,
+    seed: int | None = None,
+    memory_mb: float = 64,
+) -> SimulationTally:
+    """
+    Split the simulations across a process pool with independent random streams.
+    """
+    if workers <= 1:
+        return simulate(league, sims, seed, memory_mb)
+
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    parts = [sims // workers + (i < sims % workers) for i in range(workers)]
+    jobs = [(league, part, part_seed, memory_mb) for part, part_seed in zip(parts, seeds) if part]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tallies = list(pool.map(_simulate_part, jobs))
+
+    total = tallies[0]
+    for tally in tallies[1:]:
+        total = total + tally
+    return total
+
+
+def projections(league: League, tally: SimulationTally, registry: TeamRegistry) -> pd.DataFrame:
+    """
+    Per-team projected wins and playoff, seed and division odds.
+
+    Returns: DataFrame sorted by conference and projected wins
+    """
+    wins_axis = np.arange(tally.win_counts.shape[1])
+    win_share = tally.win_counts / tally.sims
+    cumulative = win_share.cumsum(axis=1)
+    seed_share = tally.seed_counts / tally.sims
+
+    rows = []
+    for i, team_id in enumerate(league.team_ids):
+        team = registry.by_id(int(team_id))
+        rows.append({
+            "team_id": int(team_id),
+            "team_abbreviation": team.team_abbreviation if team else str(team_id),
+            "conference": league.conferences[i],
+            "division": league.divisions[i],
+            "wins": int(league.wins[i]),
+            "losses": int(league.losses[i]),
+            "projected_wins": float(win_share[i] @ wins_axis),
+            "wins_p10": int(np.searchsorted(cumulative[i], 0.1)),
+            "wins_p90": int(np.searchsorted(cumulative[i], 0.9)),
+            "top_seed_prob": float(seed_share[i, 0]),
+            "playoff_prob": float(seed_share[i, :PLAYOFF_SEEDS].sum()),
+            "play_in_prob": float(seed_share[i, PLAYOFF_SEEDS:PLAY_IN_SEEDS].sum()),
+            "division_prob": float(tally.division_titles[i] / tally.sims),
+            "seed_probs": seed_share[i].round(4).tolist(),
+        })
+
+    return pd.DataFrame(rows, columns=PROJECTION_COLUMNS).sort_values(["conference", "projected_wins"], ascending=[True, False], ignore_index=True)
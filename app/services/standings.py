@@ -0,0 +1,132 @@
+"""
+Standings
+
+Maintains team_season_summary, each team's season record aggregated from
+its final games. When games land, only the teams that played them are
+re-aggregated: their rows are deleted and rebuilt from games with one
+INSERT ... SELECT, inside the loader's transaction.
+
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import and_, case, delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models import Game, TeamSeasonSummary
+
+SUMMARY_COLUMNS = [
+    "season", "team_id", "games_played", "wins", "losses", "win_pct",
+    "home_wins", "home_losses", "away_wins", "away_losses",
+    "points_for", "points_against", "avg_margin", "last_game_date",
+]
+
+
+def affected_teams(games: Iterable) -> dict[int, set[int]]:
+    """
+    Teams whose summaries a batch of changed games touches, by season.
+
+    games are rows or objects with season, home_team_id, away_team_id
+    and game_status. Games that aren't final don't change any record.
+    """
+    teams = defaultdict(set)
+    for game in games:
+        if game.game_status == "final":
+            teams[game.season].update((game.home_team_id, game.away_team_id))
+    return dict(teams)
+
+
+def summary_select(season: int, team_ids: Iterable[int] | None = None):
+    """
+    Aggregate the season's final games into one summary row per team.
+    """
+    played = and_(
+        Game.season == season,
+        Game.game_status == "final",
+        Game.home_score.is_not(None),
+        Game.away_score.is_not(None),
+    )
+
+    # Each game once from each team's side
+    sides = []
+    for team, points_for, points_against, is_home in (
+        (Game.home_team_id, Game.home_score, Game.away_score, True),
+        (Game.away_team_id, Game.away_score, Game.home_score, False),
+    ):
+        stmt = select(
+            team.label("team_id"),
+            Game.game_date,
+            literal(is_home).label("is_home"),
+            points_for.label("points_for"),
+            points_against.label("points_against"),
+        ).where(played)
+        if team_ids is not None:
+            stmt = stmt.where(team.in_(list(team_ids)))
+        sides.append(stmt)
+    side = union_all(*sides).subquery()
+
+    won = side.c.points_for > side.c.points_against
+    games = func.count()
+    wins = func.sum(case((won, 1), else_=0))
+
+    def split(home: bool, result: bool):
+        side_filter = side.c.is_home if home else ~side.c.is_home
+        return func.sum(case((and_(side_filter, won if result else ~won), 1), else_=0))
+
+    return select(
+        literal(season).label("season"),
+        side.c.team_id,
+        games.label("games_played"),
+        wins.label("wins"),
+        (games - wins).label("losses"),
+        (wins * 1.0 / games).label("win_pct"),
+        split(True, True).label("home_wins"),
+        split(True, False).label("home_losses"),
+        split(False, True).label("away_wins"),
+        split(False, False).label("away_losses"),
+        func.sum(side.c.points_for).label("points_for"),
+        func.sum(side.c.points_against).label("points_against"),
+        (func.sum(side.c.points_for - side.c.points_against) * 1.0 / games).label("avg_margin"),
+        func.max(side.c.game_date).label("last_game_date"),
+    ).group_by(side.c.team_id)
+
+
+def refresh_team_summaries(db: Session, season: int, team_ids: Iterable[int] | None = None) -> int:
+    """
+    Rebuild the summaries of the given teams (all teams if None) for a season.
+
+    Caller is responsible for committing.
+
+    Returns: Number of summary rows written
+    """
+    if team_ids is not None:
+        team_ids = sorted(set(team_ids))
+        if not team_ids:
+            return 0
+
+    clear = delete(TeamSeasonSummary).where(TeamSeasonSummary.season == season)
+    if team_ids is not None:
+        clear = clear.where(TeamSeasonSummary.team_id.in_(team_ids))
+    db.execute(clear)
+
+    written = db.execute(
+        insert(TeamSeasonSummary)
+        .from_select(SUMMARY_COLUMNS, summary_select(season, team_ids))
+        .returning(TeamSeasonSummary.team_id)
+    ).all()
+    return len(written)
+
+
+def refresh_affected(db: Session, games: Iterable) -> int:
+    """
+    Refresh the summaries of every team that played in the changed games.
+
+    Caller is responsible for committing.
+
+    Returns: Number of summary rows written
+    """
+    return sum(
+        refresh_team_summaries(db, season, team_ids)
+        for season, team_ids in affected_teams(games).items()
+    )
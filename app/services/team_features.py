@@ -0,0 +1,248 @@
+"""
+Team Feature Engineering
+
+Builds the rolling TeamStats features for every (team, game) pair in one
+vectorized pass over a long-form team-game frame. Every value describes
+the team *going into* the game, so a game's own result never leaks into
+its features.
+
+Features reset at the start of each season, and only final games count
+towards them. Scheduled games still get a row so upcoming matchups can
+be scored.
+
+"""
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Select, and_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models import Game, GameRating, TeamStats
+from app.services.elo import RATING_COLUMNS
+
+# The API only needs the column lists and matchup_select from here, so
+# pandas is imported by the functions that build frames
+if TYPE_CHECKING:
+    import pandas as pd
+
+# TeamStats columns produced by build_team_stats, in table order
+FEATURE_COLUMNS = [
+    "wins",
+    "losses",
+    "win_pct",
+    "pts_per_game_last10",
+    "opp_pts_per_game_last10",
+    "last_5_wins",
+    "last_10_wins",
+    "home_win_pct",
+    "away_win_pct",
+    "days_rest",
+    "is_back_to_back",
+    "win_streak",
+    "loss_streak",
+    "avg_margin",
+]
+
+GAME_COLUMNS = [
+    "game_id",
+    "game_date",
+    "season",
+    "home_team_id",
+    "away_team_id",
+    "home_score",
+    "away_score",
+    "game_status",
+]
+
+# Columns of the per-game matchup frame used for training and prediction
+MATCHUP_FEATURES = [
+    *(f"{side}_{column}" for side in ("home", "away") for column in FEATURE_COLUMNS),
+    *RATING_COLUMNS,
+]
+
+# Stats are tracked per team per season
+GROUP_KEYS = ["team_id", "season"]
+
+
+def load_games_frame(db: Session, seasons: list[int] | None = None) -> "pd.DataFrame":
+    """
+    Read games into a DataFrame with one row per game.
+    """
+    import pandas as pd
+
+    stmt = select(*(getattr(Game, column) for column in GAME_COLUMNS))
+    if seasons:
+        stmt = stmt.where(Game.season.in_(seasons))
+
+    games = pd.read_sql(stmt, db.connection())
+    games["game_date"] = pd.to_datetime(games["game_date"])
+    return games
+
+
+def team_game_frame(games: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Stack games into long form: one row per team per game, sorted chronologically per team.
+    """
+    import pandas as pd
+
+    scores_known = games["home_score"].notna() & games["away_score"].notna()
+    played = (games["game_status"] == "final") & scores_known
+
+    sides = []
+    for is_home, team, opp, pts, opp_pts in (
+        (True, "home_team_id", "away_team_id", "home_score", "away_score"),
+        (False, "away_team_id", "home_team_id", "away_score", "home_score"),
+    ):
+        sides.append(pd.DataFrame({
+            "team_id": games[team].to_numpy(),
+            "opponent_id": games[opp].to_numpy(),
+            "game_id": games["game_id"].to_numpy(),
+            "season": games["season"].to_numpy(),
+            "game_date": pd.to_datetime(games["game_date"]).to_numpy(),
+            "is_home": is_home,
+            "played": played.to_numpy(),
+            "pts": games[pts].to_numpy(dtype=float, na_value=0.0),
+            "opp_pts": games[opp_pts].to_numpy(dtype=float, na_value=0.0),
+        }))
+
+    long = pd.concat(sides, ignore_index=True)
+    long = long.sort_values(["team_id", "season", "game_date", "game_id"], ignore_index=True)
+
+    # Unplayed games contribute nothing to the running totals
+    long.loc[~long["played"], ["pts", "opp_pts"]] = 0.0
+    long["win"] = (long["played"] & (long["pts"] > long["opp_pts"])).astype(float)
+    long["loss"] = (long["played"] & (long["pts"] < long["opp_pts"])).astype(float)
+    long["margin"] = long["pts"] - long["opp_pts"]
+
+    return long
+
+
+def _rolling_sum(grouped_cumsum: "pd.Series", keys: list["pd.Series"], window: int) -> "pd.Series":
+    # Rolling sum from a per-group running total: total now minus total `window` games ago
+    return grouped_cumsum - grouped_cumsum.groupby(keys).shift(window).fillna(0.0)
+
+
+def _state_after_played_games(long: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Rolling state right after each final game, computed over final games only.
+    """
+    import pandas as pd
+
+    played = long[long["played"]]
+    keys = [played[key] for key in GROUP_KEYS]
+    grouped = played.groupby(keys)
+
+    games_played = grouped.cumcount() + 1
+    pts_total = grouped["pts"].cumsum()
+    opp_pts_total = grouped["opp_pts"].cumsum()
+    wins_total = grouped["win"].cumsum()
+
+    # A new run starts whenever the result flips (shift is NaN at a group start)
+    run_id = (played["win"] != grouped["win"].shift()).cumsum()
+    run_length = played.groupby(run_id).cumcount() + 1
+
+    last10_games = games_played.clip(upper=10)
+
+    return pd.DataFrame({
+        "pts_per_game_last10": _rolling_sum(pts_total, keys, 10) / last10_games,
+        "opp_pts_per_game_last10": _rolling_sum(opp_pts_total, keys, 10) / last10_games,
+        "last_5_wins": _rolling_sum(wins_total, keys, 5),
+        "last_10_wins": _rolling_sum(wins_total, keys, 10),
+        "win_streak": run_length.where(played["win"] == 1, 0),
+        "loss_streak": run_length.where(played["loss"] == 1, 0),
+        "last_game_date": played["game_date"],
+    }, index=played.index)
+
+
+def build_team_stats(games: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Compute TeamStats features for every team in every game.
+
+    games needs the columns in GAME_COLUMNS, one row per game.
+
+    Returns: DataFrame with team_id, game_id, season and FEATURE_COLUMNS
+    """
+    import pandas as pd
+
+    long = team_game_frame(games)
+    keys = [long[key] for key in GROUP_KEYS]
+
+    # Running totals minus the current game give "going into this game" values
+    def before(column: "pd.Series") -> "pd.Series":
+        return column.groupby(keys).cumsum() - column
+
+    wins = before(long["win"])
+    losses = before(long["loss"])
+    games_played = wins + losses
+
+    home_played = (long["played"] & long["is_home"]).astype(float)
+    away_played = (long["played"] & ~long["is_home"]).astype(float)
+    home_games = before(home_played)
+    away_games = before(away_played)
+
+    margin_total = before(long["margin"])
+
+    # Rolling state as of the team's previous final game. Shifting within the
+    # group and forward-filling carries it over any unplayed games in between.
+    after = _state_after_played_games(long).reindex(long.index)
+    previous = after.groupby(keys).shift(1).groupby(keys).ffill()
+
+    days_rest = (long["game_date"] - previous["last_game_date"]).dt.days
+
+    stats = pd.DataFrame({
+        "team_id": long["team_id"],
+        "game_id": long["game_id"],
+        "season": long["season"],
+        "wins": wins.astype(int),
+        "losses": losses.astype(int),
+        "win_pct": (wins / games_played).fillna(0.0),
+        "pts_per_game_last10": previous["pts_per_game_last10"],
+        "opp_pts_per_game_last10": previous["opp_pts_per_game_last10"],
+        "last_5_wins": previous["last_5_wins"].astype("Int64"),
+        "last_10_wins": previous["last_10_wins"].astype("Int64"),
+        "home_win_pct": before(long["win"] * home_played) / home_games.where(home_games > 0),
+        "away_win_pct": before(long["win"] * away_played) / away_games.where(away_games > 0),
+        "days_rest": days_rest.astype("Int64"),
+        "is_back_to_back": (days_rest == 1).to_numpy(),
+        "win_streak": previous["win_streak"].fillna(0).astype(int),
+        "loss_streak": previous["loss_streak"].fillna(0).astype(int),
+        "avg_margin": margin_total / games_played.where(games_played > 0),
+    })
+
+    return stats
+
+
+def matchup_select() -> Select:
+    """
+    Games joined to the home and away TeamStats rows and the game's Elo
+    ratings, one row per game.
+
+    Callers add their own filters. Games without stats or ratings yet
+    still appear, with null features.
+    """
+    home = aliased(TeamStats)
+    away = aliased(TeamStats)
+
+    return (
+        select(
+            *(getattr(Game, column) for column in GAME_COLUMNS),
+            *(getattr(home, column).label(f"home_{column}") for column in FEATURE_COLUMNS),
+            *(getattr(away, column).label(f"away_{column}") for column in FEATURE_COLUMNS),
+            *(getattr(GameRating, column) for column in RATING_COLUMNS),
+        )
+        .outerjoin(home, and_(home.game_id == Game.game_id, home.team_id == Game.home_team_id))
+        .outerjoin(away, and_(away.game_id == Game.game_id, away.team_id == Game.away_team_id))
+        .outerjoin(GameRating, GameRating.game_id == Game.game_id)
+    )
+
+
+def add_target(matchups: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Add home_win: 1/0 for final games, null for games not played yet.
+    """
+    import pandas as pd
+
+    played = (matchups["game_status"] == "final") & matchups["home_score"].notna() & matchups["away_score"].notna()
+    home_win = (matchups["home_score"] > matchups["away_score"]).astype("Int64")
+    matchups["home_win"] = home_win.where(played, pd.NA)
+    return matchups
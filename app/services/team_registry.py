@@ -0,0 +1,229 @@
+"""
+Team Registry
+
+The 30 teams never change during a season, so they're loaded once into
+an immutable in-process registry indexed by id and by abbreviation.
+Services and endpoints resolve teams from memory instead of querying
+the teams table.
+
+The registry loads from the database on first use and falls back to
+NBA_TEAMS if the database isn't reachable or has no teams yet. A
+registry loaded from the database is reloaded every
+team_registry_ttl_seconds, so a running API picks up seed_teams.py; a
+defaults fallback is retried every DEFAULTS_RETRY_SECONDS rather than
+kept. Reloads run on a background thread while lookups keep using the
+current registry, so a request never waits on the teams table.
+
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import Team
+
+logger = logging.getLogger(__name__)
+
+# How soon a registry that fell back to NBA_TEAMS tries the database again
+DEFAULTS_RETRY_SECONDS = 30
+
+# All 30 NBA teams with their divisions and conferences
+NBA_TEAMS = [
+    # Eastern Conference - Atlantic Division
+    {"team_abbreviation": "BOS", "team_name": "Boston Celtics", "conference": "East", "division": "Atlantic"},
+    {"team_abbreviation": "BKN", "team_name": "Brooklyn Nets", "conference": "East", "division": "Atlantic"},
+    {"team_abbreviation": "NYK", "team_name": "New York Knicks", "conference": "East", "division": "Atlantic"},
+    {"team_abbreviation": "PHI", "team_name": "Philadelphia 76ers", "conference": "East", "division": "Atlantic"},
+    {"team_abbreviation": "TOR", "team_name": "Toronto Raptors", "conference": "East", "division": "Atlantic"},
+
+    # Eastern Conference - Central Division
+    {"team_abbreviation": "CHI", "team_name": "Chicago Bulls", "conference": "East", "division": "Central"},
+    {"team_abbreviation": "CLE", "team_name": "Cleveland Cavaliers", "conference": "East", "division": "Central"},
+    {"team_abbreviation": "DET", "team_name": "Detroit Pistons", "conference": "East", "division": "Central"},
+    {"team_abbreviation": "IND", "team_name": "Indiana Pacers", "conference": "East", "division": "Central"},
+    {"team_abbreviation": "MIL", "team_name": "Milwaukee Bucks", "conference": "East", "division": "Central"},
+
+    # Eastern Conference - Southeast Division
+    {"team_abbreviation": "ATL", "team_name": "Atlanta Hawks", "conference": "East", "division": "Southeast"},
+    {"team_abbreviation": "CHA", "team_name": "Charlotte Hornets", "conference": "East", "division": "Southeast"},
+    {"team_abbreviation": "MIA", "team_name": "Miami Heat", "conference": "East", "division": "Southeast"},
+    {"team_abbreviation": "ORL", "team_name": "Orlando Magic", "conference": "East", "division": "Southeast"},
+    {"team_abbreviation": "WAS", "team_name": "Washington Wizards", "conference": "East", "division": "Southeast"},
+
+    # Western Conference - Northwest Division
+    {"team_abbreviation": "DEN", "team_name": "Denver Nuggets", "conference": "West", "division": "Northwest"},
+    {"team_abbreviation": "MIN", "team_name": "Minnesota Timberwolves", "conference": "West", "division": "Northwest"},
+    {"team_abbreviation": "OKC", "team_name": "Oklahoma City Thunder", "conference": "West", "division": "Northwest"},
+    {"team_abbreviation": "POR", "team_name": "Portland Trail Blazers", "conference": "West", "division": "Northwest"},
+    {"team_abbreviation": "UTA", "team_name": "Utah Jazz", "conference": "West", "division": "Northwest"},
+
+    # Western Conference - Pacific Division
+    {"team_abbreviation": "GSW", "team_name": "Golden State Warriors", "conference": "West", "division": "Pacific"},
+    {"team_abbreviation": "LAC", "team_name": "Los Angeles Clippers", "conference": "West", "division": "Pacific"},
+    {"team_abbreviation": "LAL", "team_name": "Los Angeles Lakers", "conference": "West", "division": "Pacific"},
+    {"team_abbreviation": "PHX", "team_name": "Phoenix Suns", "conference": "West", "division": "Pacific"},
+    {"team_abbreviation": "SAC", "team_name": "Sacramento Kings", "conference": "West", "division": "Pacific"},
+
+    # Western Conference - Southwest Division
+    {"team_abbreviation": "DAL", "team_name": "Dallas Mavericks", "conference": "West", "division": "Southwest"},
+    {"team_abbreviation": "HOU", "team_name": "Houston Rockets", "conference": "West", "division": "Southwest"},
+    {"team_abbreviation": "MEM", "team_name": "Memphis Grizzlies", "conference": "West", "division": "Southwest"},
+    {"team_abbreviation": "NOP", "team_name": "New Orleans Pelicans", "conference": "West", "division": "Southwest"},
+    {"team_abbreviation": "SAS", "team_name": "San Antonio Spurs", "conference": "West", "division": "Southwest"},
+]
+
+
+@dataclass(frozen=True, slots=True)
+class TeamInfo:
+    team_id: int
+    team_abbreviation: str
+    team_name: str
+    conference: str | None
+    division: str | None
+
+
+class TeamRegistry:
+    """
+    Read-only lookup of teams by id and by abbreviation.
+    """
+
+    __slots__ = ("_by_id", "_by_abbreviation", "source", "version")
+
+    def __init__(self, teams: list[TeamInfo], source: str = "database"):
+        # "database" or "defaults", so callers can tell when the teams table wasn't used
+        self.source = source
+        self._by_id = MappingProxyType({team.team_id: team for team in teams})
+        self._by_abbreviation = MappingProxyType({team.team_abbreviation: team for team in teams})
+        # Changes whenever any team does, e.g. for HTTP ETags of responses that embed teams
+        ordered = sorted(teams, key=lambda team: team.team_id)
+        self.version = hashlib.blake2b(repr(ordered).encode(), digest_size=8).hexdigest()
+
+    @classmethod
+    def from_db(cls, db: Session) -> "TeamRegistry":
+        teams = db.execute(
+            select(Team.team_id, Team.team_abbreviation, Team.team_name, Team.conference, Team.division)
+        ).all()
+        return cls([TeamInfo(*team) for team in teams])
+
+    @classmethod
+    def from_defaults(cls) -> "TeamRegistry":
+        # Ids follow NBA_TEAMS order, which is what seed_teams produces on a fresh database
+        return cls([TeamInfo(team_id=i, **team) for i, team in enumerate(NBA_TEAMS, start=1)], source="defaults")
+
+    def by_id(self, team_id: int) -> TeamInfo | None:
+        return self._by_id.get(team_id)
+
+    def by_abbreviation(self, abbreviation: str) -> TeamInfo | None:
+        return self._by_abbreviation.get(abbreviation.upper())
+
+    def id_map(self) -> dict[str, int]:
+        """
+        Mapping of team abbreviation to team_id.
+        """
+        return {abbreviation: team.team_id for abbreviation, team in self._by_abbreviation.items()}
+
+    def __iter__(self) -> Iterator[TeamInfo]:
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+_registry: TeamRegistry | None = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+# Held while a background reload runs, so there's only ever one
+_refresh_lock = threading.Lock()
+
+
+def load_team_registry(db: Session | None = None) -> TeamRegistry:
+    """
+    (Re)load the process-wide registry from the teams table.
+
+    Falls back to NBA_TEAMS if the database can't be read or has no teams.
+    """
+    global _registry, _loaded_at
+
+    # Imported here so importing the registry doesn't require a database
+    from app.database.session import SessionLocal
+
+    with _lock:
+        try:
+            if db is not None:
+                registry = TeamRegistry.from_db(db)
+            else:
+                with SessionLocal() as session:
+                    registry = TeamRegistry.from_db(session)
+        except SQLAlchemyError as e:
+            if _registry is not None and _registry.source == "database":
+                # A reload that fails keeps the teams already loaded
+                logger.warning("Could not reload teams from the database, keeping the current ones: %s", e)
+                registry = _registry
+            else:
+                logger.warning("Could not load teams from the database, using defaults: %s", e)
+                registry = TeamRegistry.from_defaults()
+
+        if len(registry) == 0:
+            logger.warning("No teams in the database, using defaults. Run seed_teams.py.")
+            registry = TeamRegistry.from_defaults()
+
+        _registry = registry
+        _loaded_at = time.monotonic()
+        return registry
+
+
+def _is_stale(registry: TeamRegistry, loaded_at: float) -> bool:
+    if registry.source == "defaults":
+        max_age = DEFAULTS_RETRY_SECONDS
+    else:
+        max_age = get_settings().team_registry_ttl_seconds
+        if max_age <= 0:
+            return False
+    return time.monotonic() - loaded_at > max_age
+
+
+def _reload_in_background() -> None:
+    if not _refresh_lock.acquire(blocking=False):
+        return  # Already reloading
+
+    def reload() -> None:
+        try:
+            load_team_registry()
+        finally:
+            _refresh_lock.release()
+
+    threading.Thread(target=reload, name="team-registry-reload", daemon=True).start()
+
+
+def get_team_registry() -> TeamRegistry:
+    """
+    The process-wide registry, loaded on first use and reloaded in the
+    background once stale.
+    """
+    registry = _registry
+    if registry is None:
+        return load_team_registry()
+    if _is_stale(registry, _loaded_at):
+        _reload_in_background()
+    return registry
+
+
+def invalidate_team_registry() -> None:
+    """
+    Drop this process's registry so the next lookup reloads it.
+
+    Other processes, such as a running API, reload on their own within
+    team_registry_ttl_seconds.
+    """
+    global _registry
+    with _lock:
+        _registry = None
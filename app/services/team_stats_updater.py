@@ -0,0 +1,297 @@
+"""
+Incremental TeamStats Updates
+
+Keeps a compact running state per team so TeamStats rows for newly
+final games can be produced without rebuilding the whole history.
+Every feature is a running aggregate, so applying games one at a time
+in date order gives exactly the same values as build_team_stats.
+
+The state can be saved to JSON and loaded back, so a restarted process
+doesn't need to replay the season.
+
+Each state also remembers which games it has recorded. A final game
+dated at or before a team's last applied game that it hasn't recorded
+(a postponed or corrected game arriving late) can't be slotted in
+incrementally, so that team's season is replayed from scratch instead.
+
+
+"""
+
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from app.services.team_features import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Longest rolling window any feature needs
+WINDOW = 10
+
+
+@dataclass(slots=True)
+class TeamState:
+    """
+    Everything needed to compute a team's features going into its next game.
+    """
+
+    season: int
+    wins: int = 0
+    losses: int = 0
+    home_wins: int = 0
+    home_games: int = 0
+    away_wins: int = 0
+    away_games: int = 0
+    margin_total: int = 0
+    recent_pts: deque = field(default_factory=lambda: deque(maxlen=WINDOW))
+    recent_opp_pts: deque = field(default_factory=lambda: deque(maxlen=WINDOW))
+    recent_wins: deque = field(default_factory=lambda: deque(maxlen=WINDOW))
+    win_streak: int = 0
+    loss_streak: int = 0
+    last_game_date: date | None = None
+    last_game_id: str | None = None
+    # Games recorded this season, None for states saved before this was tracked
+    game_ids: set[str] | None = field(default_factory=set)
+
+    def features(self, game_date: date) -> dict:
+        """
+        Feature values for a game on game_date, given the games recorded so far.
+        """
+        games = self.wins + self.losses
+        recent = len(self.recent_wins)
+        days_rest = (game_date - self.last_game_date).days if self.last_game_date else None
+
+        return {
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_pct": self.wins / games if games else 0.0,
+            "pts_per_game_last10": sum(self.recent_pts) / recent if recent else None,
+            "opp_pts_per_game_last10": sum(self.recent_opp_pts) / recent if recent else None,
+            "last_5_wins": sum(list(self.recent_wins)[-5:]) if recent else None,
+            "last_10_wins": sum(self.recent_wins) if recent else None,
+            "home_win_pct": self.home_wins / self.home_games if self.home_games else None,
+            "away_win_pct": self.away_wins / self.away_games if self.away_games else None,
+            "days_rest": days_rest,
+            "is_back_to_back": days_rest == 1,
+            "win_streak": self.win_streak,
+            "loss_streak": self.loss_streak,
+            "avg_margin": self.margin_total / games if games else None,
+        }
+
+    def record(self, game_id: str, game_date: date, pts: int, opp_pts: int, is_home: bool) -> None:
+        """
+        Add a final game's result to the running state.
+        """
+        won = pts > opp_pts
+        lost = pts < opp_pts
+
+        self.wins += won
+        self.losses += lost
+        if is_home:
+            self.home_wins += won
+            self.home_games += 1
+        else:
+            self.away_wins += won
+            self.away_games += 1
+
+        self.margin_total += pts - opp_pts
+        self.recent_pts.append(pts)
+        self.recent_opp_pts.append(opp_pts)
+        self.recent_wins.append(int(won))
+
+        self.win_streak = self.win_streak + 1 if won else 0
+        self.loss_streak = self.loss_streak + 1 if lost else 0
+
+        self.last_game_date = game_date
+        self.last_game_id = game_id
+        if self.game_ids is not None:
+            self.game_ids.add(game_id)
+
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        for name in ("recent_pts", "recent_opp_pts", "recent_wins"):
+            data[name] = list(data[name])
+        data["last_game_date"] = self.last_game_date.isoformat() if self.last_game_date else None
+        data["game_ids"] = sorted(self.game_ids) if self.game_ids is not None else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TeamState":
+        data = dict(data)
+        for name in ("recent_pts", "recent_opp_pts", "recent_wins"):
+            data[name] = deque(data[name], maxlen=WINDOW)
+        if data["last_game_date"]:
+            data["last_game_date"] = date.fromisoformat(data["last_game_date"])
+        game_ids = data.get("game_ids")
+        data["game_ids"] = set(game_ids) if game_ids is not None else None
+        return cls(**data)
+
+
+def _final_mask(games: pd.DataFrame) -> pd.Series:
+    return (games["game_status"] == "final") & games["home_score"].notna() & games["away_score"].notna()
+
+
+class TeamStatsUpdater:
+    """
+    Produce TeamStats rows for new final games in O(new games).
+    """
+
+    def __init__(self, states: dict[int, TeamState] | None = None):
+        self.states: dict[int, TeamState] = states or {}
+
+    @classmethod
+    def from_games(cls, games: pd.DataFrame) -> "TeamStatsUpdater":
+        """
+        State of every team as of its most recent season with a final game.
+
+        A team whose latest season has only scheduled games so far keeps
+        the state of the season before, like any team between seasons.
+        """
+        final = games[_final_mask(games)]
+        latest = pd.concat([
+            final[["home_team_id", "season"]].set_axis(["team_id", "season"], axis=1),
+            final[["away_team_id", "season"]].set_axis(["team_id", "season"], axis=1),
+        ]).groupby("team_id")["season"].max()
+
+        # Later seasons only reset the teams that have final games in them
+        updater = cls()
+        for season in sorted(latest.unique()):
+            updater.apply(games[games["season"] == season])
+        return updater
+
+    def _state_for(self, team_id: int, season: int, game_id: str, game_date: date) -> TeamState | None:
+        """
+        State to use for a team's game, or None if the game was already applied.
+        """
+        state = self.states.get(team_id)
+
+        # Stats reset at the start of every season
+        if state is None or season > state.season:
+            state = self.states[team_id] = TeamState(season=season)
+            return state
+
+        # Games at or before the last recorded one were already applied
+        if season < state.season:
+            return None
+        if self._is_applied(state, game_id, game_date):
+            return None
+        return state
+
+    @staticmethod
+    def _is_applied(state: TeamState, game_id: str, game_date: date) -> bool:
+        return state.last_game_date is not None and (game_date, game_id) <= (state.last_game_date, state.last_game_id)
+
+    def _reset_late_seasons(self, final: pd.DataFrame) -> None:
+        """
+        Start over the season of any team with a late final game: one dated
+        at or before its last applied game that it never recorded.
+        """
+        late: dict[int, str] = {}
+        for game in final.itertuples(index=False):
+            game_date = pd.Timestamp(game.game_date).date()
+            for team_id in (game.home_team_id, game.away_team_id):
+                state = self.states.get(team_id)
+                if (
+                    state is not None
+                    and state.season == game.season
+                    and state.game_ids is not None
+                    and game.game_id not in state.game_ids
+                    and self._is_applied(state, game.game_id, game_date)
+                ):
+                    late.setdefault(team_id, game.game_id)
+
+        for team_id, game_id in late.items():
+            season = self.states[team_id].season
+            logger.warning(
+                "Final game %s arrived after later games of team %s, rebuilding its %s season",
+                game_id, team_id, season,
+            )
+            self.states[team_id] = TeamState(season=season)
+
+    def apply(self, games: pd.DataFrame) -> pd.DataFrame:
+        """
+        Record newly final games and return their TeamStats rows.
+
+        games has one row per game with the GAME_COLUMNS of team_features.
+        Non-final games and games already applied are ignored. A team with
+        a late final game gets rows for every final game of its season, so
+        games must hold the whole season of any team it updates.
+
+        Returns: DataFrame with team_id, game_id, season and FEATURE_COLUMNS
+        """
+        final = games[_final_mask(games)].sort_values(["game_date", "game_id"])
+        self._reset_late_seasons(final)
+
+        rows = []
+        for game in final.itertuples(index=False):
+            game_date = pd.Timestamp(game.game_date).date()
+            sides = (
+                (game.home_team_id, int(game.home_score), int(game.away_score), True),
+                (game.away_team_id, int(game.away_score), int(game.home_score), False),
+            )
+            for team_id, pts, opp_pts, is_home in sides:
+                state = self._state_for(team_id, game.season, game.game_id, game_date)
+                if state is None:
+                    continue
+
+                rows.append({
+                    "team_id": team_id,
+                    "game_id": game.game_id,
+                    "season": game.season,
+                    **state.features(game_date),
+                })
+                state.record(game.game_id, game_date, pts, opp_pts, is_home)
+
+        return self._to_frame(rows)
+
+    def preview(self, games: pd.DataFrame) -> pd.DataFrame:
+        """
+        TeamStats rows for upcoming games, without changing the state.
+        """
+        rows = []
+        for game in games.itertuples(index=False):
+            game_date = pd.Timestamp(game.game_date).date()
+            for team_id in (game.home_team_id, game.away_team_id):
+                state = self.states.get(team_id)
+                if state is None or state.season != game.season:
+                    state = TeamState(season=game.season)
+                rows.append({
+                    "team_id": team_id,
+                    "game_id": game.game_id,
+                    "season": game.season,
+                    **state.features(game_date),
+                })
+
+        return self._to_frame(rows)
+
+    @staticmethod
+    def _to_frame(rows: list[dict]) -> pd.DataFrame:
+        frame = pd.DataFrame(rows, columns=["team_id", "game_id", "season", *FEATURE_COLUMNS])
+        for column in ("last_5_wins", "last_10_wins", "days_rest"):
+            frame[column] = frame[column].astype("Int64")
+        return frame
+
+    def save(self, path: Path | str) -> None:
+        """
+        Write the per-team state to a JSON file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {str(team_id): state.to_dict() for team_id, state in self.states.items()}
+        path.write_text(json.dumps(data, indent=2))
+
+    @classmethod
+    def load(cls, path: Path | str) -> "TeamStatsUpdater":
+        """
+        Restore an updater from a file written by save(). A missing file gives an empty state.
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text())
+        return cls({int(team_id): TeamState.from_dict(state) for team_id, state in data.items()})
@@ -0,0 +1,85 @@
+"""
+Fetch Scheduler
+
+Runs API requests concurrently on a thread pool. Every request goes
+through a shared TokenBucket, so wall-clock time is set by the rate
+limit, and timeouts are retried with exponential backoff and jitter.
+
+"""
+
+import logging
+import random
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class FetchScheduler:
+    """
+    Concurrency, rate limiting and retries for outgoing requests.
+
+    map() fans work out across the pool; the work function should wrap
+    each network call in call() so it is rate limited and retried.
+    Without a limiter requests aren't paced at all.
+    """
+
+    def __init__(
+        self,
+        limiter: TokenBucket | None,
+        max_workers: int = 1,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        retry_on: tuple[type[BaseException], ...] = (TimeoutError, ConnectionError),
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.limiter = limiter
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.retry_on = retry_on
+        self._sleep = sleep
+
+    def backoff_delay(self, attempt: int) -> float:
+        # "Full jitter": random delay up to the exponential cap
+        return random.uniform(0, self.backoff_seconds * (2 ** attempt))
+
+    def call(self, fn: Callable[..., R], *args, **kwargs) -> R:
+        """
+        Make one rate-limited request, retrying on the configured errors.
+        """
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                return fn(*args, **kwargs)
+            except self.retry_on as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning("Request failed (%s), retrying in %.1fs", e.__class__.__name__, delay)
+                self._sleep(delay)
+                attempt += 1
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """
+        Run fn over items on the thread pool.
+
+        Returns: Results in the same order as items. The first error is
+        re-raised after all submitted work has finished.
+        """
+        items = list(items)
+        if self.max_workers == 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            futures = [pool.submit(fn, item) for item in items]
+        return [future.result() for future in futures]
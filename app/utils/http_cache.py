@@ -0,0 +1,108 @@
+"""
+HTTP Caching
+
+Conditional GET support for the data endpoints. Each endpoint works out
+a data version with one small indexed query (the newest updated_at
+behind its response, plus things like the model version) and passes it
+to not_modified_response, which:
+
+- derives a strong ETag from the version and the request URL,
+- sets ETag, Last-Modified and Cache-Control on the response,
+- returns a 304 when If-None-Match (or, without it, If-Modified-Since)
+  shows the client already has this version.
+
+So a repeat poll costs the version query and nothing else, and
+Cache-Control lets browsers and a CDN skip even that for
+http_cache_max_age seconds.
+
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from app.config import get_settings
+
+# Headers a 304 repeats from the 200 it stands in for
+NOT_MODIFIED_HEADERS = ("etag", "last-modified", "cache-control")
+
+
+def make_etag(request: Request, *version: object) -> str:
+    """
+    Strong ETag for the requested URL at a data version.
+    """
+    # The app version covers response format changes between deploys
+    parts = (request.app.version, request.url.path, request.url.query, *version)
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def http_date(moment: datetime) -> str:
+    # Timestamps are stored without a zone and written as UTC
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return format_datetime(moment.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cache_control(max_age: int) -> str:
+    # 0 still lets clients keep a copy, but they check the ETag every time
+    return f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+
+
+def not_modified_response(
+    request: Request,
+    response: Response,
+    last_modified: datetime | None,
+    *version: object,
+) -> Response | None:
+    """
+    Put the caching headers on response, or return a 304 if the client's copy is current.
+
+    last_modified is the newest change behind the response (None when
+    there's no data), and is part of the version along with anything else
+    passed in version.
+    """
+    etag = make_etag(request, last_modified, *version)
+    response.headers["etag"] = etag
+    response.headers["cache-control"] = cache_control(get_settings().http_cache_max_age)
+    if last_modified is not None:
+        response.headers["last-modified"] = http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        current = etag_matches(if_none_match, etag)
+    else:
+        current = (
+            if_modified_since is not None
+            and last_modified is not None
+            and not_modified_since(if_modified_since, last_modified)
+        )
+
+    if not current:
+        return None
+    return Response(
+        status_code=304,
+        headers={name: response.headers[name] for name in NOT_MODIFIED_HEADERS if name in response.headers},
+    )
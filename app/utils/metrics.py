@@ -0,0 +1,226 @@
+"""
+Request Metrics
+
+Per-route latency histograms, in-flight gauges, status code counters and
+the number and duration of database queries per request, exposed in the
+Prometheus text format.
+
+MetricsMiddleware is plain ASGI, so it wraps streaming responses to the
+last byte and adds no extra task or thread per request. SQLAlchemy
+cursor events add each query's time to the current request's
+RequestStats, found through a context variable. Context variables follow
+a request into threadpool endpoints and the async engine's greenlets, so
+each request only writes to its own RequestStats.
+
+The route label is matched when a request comes in, so the in-flight
+gauge is per route too. Metrics are written only from the event loop
+thread, and the /metrics endpoint renders them there as well, so the
+registry needs no locks.
+
+"""
+
+import math
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Requests that match no route share one label, so bad URLs can't blow up cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    """
+    Stats of the request being handled, None outside a request.
+    """
+    return _request_stats.get()
+
+
+class Histogram:
+    """
+    Cumulative bucket counts as Prometheus expects them, plus sum and count.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip((*self.buckets, math.inf), self.counts):
+            total += count
+            rows.append(("+Inf" if bound == math.inf else _number(bound), total))
+        return rows
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.requests: dict[tuple[str, str, str], int] = defaultdict(int)
+        self.in_progress: dict[tuple[str, str], int] = defaultdict(int)
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.db_queries: dict[tuple[str, str], Histogram] = {}
+        self.db_seconds: dict[tuple[str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        key = (method, route)
+        self.requests[(method, route, str(status))] += 1
+        if key not in self.latency:
+            self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.db_queries[key] = Histogram(DB_QUERY_BUCKETS)
+            self.db_seconds[key] = Histogram(LATENCY_BUCKETS)
+        self.latency[key].observe(seconds)
+        self.db_queries[key].observe(stats.queries)
+        self.db_seconds[key].observe(stats.db_seconds)
+
+    def render(self) -> str:
+        """
+        Every metric in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP http_requests_total Requests handled, by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines += [
+            "# HELP http_requests_in_progress Requests currently being handled.",
+            "# TYPE http_requests_in_progress gauge",
+        ]
+        for (method, route), count in sorted(self.in_progress.items()):
+            lines.append(f"http_requests_in_progress{_labels(method=method, route=route)} {count}")
+
+        for name, help_text, histograms in (
+            ("http_request_duration_seconds", "Request latency, including streaming the body.", self.latency),
+            ("http_request_db_queries", "Database queries per request.", self.db_queries),
+            ("http_request_db_seconds", "Time per request spent in database queries.", self.db_seconds),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (method, route), histogram in sorted(histograms.items()):
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {count}")
+                labels = _labels(method=method, route=route)
+                lines.append(f"{name}_sum{labels} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+registry = MetricsRegistry()
+
+
+def _route_label(scope: dict) -> str:
+    """
+    Path template of the route the app will dispatch the request to.
+
+    Matched the way Starlette's router does it: the first full match, else
+    the first route that matches all but the method (it answers 405).
+    """
+    router = getattr(scope.get("app"), "router", None)
+    partial = None
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route
+    return partial.path if partial is not None else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording every HTTP request into the registry.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_label(scope)
+        status = 500  # Reported if the app raises before starting a response
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        self.registry.in_progress[(method, route)] += 1
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - start
+            self.registry.in_progress[(method, route)] -= 1
+            _request_stats.reset(token)
+            self.registry.observe(method, route, status, seconds, stats)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("query_start", None)
+    stats = _request_stats.get()
+    if start is not None and stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - start
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Count queries and their time against the current request. Safe to call twice.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
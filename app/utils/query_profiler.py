@@ -0,0 +1,225 @@
+"""
+Query Profiler
+
+Times every statement through SQLAlchemy's before/after_cursor_execute
+events and aggregates them by fingerprint: the statement with literals,
+bound parameters, IN lists and multi-row VALUES collapsed, so the same
+query with different arguments is counted together.
+
+Only statements slower than slow_query_ms are logged (as warnings), plus
+a random query_log_sample_rate share of the rest. Nothing else is
+written per query, so unlike echo it's cheap enough to leave on for bulk
+loads and API traffic.
+
+The slowest execution of each fingerprint is kept with its parameters,
+so report(explain_engine=...) can EXPLAIN the worst offenders on demand
+instead of slowing down the query that was slow.
+
+"""
+
+import hashlib
+import logging
+import math
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Durations kept per fingerprint for percentiles, as a uniform reservoir sample
+RESERVOIR_SIZE = 512
+
+# Beyond this many distinct fingerprints new ones are counted under OTHER
+MAX_FINGERPRINTS = 2000
+OTHER = "<other>"
+
+EXPLAIN_PREFIX = {"postgresql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|\$\d+|(?<!:):\w+")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so executions that differ only in values match.
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _LIST.sub("(...)", normalized)
+    normalized = _ROWS.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def percentile(values: list[float], q: float) -> float:
+    # Nearest rank
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def fingerprint_id(normalized: str) -> str:
+    return hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest()
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    samples: list[float] = field(default_factory=list)
+    # Slowest execution, kept for EXPLAIN
+    slowest_statement: str | None = None
+    slowest_parameters: Any = None
+    slowest_executemany: bool = False
+
+    def add(self, seconds: float, statement: str, parameters: Any, executemany: bool, rng: random.Random) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            slot = rng.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = seconds
+        if seconds >= self.max_seconds:
+            self.max_seconds = seconds
+            self.slowest_statement = statement
+            self.slowest_parameters = parameters
+            self.slowest_executemany = executemany
+
+    def summary(self) -> dict:
+        return {
+            "id": fingerprint_id(self.fingerprint),
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_ms": self.total_seconds * 1000,
+            "mean_ms": self.total_seconds / self.count * 1000,
+            "p95_ms": percentile(self.samples, 0.95) * 1000,
+            "max_ms": self.max_seconds * 1000,
+        }
+
+
+class QueryProfiler:
+    def __init__(self, slow_query_ms: float = 200, sample_rate: float = 0.0, seed: int | None = None):
+        self.slow_seconds = slow_query_ms / 1000
+        self.sample_rate = sample_rate
+        self._rng = random.Random(seed)
+        self._stats: dict[str, QueryStats] = {}
+        # Engine events fire from API threadpool workers and script threads
+        self._lock = threading.Lock()
+
+    def instrument(self, engine: Engine) -> None:
+        """
+        Profile every statement run on engine. Safe to call twice.
+        """
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["profiler_start"] = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop("profiler_start", None)
+        if start is not None:
+            self.record(statement, parameters, time.perf_counter() - start, executemany)
+
+    def record(self, statement: str, parameters: Any, seconds: float, executemany: bool = False) -> None:
+        normalized = fingerprint(statement)
+
+        with self._lock:
+            stats = self._stats.get(normalized)
+            if stats is None:
+                if len(self._stats) >= MAX_FINGERPRINTS:
+                    normalized = OTHER
+                    stats = self._stats.get(OTHER)
+                if stats is None:
+                    stats = self._stats[normalized] = QueryStats(normalized)
+            stats.add(seconds, statement, parameters, executemany, self._rng)
+
+        if seconds >= self.slow_seconds:
+            logger.warning("Slow query %.1f ms [%s]: %.1000s", seconds * 1000, fingerprint_id(normalized), statement)
+        elif self.sample_rate and self._rng.random() < self.sample_rate:
+            logger.info("Query %.1f ms [%s]: %.1000s", seconds * 1000, fingerprint_id(normalized), statement)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def report(self, top: int = 10, explain_engine: Engine | None = None) -> list[dict]:
+        """
+        Fingerprints with the most total time, worst first.
+
+        With explain_engine, each entry also gets the plan of its slowest
+        execution (plain EXPLAIN, so nothing is executed).
+        """
+        with self._lock:
+            ranked = sorted(self._stats.values(), key=lambda stats: stats.total_seconds, reverse=True)[:top]
+            entries = [(stats.summary(), stats.slowest_statement, stats.slowest_parameters, stats.slowest_executemany)
+                       for stats in ranked]
+
+        report = []
+        for summary, statement, parameters, executemany in entries:
+            if explain_engine is not None:
+                summary["explain"] = explain(explain_engine, statement, parameters, executemany)
+            report.append(summary)
+        return report
+
+    def format_report(self, top: int = 10, explain_engine: Engine | None = None) -> str:
+        lines = [f"{'total ms':>10} {'count':>8} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}  statement"]
+        for entry in self.report(top, explain_engine):
+            lines.append(
+                f"{entry['total_ms']:>10.1f} {entry['count']:>8} {entry['mean_ms']:>9.2f} "
+                f"{entry['p95_ms']:>9.2f} {entry['max_ms']:>9.2f}  [{entry['id']}] {entry['fingerprint'][:200]}"
+            )
+            for plan_line in entry.get("explain") or []:
+                lines.append(f"{'':>50}{plan_line}")
+        return "\n".join(lines)
+
+
+def explain(engine: Engine, statement: str | None, parameters: Any, executemany: bool = False) -> list[str] | None:
+    """
+    Query plan of a recorded statement, None if it can't be explained here.
+    """
+    prefix = EXPLAIN_PREFIX.get(engine.dialect.name)
+    if prefix is None or statement is None or executemany:
+        return None
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+
+    try:
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters or ()).all()
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+    return [" | ".join(str(value) for value in row) for row in rows]
+
+
+_profiler: QueryProfiler | None = None
+
+
+def get_query_profiler() -> QueryProfiler:
+    """
+    The process-wide profiler, configured from settings.
+    """
+    global _profiler
+    if _profiler is None:
+        settings = get_settings()
+        _profiler = QueryProfiler(settings.slow_query_ms, settings.query_log_sample_rate)
+    return _profiler
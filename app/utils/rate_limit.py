@@ -0,0 +1,61 @@
+"""
+Rate Limiting
+
+Thread-safe token bucket shared by every worker that talks to an
+external API, so the total request rate stays under the limit no matter
+how many requests run in parallel.
+
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at `rate` tokens per second up to `capacity`.
+
+    acquire() reserves tokens up front and then sleeps outside the lock,
+    so waiting callers queue up in order instead of busy-polling.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Block until `tokens` are available.
+
+        Returns: Seconds spent waiting
+        """
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._updated = now
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+            # Balance may go negative, which is how later callers know to wait longer
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
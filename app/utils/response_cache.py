@@ -0,0 +1,97 @@
+"""
+Response Cache
+
+Content-addressed on-disk cache for raw API responses. Each response is
+stored as gzipped JSON under <root>/<endpoint>/<key>.json.gz, where the
+key is a hash of the endpoint name and its request parameters.
+
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+
+class ResponseCache:
+    """
+    Cache raw JSON responses keyed by endpoint and parameters.
+
+    Entries never expire on their own; callers pass a max_age or a
+    fetched_since when reading so each request can decide how fresh its
+    data needs to be.
+    """
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict[str, Any]) -> str:
+        # Sorted keys so the same request always hashes the same way
+        blob = json.dumps({"endpoint": endpoint, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def path_for(self, endpoint: str, params: dict[str, Any]) -> Path:
+        return self.root / endpoint / f"{self.make_key(endpoint, params)}.json.gz"
+
+    def get(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        max_age: timedelta | None = None,
+        fetched_since: datetime | None = None,
+    ) -> dict | None:
+        """
+        Return the cached payload, or None if missing, older than max_age
+        or fetched before fetched_since.
+
+        A max_age of None means the entry never expires.
+        """
+        path = self.path_for(endpoint, params)
+        if not path.exists():
+            return None
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # Corrupt or partially written file, treat as a miss
+            return None
+
+        fetched_at = datetime.fromisoformat(entry["fetched_at"])
+        if max_age is not None and datetime.now(timezone.utc) - fetched_at > max_age:
+            return None
+        if fetched_since is not None and fetched_at < fetched_since:
+            return None
+
+        return entry["payload"]
+
+    def put(self, endpoint: str, params: dict[str, Any], payload: dict) -> Path:
+        """
+        Store a payload, replacing any previous entry for the same request.
+        """
+        path = self.path_for(endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        entry = {
+            "endpoint": endpoint,
+            "params": params,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "payload": payload,
+        }
+
+        # Write to a temp file then rename so readers never see half a file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        return path
@@ -0,0 +1,30 @@
+"""
+Season helpers
+
+An NBA season is identified by the year it starts in, so 2024 is the
+2024-25 season. Seasons tip off in October.
+
+"""
+
+from datetime import date
+
+
+def season_string(season: int) -> str:
+    # NBA API uses format "2024-25" for season
+    return f"{season}-{str(season + 1)[-2:]}"
+
+
+def current_season(today: date | None = None) -> int:
+    # Before October we're still in the season that started last year
+    today = today or date.today()
+    return today.year if today.month >= 10 else today.year - 1
+
+
+def is_completed_season(season: int, today: date | None = None) -> bool:
+    # Past seasons can't change anymore
+    return season < current_season(today)
+
+
+def season_end(season: int) -> date:
+    # First day the season counts as completed, when current_season rolls over
+    return date(season + 1, 10, 1)
@@ -0,0 +1,144 @@
+"""
+Synthetic League
+
+Seeded, reproducible fake seasons for benchmarks: games rows for the 30
+NBA_TEAMS (team_id = list position + 1, as in TeamRegistry.from_defaults)
+and the LeagueGameFinder responses the same games would come back as.
+
+Each team has a strength that drifts from season to season and shifts
+the expected score, so results carry enough signal to train a model on.
+Generation is vectorized per season, so hundreds of seasons take seconds.
+
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.services.team_registry import NBA_TEAMS
+from app.utils.seasons import season_string
+
+N_TEAMS = len(NBA_TEAMS)
+GAMES_PER_SEASON = N_TEAMS * 82 // 2
+
+# Regular seasons run over roughly 170 days from late October
+SEASON_DAYS = 170
+
+# datetime64[ns] ends in April 2262
+LAST_SEASON = pd.Timestamp.max.year - 2
+
+LEAGUE_GAME_FINDER_HEADERS = [
+    "SEASON_ID", "TEAM_ID", "TEAM_ABBREVIATION", "TEAM_NAME", "GAME_ID",
+    "GAME_DATE", "MATCHUP", "WL", "PTS", "PLUS_MINUS",
+]
+
+
+def synthetic_teams() -> list[dict]:
+    """
+    NBA_TEAMS with the team_id each gets when seeded into an empty table.
+    """
+    return [{"team_id": i + 1, **team} for i, team in enumerate(NBA_TEAMS)]
+
+
+def synthetic_games(
+    seasons: int,
+    first_season: int | None = None,
+    seed: int = 0,
+    scheduled_fraction: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Regular seasons of 1230 games in which every team plays 82.
+
+    first_season defaults to 2000, or earlier when that many seasons
+    wouldn't fit before LAST_SEASON. The last scheduled_fraction of the
+    final season is left unplayed, as scheduled games without scores.
+
+    Returns: DataFrame with the columns of the games table, game_date as datetime64
+    """
+    if first_season is None:
+        first_season = min(2000, LAST_SEASON - seasons + 1)
+
+    rng = np.random.default_rng(seed)
+    rounds = GAMES_PER_SEASON // (N_TEAMS // 2)
+    strength = rng.normal(0, 5, N_TEAMS)
+    frames = []
+
+    for season in range(first_season, first_season + seasons):
+        strength = 0.6 * strength + rng.normal(0, 4, N_TEAMS)
+
+        # Every team plays once per round, rounds fall on distinct days so rest varies
+        round_days = np.sort(rng.choice(SEASON_DAYS, rounds, replace=False))
+        matchups = rng.permuted(np.tile(np.arange(N_TEAMS), (rounds, 1)), axis=1).reshape(-1, 2)
+        home, away = matchups[:, 0], matchups[:, 1]
+
+        edge = (strength[home] - strength[away]) / 2 + 1.5
+        home_score = np.rint(rng.normal(112 + edge, 11)).astype(int)
+        away_score = np.rint(rng.normal(112 - edge, 11)).astype(int)
+        # Ties go to overtime, won by a basket either way
+        tied = home_score == away_score
+        home_wins_ot = rng.random(tied.sum()) < 0.5
+        home_score[tied] += 2 * home_wins_ot
+        away_score[tied] += 2 * ~home_wins_ot
+
+        frames.append(pd.DataFrame({
+            "game_id": [f"{season}{i:05d}" for i in range(GAMES_PER_SEASON)],
+            "game_date": pd.Timestamp(f"{season}-10-22") + pd.to_timedelta(np.repeat(round_days, N_TEAMS // 2), unit="D"),
+            "season": season,
+            "home_team_id": home + 1,
+            "away_team_id": away + 1,
+            "home_score": pd.array(home_score, dtype="Int64"),
+            "away_score": pd.array(away_score, dtype="Int64"),
+            "game_status": "final",
+        }))
+
+    games = pd.concat(frames, ignore_index=True)
+    games["is_playoffs"] = False
+
+    if scheduled_fraction > 0:
+        last = games.index[games["season"] == games["season"].max()]
+        unplayed = last[len(last) - int(len(last) * scheduled_fraction):]
+        games.loc[unplayed, ["home_score", "away_score"]] = pd.NA
+        games.loc[unplayed, "game_status"] = "scheduled"
+
+    return games
+
+
+def league_game_finder_payload(games: pd.DataFrame, season: int) -> dict:
+    """
+    The raw LeagueGameFinder response for a season's final games: one row per team per game.
+    """
+    teams = pd.DataFrame(synthetic_teams()).set_index("team_id")
+    played = games[(games["season"] == season) & (games["game_status"] == "final")]
+
+    home_abbr = teams.loc[played["home_team_id"], "team_abbreviation"].to_numpy()
+    away_abbr = teams.loc[played["away_team_id"], "team_abbreviation"].to_numpy()
+    home_won = (played["home_score"] > played["away_score"]).to_numpy(dtype=bool)
+    margin = (played["home_score"] - played["away_score"]).to_numpy(dtype=int)
+
+    sides = []
+    for team_ids, abbr, matchup, won, points, plus_minus in (
+        (played["home_team_id"], home_abbr, home_abbr + " vs. " + away_abbr, home_won, played["home_score"], margin),
+        (played["away_team_id"], away_abbr, away_abbr + " @ " + home_abbr, ~home_won, played["away_score"], -margin),
+    ):
+        sides.append(pd.DataFrame({
+            "SEASON_ID": f"2{season}",
+            "TEAM_ID": team_ids.to_numpy(),
+            "TEAM_ABBREVIATION": abbr,
+            "TEAM_NAME": teams.loc[team_ids, "team_name"].to_numpy(),
+            "GAME_ID": played["game_id"].to_numpy(),
+            "GAME_DATE": played["game_date"].dt.strftime("%Y-%m-%d").to_numpy(),
+            "MATCHUP": matchup,
+            "WL": np.where(won, "W", "L"),
+            "PTS": points.astype(int).to_numpy(),
+            "PLUS_MINUS": plus_minus,
+        }))
+
+    rows = pd.concat(sides, ignore_index=True).sort_values(["GAME_DATE", "GAME_ID"], kind="stable")
+    return {
+        "resource": "leaguegamefinder",
+        "parameters": {"SeasonNullable": season_string(season)},
+        "resultSets": [{
+            "name": "LeagueGameFinderResults",
+            "headers": LEAGUE_GAME_FINDER_HEADERS,
+            "rowSet": rows[LEAGUE_GAME_FINDER_HEADERS].to_numpy().tolist(),
+        }],
+    }
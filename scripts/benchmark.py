@@ -0,0 +1,301 @@
+"""
+Benchmark Script
+
+Times the data pipeline's hot paths on a seeded synthetic league
+(app/utils/synthetic_league.py):
+
+    import_app      python -c "import app.main" in a fresh interpreter
+    ingest          LeagueGameFinder payload -> paired games, per season
+    features        build_team_stats over every game
+    elo             EloEngine.process over every game
+    write_games     upsert_games into an empty games table
+    write_stats     write_team_stats into an empty team_stats table
+    load_matchups   matchup_select for the whole history
+    predict_slate   Predictor.predict on one day's games, per day of the last season
+    predict_batch   Predictor.predict on every game at once
+
+Each run appends one JSON line per invocation to the history file with
+rows/sec and p50/p95 latency per stage, the git commit and the settings,
+then prints the change against the last run with the same settings.
+
+The API's import time also has a fixed budget (--import-budget-ms): a
+slower import fails the run whatever the history says, so heavy
+libraries don't creep back onto the startup path.
+
+Uses a throwaway SQLite file by default. Pass --database-url to run
+against a scratch PostgreSQL database (its tables are dropped and
+recreated, never point this at real data).
+
+python scripts/benchmark.py --seasons 10
+python scripts/benchmark.py --seasons 300 --repeat 1 --database-url postgresql+psycopg://localhost/scratch
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Engine, create_engine, delete
+from sqlalchemy.orm import Session
+from xgboost import XGBClassifier
+
+from app.config import PROJECT_ROOT, get_settings
+from app.database.bulk import frame_to_records, upsert_game_ratings, upsert_games, write_team_stats
+from app.database.session import Base
+from app.ml.predictor import Predictor
+from app.models import Game, GameRating, Team, TeamStats
+from app.services.elo import EloEngine
+from app.services.team_features import MATCHUP_FEATURES, add_target, build_team_stats, matchup_select
+from app.services.team_registry import TeamRegistry
+from app.utils.query_profiler import get_query_profiler
+from app.utils.synthetic_league import league_game_finder_payload, synthetic_games, synthetic_teams
+from scripts.fetch_games import pair_season_games, result_set_frame
+
+settings = get_settings()
+
+HISTORY_PATH = "data/benchmarks/history.jsonl"
+
+# Median import time of app.main allowed, interpreter startup included
+IMPORT_BUDGET_MS = 1500
+
+
+class Stage:
+    """
+    Timings of one benchmarked step, as seconds per call.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.seconds: list[float] = []
+
+    def time(self, fn, *args, rows: int, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.seconds.append(time.perf_counter() - start)
+        self.rows += rows
+        return result
+
+    def summary(self) -> dict:
+        seconds = np.asarray(self.seconds)
+        return {
+            "rows": self.rows,
+            "calls": len(seconds),
+            "total_seconds": float(seconds.sum()),
+            "rows_per_sec": float(self.rows / seconds.sum()) if seconds.sum() > 0 else None,
+            "p50_ms": float(np.percentile(seconds, 50) * 1000),
+            "p95_ms": float(np.percentile(seconds, 95) * 1000),
+        }
+
+
+def git_commit() -> tuple[str | None, bool]:
+    """
+    Returns: Current commit hash and whether tracked files have uncommitted changes
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return commit, bool(status)
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def time_app_import(repeat: int) -> Stage:
+    """
+    Time importing the API in fresh interpreters, as a server process starts.
+    """
+    stage = Stage("import_app")
+    for _ in range(repeat):
+        stage.time(
+            subprocess.run, [sys.executable, "-c", "import app.main"],
+            cwd=PROJECT_ROOT, check=True, rows=1,
+        )
+    return stage
+
+
+def run_benchmarks(games: pd.DataFrame, engine: Engine, repeat: int) -> dict[str, Stage]:
+    stages = {name: Stage(name) for name in (
+        "ingest", "features", "elo", "write_games", "write_stats",
+        "load_matchups", "predict_slate", "predict_batch",
+    )}
+    id_map = TeamRegistry.from_defaults().id_map()
+    seasons = sorted(games["season"].unique().tolist())
+
+    # Ingestion: raw response -> frame -> one row per game, the per-season work of fetch_games
+    payloads = {season: league_game_finder_payload(games, season) for season in seasons}
+    for _ in range(repeat):
+        for season, payload in payloads.items():
+            rows = len(payload["resultSets"][0]["rowSet"])
+            stages["ingest"].time(lambda: pair_season_games(result_set_frame(payload), season, id_map), rows=rows)
+
+    for _ in range(repeat):
+        stats = stages["features"].time(build_team_stats, games, rows=len(games))
+        ratings = stages["elo"].time(EloEngine().process, games, rows=len(games))
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    game_records = frame_to_records(games.assign(game_date=games["game_date"].dt.date))
+    with Session(engine) as db:
+        db.add_all([Team(**team) for team in synthetic_teams()])
+        db.commit()
+
+        for _ in range(repeat):
+            for model in (GameRating, TeamStats, Game):
+                db.execute(delete(model))
+            db.commit()
+
+            stages["write_games"].time(upsert_games, db, game_records, rows=len(game_records))
+            db.commit()
+            stages["write_stats"].time(write_team_stats, db, stats, settings.bulk_write_memory_mb, rows=len(stats))
+            db.commit()
+
+        upsert_game_ratings(db, ratings)
+        db.commit()
+
+        for _ in range(repeat):
+            matchups = stages["load_matchups"].time(
+                lambda: pd.read_sql(matchup_select(), db.connection()), rows=len(games)
+            )
+
+    # A small model on every final game, then score the last season's days as the API would
+    matchups = add_target(matchups)
+    played = matchups[matchups["home_win"].notna()]
+    model = XGBClassifier(n_estimators=100, max_depth=4, tree_method="hist", eval_metric="logloss")
+    model.fit(played[MATCHUP_FEATURES].astype("float32"), played["home_win"].astype(int))
+    predictor = Predictor(version="benchmark", model=model, features=MATCHUP_FEATURES)
+
+    last_season = matchups[matchups["season"] == seasons[-1]]
+    slates = [slate for _, slate in last_season.groupby("game_date")]
+    for _ in range(repeat):
+        for slate in slates:
+            stages["predict_slate"].time(predictor.predict, slate, rows=len(slate))
+        stages["predict_batch"].time(predictor.predict, matchups, rows=len(matchups))
+
+    return stages
+
+
+def previous_run(history_path: Path, config: dict) -> dict | None:
+    """
+    The most recent run in the history file with the same config.
+    """
+    if not history_path.exists():
+        return None
+    previous = None
+    for line in history_path.read_text().splitlines():
+        if line.strip():
+            run = json.loads(line)
+            if run.get("config") == config:
+                previous = run
+    return previous
+
+
+def compare(current: dict, previous: dict | None, tolerance: float) -> list[str]:
+    """
+    Print each stage against the previous run.
+
+    Returns: Stages whose rows/sec dropped or p95 rose by more than tolerance
+    """
+    regressions = []
+    print(f"\n{'stage':<14} {'rows/sec':>14} {'p50 ms':>10} {'p95 ms':>10}   vs previous")
+    for name, stage in current["stages"].items():
+        line = f"{name:<14} {stage['rows_per_sec'] or 0:>14,.0f} {stage['p50_ms']:>10.2f} {stage['p95_ms']:>10.2f}"
+
+        before = (previous or {}).get("stages", {}).get(name)
+        if before and before.get("rows_per_sec") and stage["rows_per_sec"]:
+            throughput = stage["rows_per_sec"] / before["rows_per_sec"] - 1
+            latency = stage["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+            line += f"   rows/sec {throughput:+.1%}, p95 {latency:+.1%}"
+            if throughput < -tolerance or latency > tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion, features, bulk writes and prediction")
+    parser.add_argument("--seasons", type=int, default=10, help="Seasons of synthetic games (1230 each)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic league seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Times to run each stage")
+    parser.add_argument("--database-url", help="Scratch database to use instead of SQLite")
+    parser.add_argument("--output", default=HISTORY_PATH, help="JSON lines history file to append to")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Slowdown counted as a regression (0.1 = 10%%)")
+    parser.add_argument("--profile-sql", action="store_true", help="Print the slowest SQL statements and their plans")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on a regression")
+    parser.add_argument(
+        "--import-budget-ms", type=float, default=IMPORT_BUDGET_MS,
+        help="Exit with status 1 if importing app.main takes longer (median, 0 to disable)",
+    )
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+    engine = create_engine(url)
+    dialect = engine.dialect.name
+    if args.profile_sql:
+        get_query_profiler().instrument(engine)
+
+    games = synthetic_games(args.seasons, seed=args.seed)
+    print(f"{len(games)} games over {args.seasons} season(s) on {dialect}, {args.repeat} run(s) per stage")
+
+    start = time.perf_counter()
+    stages = {"import_app": time_app_import(args.repeat), **run_benchmarks(games, engine, args.repeat)}
+    print(f"Benchmarks took {time.perf_counter() - start:.1f}s")
+
+    if args.profile_sql:
+        print("\nSQL statements by total time:")
+        print(get_query_profiler().format_report(explain_engine=engine))
+    engine.dispose()
+
+    commit, dirty = git_commit()
+    config = {
+        "seasons": args.seasons, "seed": args.seed, "repeat": args.repeat,
+        "dialect": dialect, "profile_sql": args.profile_sql,
+    }
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": config,
+        "stages": {name: stage.summary() for name, stage in stages.items()},
+    }
+
+    history_path = settings.resolve_path(args.output)
+    previous = previous_run(history_path, config)
+    regressions = compare(run, previous, args.tolerance)
+    if previous:
+        print(f"Compared with {previous['commit'] or 'unknown commit'} at {previous['timestamp']}")
+
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with history_path.open("a") as f:
+        f.write(json.dumps(run) + "\n")
+    print(f"Appended to {history_path}")
+
+    import_ms = run["stages"]["import_app"]["p50_ms"]
+    over_budget = args.import_budget_ms > 0 and import_ms > args.import_budget_ms
+    if over_budget:
+        print(f"import app.main took {import_ms:.0f} ms, over the {args.import_budget_ms:.0f} ms budget")
+
+    if over_budget or (regressions and args.fail_on_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
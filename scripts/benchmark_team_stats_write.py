@@ -0,0 +1,85 @@
+"""
+Team Stats Write Benchmark
+
+Compares writing TeamStats rows through ORM add() against the bulk
+write path in app/database/bulk.py, on synthetic data. The bulk path
+alone is also timed by scripts/benchmark.py, which keeps a history.
+
+Uses a throwaway SQLite file by default. Pass --database-url to run
+against a scratch PostgreSQL database (its tables are dropped and
+recreated, never point this at real data).
+
+python scripts/benchmark_team_stats_write.py --seasons 6
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session
+
+from app.database.bulk import frame_to_records, upsert_games, write_team_stats
+from app.database.session import Base
+from app.models import Team, TeamStats
+from app.services.team_features import build_team_stats
+from app.utils.synthetic_league import synthetic_games, synthetic_teams
+
+
+def orm_write(db: Session, stats: pd.DataFrame) -> None:
+    # The pattern used by the seed/fetch scripts: one ORM object per row
+    for record in frame_to_records(stats):
+        db.add(TeamStats(**record))
+    db.commit()
+
+
+def bulk_write(db: Session, stats: pd.DataFrame) -> None:
+    write_team_stats(db, stats)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TeamStats write paths")
+    parser.add_argument("--seasons", type=int, default=6, help="Seasons of synthetic games")
+    parser.add_argument("--database-url", help="Scratch database to use instead of SQLite")
+    args = parser.parse_args()
+
+    if args.database_url:
+        url = args.database_url
+    else:
+        url = f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    games = synthetic_games(args.seasons)
+    stats = build_team_stats(games)
+    print(f"{len(games)} games, {len(stats)} team_stats rows on {engine.dialect.name}")
+
+    with Session(engine) as db:
+        db.add_all([Team(**team) for team in synthetic_teams()])
+        db.commit()
+        upsert_games(db, frame_to_records(games.assign(game_date=games["game_date"].dt.date)))
+        db.commit()
+
+        for name, write in (("ORM add()", orm_write), ("bulk write", bulk_write)):
+            db.execute(delete(TeamStats))
+            db.commit()
+
+            start = time.perf_counter()
+            write(db, stats)
+            seconds = time.perf_counter() - start
+            print(f"  {name:<12} {seconds:7.2f}s  {len(stats) / seconds:>10,.0f} rows/sec")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Build Team Stats Script
+
+Computes TeamStats features and pre-game Elo ratings from the games
+table, bulk writes them and refreshes the Parquet feature store.
+
+By default only games that finished since the last run are processed,
+using the saved per-team state and ratings. --full rebuilds every season
+from scratch.
+
+python scripts/build_team_stats.py
+python scripts/build_team_stats.py --full
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database.bulk import upsert_game_ratings, write_team_stats
+from app.database.session import SessionLocal, get_engine
+from app.models import TeamStats
+from app.services.elo import EloEngine
+from app.services.feature_store import FeatureStore
+from app.services.team_features import build_team_stats, load_games_frame
+from app.services.team_stats_updater import TeamStatsUpdater
+from app.utils.query_profiler import get_query_profiler
+from app.utils.seasons import current_season
+
+settings = get_settings()
+
+
+def full_rebuild(db: Session) -> tuple[pd.DataFrame, TeamStatsUpdater]:
+    """
+    Compute features for every game, and the updater state as of each
+    team's latest season with a final game.
+    """
+    games = load_games_frame(db)
+    print(f"Loaded {len(games)} games")
+
+    stats = build_team_stats(games)
+    return stats, TeamStatsUpdater.from_games(games)
+
+
+def seasons_since(first: int) -> list[int]:
+    """
+    first through the current season. Seasons may have been ingested in
+    between since the state was saved, not just the current one.
+    """
+    return list(range(first, max(first, current_season()) + 1))
+
+
+def check_stats_coverage(db: Session, games: pd.DataFrame, stats: pd.DataFrame) -> None:
+    """
+    Fail if a season with final games would still have no TeamStats rows,
+    rather than let the feature store write it with empty features.
+    """
+    played = (games["game_status"] == "final") & games["home_score"].notna() & games["away_score"].notna()
+    final_seasons = set(games.loc[played, "season"])
+    covered = set(stats["season"]) | set(db.scalars(select(TeamStats.season).distinct()))
+    missing = sorted(final_seasons - covered)
+    if missing:
+        raise RuntimeError(f"No team stats computed for season(s) {missing} with final games, run with --full")
+
+
+def incremental_update(db: Session, updater: TeamStatsUpdater) -> pd.DataFrame:
+    """
+    Compute features for games that finished since the state was saved,
+    plus refreshed rows for the season's remaining scheduled games.
+    """
+    seasons = seasons_since(min(state.season for state in updater.states.values()))
+    games = load_games_frame(db, seasons=seasons)
+    print(f"Loaded {len(games)} games from season(s) {seasons}")
+
+    new_rows = updater.apply(games)
+    print(f"  {len(new_rows)} rows for newly final games")
+
+    upcoming = games[games["game_status"] != "final"].sort_values(["game_date", "game_id"])
+    upcoming_rows = updater.preview(upcoming)
+    print(f"  {len(upcoming_rows)} rows for scheduled games")
+
+    # Concatenating an empty frame warns in pandas 2.x
+    frames = [rows for rows in (new_rows, upcoming_rows) if not rows.empty]
+    stats = pd.concat(frames, ignore_index=True) if frames else new_rows
+    check_stats_coverage(db, games, stats)
+    return stats
+
+
+def update_ratings(db: Session, elo: EloEngine) -> pd.DataFrame:
+    """
+    Pre-game Elo ratings for games that finished since the engine's last
+    game, plus current ratings for scheduled games. A fresh engine rates
+    the whole history.
+    """
+    seasons = None if elo.season is None else seasons_since(elo.season)
+    games = load_games_frame(db, seasons=seasons)
+    return elo.process(games)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build TeamStats features")
+    parser.add_argument("--full", action="store_true", help="Rebuild all seasons instead of updating")
+    parser.add_argument("--profile-sql", action="store_true", help="Print the slowest SQL statements and their plans")
+    args = parser.parse_args()
+
+    state_path = settings.resolve_path(settings.team_stats_state_path)
+    elo_state_path = settings.resolve_path(settings.elo_state_path)
+
+    db = SessionLocal()
+
+    try:
+        updater = TeamStatsUpdater.load(state_path)
+
+        if args.full or not updater.states:
+            print("Rebuilding team stats for all seasons...")
+            stats, updater = full_rebuild(db)
+        else:
+            print("Updating team stats since last run...")
+            stats = incremental_update(db, updater)
+
+        elo = EloEngine() if args.full else EloEngine.load(elo_state_path)
+        ratings = update_ratings(db, elo)
+
+        report = write_team_stats(db, stats, memory_budget_mb=settings.bulk_write_memory_mb)
+        ratings_changed = upsert_game_ratings(db, ratings)
+        db.commit()
+        print(f"Wrote {report}")
+        print(f"Elo: {ratings_changed} of {len(ratings)} game ratings changed")
+
+        # Only save the state once the rows it produced are committed
+        updater.save(state_path)
+        elo.save(elo_state_path)
+
+        # Rebuild the Parquet partitions of seasons that changed
+        store = FeatureStore(settings.resolve_path(settings.feature_store_dir))
+        rebuilt = store.refresh(db, force=args.full)
+        print(f"Feature store: rebuilt season(s) {rebuilt or 'none'}")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        if args.profile_sql:
+            print("\nSQL statements by total time:")
+            print(get_query_profiler().format_report(explain_engine=get_engine()))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,26 +3,44 @@ Fetch Games Script
 
 Pulls historical game data from the NBA API and loads it into the database.
 Uses the nba_api library to fetch game logs by season.
+
+Only played games are loaded: LeagueGameFinder returns game logs, not
+the schedule, and nba_api 1.4.1 has no schedule endpoint. Every row is
+stored as "final", so this script never creates the scheduled games
+that simulate_season.py, the team stats previews and the predictions
+slate work from. Those have to be loaded some other way.
 """
 
 import sys
-import time
 import argparse
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, time, timedelta, timezone
 
 # Add project root to Python path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from nba_api.stats.endpoints import leaguegamefinder
+import pandas as pd
+import requests
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.database.session import SessionLocal
-from app.models import Team, Game
+from app.database.bulk import frame_to_records, upsert_games
+from app.database.session import SessionLocal, get_engine
+from app.models import Game
 from app.config import get_settings
+from app.services.standings import refresh_affected
+from app.services.team_registry import load_team_registry
+from app.utils.fetch_scheduler import FetchScheduler
+from app.utils.query_profiler import get_query_profiler
+from app.utils.rate_limit import TokenBucket
+from app.utils.response_cache import ResponseCache
+from app.utils.seasons import current_season, is_completed_season, season_end, season_string
 
 settings = get_settings()
 
+# Cache namespace for LeagueGameFinder responses
+LEAGUE_GAME_FINDER = "leaguegamefinder"
+
 # Map NBA API team abbreviations to our database
 # Some teams have different abbreviations in the API
 #TEAM_ABBREV_MAP = {
@@ -32,124 +50,209 @@ settings = get_settings()
 def get_team_id_map(db: Session) -> dict[str, int]:
     """
     Create a mapping of team abbreviation to team_id.
+
+    Returns an empty mapping if the teams table hasn't been seeded, since
+    games can't reference the default team ids.
+    """
+    registry = load_team_registry(db)
+    if registry.source != "database":
+        return {}
+    return registry.id_map()
+
+
+def pair_season_games(games_df: pd.DataFrame, season: int, team_id_map: dict[str, int]) -> pd.DataFrame:
+    """
+    Turn LeagueGameFinder team rows into one row per game.
+
+    LeagueGameFinder returns every game twice (once per team). Instead of
+    filtering the frame once per GAME_ID, split the rows into home and away
+    with a single mask on MATCHUP and join the two halves on GAME_ID.
+
+    Returns: DataFrame with the columns of the games table
+    """
+    # Games that don't have exactly one row per team can't be paired
+    rows_per_game = games_df.groupby("GAME_ID")["GAME_ID"].transform("size")
+    bad_ids = games_df.loc[rows_per_game != 2, "GAME_ID"].unique()
+    for game_id in bad_ids:
+        print(f"  Warning: Game {game_id} does not have 2 rows, skipping")
+    games_df = games_df[rows_per_game == 2]
+
+    # MATCHUP field contains "NYK vs. LAL" for home team, "LAL @ NYK" for away
+    is_home = games_df["MATCHUP"].str.contains(" vs. ", regex=False)
+    is_away = games_df["MATCHUP"].str.contains(" @ ", regex=False)
+
+    columns = ["GAME_ID", "GAME_DATE", "TEAM_ABBREVIATION", "PTS"]
+    home = games_df.loc[is_home, columns].drop_duplicates("GAME_ID", keep=False)
+    away = games_df.loc[is_away, columns].drop_duplicates("GAME_ID", keep=False)
+
+    paired = home.merge(away, on="GAME_ID", suffixes=("_HOME", "_AWAY"))
+
+    unpaired = set(games_df["GAME_ID"]) - set(paired["GAME_ID"])
+    for game_id in sorted(unpaired):
+        print(f"  Warning: Could not determine home/away for game {game_id}, skipping")
+
+    # Map to our team IDs
+    home_team_id = paired["TEAM_ABBREVIATION_HOME"].map(team_id_map)
+    away_team_id = paired["TEAM_ABBREVIATION_AWAY"].map(team_id_map)
+
+    for side, team_ids in (("HOME", home_team_id), ("AWAY", away_team_id)):
+        unknown = paired.loc[team_ids.isna(), ["GAME_ID", f"TEAM_ABBREVIATION_{side}"]]
+        for game_id, abbrev in unknown.itertuples(index=False):
+            print(f"  Warning: Unknown team {abbrev}, skipping game {game_id}")
+
+    known = home_team_id.notna() & away_team_id.notna()
+    paired = paired[known]
+
+    return pd.DataFrame({
+        "game_id": paired["GAME_ID"].astype(str),
+        "game_date": pd.to_datetime(paired["GAME_DATE_HOME"], format="%Y-%m-%d").dt.date,
+        "season": season,
+        "home_team_id": home_team_id[known].astype(int),
+        "away_team_id": away_team_id[known].astype(int),
+        "home_score": pd.to_numeric(paired["PTS_HOME"]).astype("Int64"),
+        "away_score": pd.to_numeric(paired["PTS_AWAY"]).astype("Int64"),
+        # Game logs only exist for played games, see the module docstring
+        "game_status": "final",
+        "is_playoffs": False,
+    }).reset_index(drop=True)
+
+
+def get_sync_mark(db: Session, season: int) -> date | None:
+    """
+    High-water mark for incremental syncs: date of the latest final game.
+    """
+    return db.scalar(
+        select(func.max(Game.game_date)).where(
+            Game.season == season,
+            Game.game_status == "final",
+        )
+    )
+
+
+def fetch_league_games(
+    season: int,
+    cache: ResponseCache,
+    scheduler: FetchScheduler,
+    refresh: bool = False,
+    date_from: date | None = None,
+) -> pd.DataFrame:
+    """
+    Get the LeagueGameFinder rows for a season, from the local cache when possible.
+
+    Completed seasons are cached forever once fetched after the season
+    ended, so a partial payload from while it was running is fetched
+    again one last time. The current season is re-fetched once its entry
+    is older than settings.nba_cache_ttl_minutes. Network requests go
+    through the scheduler's rate limiter and retries.
+
+    If date_from is given only games on or after that date are requested.
+    """
+    params = {
+        "season_nullable": season_string(season),
+        "league_id_nullable": "00",  # NBA
+        "season_type_nullable": "Regular Season",
+    }
+    if date_from is not None:
+        # LeagueGameFinder expects MM/DD/YYYY
+        params["date_from_nullable"] = date_from.strftime("%m/%d/%Y")
+
+    if is_completed_season(season):
+        max_age = None
+        fetched_since = datetime.combine(season_end(season), time.min, tzinfo=timezone.utc)
+    else:
+        max_age = timedelta(minutes=settings.nba_cache_ttl_minutes)
+        fetched_since = None
+
+    payload = None if refresh else cache.get(LEAGUE_GAME_FINDER, params, max_age=max_age, fetched_since=fetched_since)
+    if payload is not None:
+        print(f"  {season_string(season)}: using cached response")
+    else:
+        print(f"  {season_string(season)}: requesting from NBA API")
+        payload = scheduler.call(request_league_games, params)
+        cache.put(LEAGUE_GAME_FINDER, params, payload)
+
+    return result_set_frame(payload)
+
+
+def request_league_games(params: dict) -> dict:
+    """
+    Call LeagueGameFinder and return the raw response.
     """
-    teams = db.query(Team).all()
-    return {team.team_abbreviation: team.team_id for team in teams}
+    # Imported here so runs served from the response cache (and the benchmark,
+    # which reuses the parsing) don't load nba_api
+    from nba_api.stats.endpoints import leaguegamefinder
+
+    # LeagueGameFinder returns games from the perspective of each team
+    # So each game appears twice (once for each team)
+    game_finder = leaguegamefinder.LeagueGameFinder(**params, timeout=settings.nba_api_timeout)
+    return game_finder.get_dict()
 
 
-def fetch_season_games(season: int, db: Session, team_id_map: dict[str, int]) -> int:
+def build_scheduler() -> FetchScheduler:
     """
-    Get all games for a given season from NBA API.
+    Create the shared rate limiter and thread pool settings for NBA API calls.
+    """
+    limiter = None
+    if settings.nba_api_delay > 0:
+        limiter = TokenBucket(rate=1 / settings.nba_api_delay, capacity=settings.nba_api_burst)
+    return FetchScheduler(
+        limiter,
+        max_workers=settings.nba_api_max_concurrency,
+        max_retries=settings.nba_api_max_retries,
+        backoff_seconds=settings.nba_api_backoff_seconds,
+        retry_on=(requests.exceptions.Timeout, requests.exceptions.ConnectionError, TimeoutError),
+    )
+
+
+def result_set_frame(payload: dict, index: int = 0) -> pd.DataFrame:
+    """
+    Build a DataFrame from one result set of a raw stats.nba.com response.
+    """
+    result_set = payload["resultSets"][index]
+    return pd.DataFrame(result_set["rowSet"], columns=result_set["headers"])
 
-    Returns: Number of games added
+
+def load_season_games(
+    season: int,
+    games_df: pd.DataFrame,
+    db: Session,
+    team_id_map: dict[str, int],
+) -> int:
     """
-    print(f"\nGetting {season}-{str(season + 1)[-2:]} season...")
+    Pair a season's LeagueGameFinder rows into games and upsert them.
 
-    # NBA API uses format "2024-25" for season
-    season_str = f"{season}-{str(season + 1)[-2:]}"
+    Returns: Number of games added or updated
+    """
+    season_str = season_string(season)
+    print(f"\nLoading {season_str} season...")
 
-    # Add delay to avoid rate limiting
-    time.sleep(settings.nba_api_delay)
+    if games_df.empty:
+        print(f"  No games found for {season_str}")
+        return 0
+
+    print(f"  Found {len(games_df)} game records (each game counted twice)")
 
     try:
-        # All games for the season
-        # LeagueGameFinder returns games from the perspective of each team
-        # So each game appears twice (once for each team)
-        game_finder = leaguegamefinder.LeagueGameFinder(
-            season_nullable=season_str,
-            league_id_nullable="00",  # NBA
-            season_type_nullable="Regular Season",
-            timeout=settings.nba_api_timeout,
-        )
+        # Pair home/away rows for the whole season in one pass
+        season_games = pair_season_games(games_df, season, team_id_map)
+        print(f"  Processing {len(season_games)} unique games...")
+
+        # One set-based upsert instead of a lookup per game
+        changed = upsert_games(db, frame_to_records(season_games))
+        games_changed = len(changed)
 
-        games_df = game_finder.get_data_frames()[0]
-
-        if games_df.empty:
-            print(f"  No games found for {season_str}")
-            return 0
-
-        print(f"  Found {len(games_df)} game records (each game counted twice)")
-
-        # Process games - we'll see each game twice, once per team
-        games_added = 0
-        games_skipped = 0
-
-        # Get unique game IDs
-        unique_game_ids = games_df["GAME_ID"].unique()
-        print(f"  Processing {len(unique_game_ids)} unique games...")
-
-        for game_id in unique_game_ids:
-            # Check if game already exists
-            existing = db.query(Game).filter(Game.game_id == game_id).first()
-            if existing:
-                games_skipped += 1
-                continue
-
-            # Get both rows for this game (home and away team perspectives)
-            game_rows = games_df[games_df["GAME_ID"] == game_id]
-
-            if len(game_rows) != 2:
-                print(f"  Warning: Game {game_id} has {len(game_rows)} rows, skipping")
-                continue
-
-            # Determine home and away teams
-            # MATCHUP field contains "NYK vs. LAL" for home team, "LAL @ NYK" for away
-            home_row = game_rows[game_rows["MATCHUP"].str.contains(" vs. ")].iloc[0] if len(
-                game_rows[game_rows["MATCHUP"].str.contains(" vs. ")]) > 0 else None
-            away_row = game_rows[game_rows["MATCHUP"].str.contains(" @ ")].iloc[0] if len(
-                game_rows[game_rows["MATCHUP"].str.contains(" @ ")]) > 0 else None
-
-            if home_row is None or away_row is None:
-                print(f"  Warning: Could not determine home/away for game {game_id}, skipping")
-                continue
-
-            # Get team abbreviations
-            home_abbrev = home_row["TEAM_ABBREVIATION"]
-            away_abbrev = away_row["TEAM_ABBREVIATION"]
-
-            # Map to our team IDs
-            # home_abbrev = TEAM_ABBREV_MAP.get(home_abbrev, home_abbrev)
-            # away_abbrev = TEAM_ABBREV_MAP.get(away_abbrev, away_abbrev)
-
-            if home_abbrev not in team_id_map:
-                print(f"  Warning: Unknown team {home_abbrev}, skipping game {game_id}")
-                continue
-            if away_abbrev not in team_id_map:
-                print(f"  Warning: Unknown team {away_abbrev}, skipping game {game_id}")
-                continue
-
-            # Parse game date
-            game_date = datetime.strptime(home_row["GAME_DATE"], "%Y-%m-%d").date()
-
-            # Create game record
-            game = Game(
-                game_id=game_id,
-                game_date=game_date,
-                season=season,
-                home_team_id=team_id_map[home_abbrev],
-                away_team_id=team_id_map[away_abbrev],
-                home_score=int(home_row["PTS"]) if home_row["PTS"] else None,
-                away_score=int(away_row["PTS"]) if away_row["PTS"] else None,
-                game_status="final",
-                is_playoffs=False,
-            )
-
-            db.add(game)
-            games_added += 1
-
-            # Commit in batches of 100
-            if games_added % 100 == 0:
-                db.commit()
-                print(f"  Added {games_added} games...")
-
-        # Final commit
+        # Standings only need rebuilding for the teams that played the new finals
+        summaries = refresh_affected(db, changed)
         db.commit()
-        print(f"  Done! Added {games_added} games, skipped {games_skipped} existing")
 
-        return games_added
+        games_unchanged = len(season_games) - games_changed
+        print(f"  Done! Added or updated {games_changed} games, {games_unchanged} unchanged")
+        print(f"  Refreshed {summaries} team season summaries")
+
+        return games_changed
 
     except Exception as e:
-        print(f"  Error getting season {season}: {e}")
+        print(f"  Error loading season {season}: {e}")
         db.rollback()
         raise
 
@@ -158,23 +261,36 @@ def main():
     parser = argparse.ArgumentParser(description="Get NBA game data")
     parser.add_argument("--season", type=int, help="Single season to collect (e.g., 2024)")
     parser.add_argument("--all", action="store_true", help="Get all seasons (2019-2024)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached responses and re-download")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only get games since the last synced game (defaults to the current season)",
+    )
+    parser.add_argument("--profile-sql", action="store_true", help="Print the slowest SQL statements and their plans")
 
     args = parser.parse_args()
 
-    if not args.season and not args.all:
-        print("Please specify --season YEAR or --all")
+    if not args.season and not args.all and not args.incremental:
+        print("Please specify --season YEAR, --all or --incremental")
         print("Example: python scripts/fetch_games.py --season 2024")
         print("Example: python scripts/fetch_games.py --all")
+        print("Example: python scripts/fetch_games.py --incremental")
         return
 
     # Determine which seasons to fetch
     if args.all:
         seasons = [2019, 2020, 2021, 2022, 2023, 2024]
-    else:
+    elif args.season:
         seasons = [args.season]
+    else:
+        seasons = [current_season()]
 
     print(f"Will fetch {len(seasons)} season(s): {seasons}")
 
+    # Raw responses are cached so re-runs don't need the network
+    cache = ResponseCache(settings.resolve_path(settings.nba_cache_dir))
+
     # Connect to database
     db = SessionLocal()
 
@@ -187,22 +303,38 @@ def main():
             print("Error: No teams in database. Run seed_teams.py first.")
             return
 
-        # Fetch each season
-        total_games = 0
-        for season in seasons:
-            games_added = fetch_season_games(season, db, team_id_map)
-            total_games += games_added
+        # In incremental mode start from the last final game we have.
+        # That day is re-read so games finished late that night aren't missed.
+        sync_marks = {season: None for season in seasons}
+        if args.incremental:
+            for season in seasons:
+                sync_marks[season] = get_sync_mark(db, season)
+                print(f"  {season_string(season)}: last synced game {sync_marks[season] or 'none, full season'}")
+
+        # Download all seasons in parallel, paced by the shared rate limiter
+        scheduler = build_scheduler()
+        print("Fetching seasons...")
+        season_frames = scheduler.map(
+            lambda season: fetch_league_games(
+                season, cache, scheduler, refresh=args.refresh, date_from=sync_marks[season]
+            ),
+            seasons,
+        )
 
-            # Add delay between seasons to avoid rate limiting
-            if season != seasons[-1]:
-                print("  Waiting before next season...")
-                time.sleep(2)
+        # Database writes stay on this thread, the session isn't thread-safe
+        total_games = 0
+        for season, games_df in zip(seasons, season_frames):
+            games_changed = load_season_games(season, games_df, db, team_id_map)
+            total_games += games_changed
 
         print(f"\n{'=' * 50}")
-        print(f"Complete! Total games added: {total_games}")
+        print(f"Complete! Total games added or updated: {total_games}")
 
     finally:
         db.close()
+        if args.profile_sql:
+            print("\nSQL statements by total time:")
+            print(get_query_profiler().format_report(explain_engine=get_engine()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+"""
+Fetch Odds Script
+
+Pulls every bookmaker's moneyline, spread and total for a day's games
+from The Odds API and upserts them into the odds table.
+
+A day is a single request. Responses are cached under data/raw/odds and
+re-validated with conditional requests, so re-running within a few
+minutes makes no request at all.
+
+python scripts/fetch_odds.py
+python scripts/fetch_odds.py --date 2025-01-15 --days 2
+"""
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import date, timedelta
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.config import get_settings
+from app.database.bulk import upsert_odds
+from app.database.session import SessionLocal
+from app.services.odds_client import OddsClient, OddsResponse, games_by_matchup, odds_rows
+from app.services.team_registry import load_team_registry
+from app.utils.response_cache import ResponseCache
+
+settings = get_settings()
+
+
+async def fetch(day: date, days: int) -> OddsResponse:
+    cache = ResponseCache(settings.resolve_path(settings.nba_cache_dir))
+
+    async with OddsClient(
+        api_key=settings.odds_api_key,
+        base_url=settings.odds_api_base_url,
+        timeout=settings.odds_api_timeout,
+        max_connections=settings.odds_api_max_connections,
+        max_retries=settings.odds_api_max_retries,
+        backoff_seconds=settings.odds_api_backoff_seconds,
+        cache=cache,
+        cache_ttl=timedelta(minutes=settings.odds_cache_ttl_minutes),
+    ) as client:
+        return await client.fetch_odds(day, days, regions=settings.odds_regions, markets=settings.odds_markets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch bookmaker odds for NBA games")
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="First day (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=1, help="Number of days to fetch")
+    args = parser.parse_args()
+
+    if not settings.odds_api_key:
+        print("Error: ODDS_API_KEY is not set.")
+        return
+
+    response = asyncio.run(fetch(args.date, args.days))
+    source = "cache" if response.from_cache else "API"
+    print(f"Got {len(response.events)} games from the {source}")
+    if response.requests_remaining is not None:
+        print(f"  {response.requests_remaining} API requests left this month")
+
+    db = SessionLocal()
+
+    try:
+        dates = [args.date + timedelta(days=i) for i in range(args.days)]
+        games = games_by_matchup(db, dates)
+        rows, unmatched = odds_rows(response.events, games, load_team_registry(db))
+        if unmatched:
+            print(f"  {unmatched} games didn't match the games table (run fetch_games.py first?)")
+
+        changed = upsert_odds(db, rows)
+        db.commit()
+        print(f"Done! {changed} of {len(rows)} lines new or changed")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
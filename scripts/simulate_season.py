@@ -0,0 +1,75 @@
+"""
+Simulate Season Script
+
+Plays out the rest of a season many times and prints projected wins,
+playoff and seed odds for every team.
+
+Remaining games are scored with the current model. If no model artifact
+exists the pre-game Elo probabilities are used instead.
+
+python scripts/simulate_season.py
+python scripts/simulate_season.py --season 2024 --sims 100000 --workers 4
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+
+from app.config import get_settings
+from app.database.session import SessionLocal
+from app.ml.predictor import ModelNotAvailableError, load_predictor
+from app.services.season_simulator import build_league, projections, simulate_parallel
+from app.services.team_registry import load_team_registry
+from app.utils.seasons import current_season
+
+settings = get_settings()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo projection of the season's standings")
+    parser.add_argument("--season", type=int, default=current_season(), help="Season start year")
+    parser.add_argument("--sims", type=int, default=10_000, help="Number of simulated seasons")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    parser.add_argument("--output", type=Path, help="Also write the projections to this CSV file")
+    args = parser.parse_args()
+
+    try:
+        predictor = load_predictor()
+        home_win_prob = predictor.predict
+        print(f"Scoring remaining games with model {predictor.version}")
+    except ModelNotAvailableError as e:
+        home_win_prob = None
+        print(f"{e}, using Elo probabilities")
+
+    db = SessionLocal()
+
+    try:
+        registry = load_team_registry(db)
+        league = build_league(db, args.season, registry, home_win_prob)
+    finally:
+        db.close()
+
+    print(f"Season {args.season}: {league.n_games} games left, simulating {args.sims:,} times...")
+
+    start = time.perf_counter()
+    tally = simulate_parallel(league, args.sims, args.workers, args.seed, settings.simulation_memory_mb)
+    print(f"Done in {time.perf_counter() - start:.2f}s\n")
+
+    table = projections(league, tally, registry)
+    with pd.option_context("display.max_rows", None, "display.width", 160, "display.float_format", "{:.3f}".format):
+        print(table.drop(columns=["team_id", "seed_probs"]).to_string(index=False))
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
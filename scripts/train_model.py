@@ -0,0 +1,241 @@
+"""
+Train Model Script
+
+Trains the XGBoost home-win model with a hyperparameter grid search and
+season-based walk-forward validation: for every validation season S the
+model is trained on all seasons before S.
+
+The feature matrix is read once from the Parquet feature store and handed
+to each worker process when it starts, so folds never touch the database.
+Every (parameters, season) fold is an independent single-threaded job,
+which lets the search scale with the number of worker processes.
+
+The best parameters are refit on every final game and written to
+data/models under a new model version, along with the search metrics.
+
+python scripts/train_model.py
+python scripts/train_model.py --version v2 --workers 8
+"""
+
+import sys
+import json
+import time
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss, roc_auc_score
+from xgboost import XGBClassifier
+
+from app.config import get_settings
+from app.database.session import SessionLocal
+from app.ml.predictor import save_artifact
+from app.services.feature_store import FeatureStore
+from app.services.team_features import MATCHUP_FEATURES
+
+settings = get_settings()
+
+PARAM_GRID = {
+    "n_estimators": [200, 400],
+    "max_depth": [3, 4, 6],
+    "learning_rate": [0.03, 0.1],
+    "subsample": [0.8],
+    "colsample_bytree": [0.8],
+}
+
+# Seasons that are always training data, never validated on
+MIN_TRAIN_SEASONS = 2
+
+# Set in each worker by _init_worker
+_X: np.ndarray | None = None
+_y: np.ndarray | None = None
+_seasons: np.ndarray | None = None
+
+
+def load_training_matrix() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Features, target and season of every final game, from the feature store.
+
+    Returns: X (float32), y (0/1) and season arrays, in the same row order
+    """
+    store = FeatureStore(settings.resolve_path(settings.feature_store_dir))
+
+    # Make sure the store reflects the database before training on it
+    db = SessionLocal()
+    try:
+        rebuilt = store.refresh(db)
+        if rebuilt:
+            print(f"Feature store: rebuilt season(s) {rebuilt}")
+    finally:
+        db.close()
+
+    matrix = store.load(columns=["season", "home_win", *MATCHUP_FEATURES])
+    matrix = matrix[matrix["home_win"].notna()]
+
+    X = matrix[MATCHUP_FEATURES].astype("float32").to_numpy()
+    y = matrix["home_win"].astype(int).to_numpy()
+    seasons = matrix["season"].astype(int).to_numpy()
+    return X, y, seasons
+
+
+def param_grid() -> list[dict]:
+    names = list(PARAM_GRID)
+    return [dict(zip(names, values)) for values in itertools.product(*PARAM_GRID.values())]
+
+
+def walk_forward_seasons(seasons: np.ndarray) -> list[int]:
+    """
+    Seasons to validate on: every season with enough earlier seasons to train on.
+    """
+    return sorted(set(seasons.tolist()))[MIN_TRAIN_SEASONS:]
+
+
+METRICS = ("log_loss", "brier", "accuracy", "auc")
+
+
+def score(y_true: np.ndarray, probabilities: np.ndarray) -> dict[str, float | None]:
+    metrics = {
+        "log_loss": log_loss(y_true, probabilities, labels=[0, 1]),
+        "brier": brier_score_loss(y_true, probabilities),
+        "accuracy": accuracy_score(y_true, probabilities >= 0.5),
+    }
+    # AUC is undefined if the fold only has one class. None rather than NaN,
+    # which isn't valid JSON
+    metrics["auc"] = float(roc_auc_score(y_true, probabilities)) if len(set(y_true)) > 1 else None
+    return metrics
+
+
+def mean_metric(values: list[float | None]) -> float | None:
+    # Folds where the metric is undefined are left out
+    defined = [value for value in values if value is not None]
+    return float(np.mean(defined)) if defined else None
+
+
+def make_model(params: dict, n_jobs: int) -> XGBClassifier:
+    return XGBClassifier(**params, n_jobs=n_jobs, tree_method="hist", eval_metric="logloss")
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, seasons: np.ndarray) -> None:
+    # Each worker receives the matrix once, not once per fold
+    global _X, _y, _seasons
+    _X, _y, _seasons = X, y, seasons
+
+
+def run_fold(params_id: int, params: dict, season: int, n_jobs: int) -> dict:
+    """
+    Train on seasons before season and validate on season.
+    """
+    train = _seasons < season
+    valid = _seasons == season
+
+    start = time.perf_counter()
+    model = make_model(params, n_jobs)
+    model.fit(_X[train], _y[train])
+    probabilities = model.predict_proba(_X[valid])[:, 1]
+
+    return {
+        "params_id": params_id,
+        "season": season,
+        "train_rows": int(train.sum()),
+        "valid_rows": int(valid.sum()),
+        "seconds": time.perf_counter() - start,
+        **score(_y[valid], probabilities),
+    }
+
+
+def summarize(folds: list[dict], grid: list[dict]) -> list[dict]:
+    """
+    Mean validation metrics per parameter set, best (lowest log loss) first.
+    """
+    results = []
+    for params_id, params in enumerate(grid):
+        mine = [fold for fold in folds if fold["params_id"] == params_id]
+        results.append({
+            "params": params,
+            **{metric: mean_metric([fold[metric] for fold in mine]) for metric in METRICS},
+            "folds": mine,
+        })
+    return sorted(results, key=lambda result: result["log_loss"])
+
+
+def cpu_budget() -> int:
+    # 0 means use every core
+    return settings.training_cpu_budget or os.cpu_count() or 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the game prediction model")
+    parser.add_argument("--version", default=datetime.now().strftime("v%Y%m%d%H%M"), help="Model version to write")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: the CPU budget)")
+    args = parser.parse_args()
+
+    budget = cpu_budget()
+    workers = min(args.workers or budget, budget)
+
+    X, y, seasons = load_training_matrix()
+    validation_seasons = walk_forward_seasons(seasons)
+    if not validation_seasons:
+        print(f"Error: need more than {MIN_TRAIN_SEASONS} seasons of final games to validate.")
+        return
+
+    grid = param_grid()
+    jobs = [(params_id, params, season) for params_id, params in enumerate(grid) for season in validation_seasons]
+    print(f"Training matrix: {len(y)} games from seasons {sorted(set(seasons.tolist()))}")
+    print(f"Search: {len(grid)} parameter sets x {len(validation_seasons)} folds = {len(jobs)} fits on {workers} workers")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X, y, seasons)) as pool:
+        futures = [pool.submit(run_fold, params_id, params, season, 1) for params_id, params, season in jobs]
+        folds = [future.result() for future in futures]
+    search_seconds = time.perf_counter() - start
+
+    fit_seconds = sum(fold["seconds"] for fold in folds)
+    print(f"Search took {search_seconds:.1f}s wall time, {fit_seconds:.1f}s summed over fits")
+
+    results = summarize(folds, grid)
+    best = results[0]
+    print(f"Best: {best['params']}")
+    auc = "n/a" if best["auc"] is None else f"{best['auc']:.3f}"
+    print(f"  log loss {best['log_loss']:.4f}, brier {best['brier']:.4f}, accuracy {best['accuracy']:.3f}, auc {auc}")
+
+    # Refit on every final game using the whole CPU budget
+    model = make_model(best["params"], n_jobs=budget)
+    model.fit(X, y)
+
+    model_dir = settings.resolve_path(settings.model_dir)
+    path = save_artifact(
+        model,
+        MATCHUP_FEATURES,
+        model_dir,
+        args.version,
+        meta={
+            "trained_at": datetime.now().isoformat(timespec="seconds"),
+            "params": best["params"],
+            "train_seasons": sorted(set(seasons.tolist())),
+            "train_rows": len(y),
+            "validation": {metric: best[metric] for metric in METRICS},
+        },
+    )
+
+    metrics_path = model_dir / f"{args.version}.metrics.json"
+    metrics_path.write_text(json.dumps({
+        "version": args.version,
+        "validation_seasons": validation_seasons,
+        "workers": workers,
+        "search_seconds": search_seconds,
+        "results": results,
+    }, indent=2, allow_nan=False))
+
+    print(f"Wrote {path} and {metrics_path.name}")
+    print(f"Set MODEL_VERSION={args.version} to serve it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+build_team_stats.py picks up every season ingested since its state was
+saved, not just the current one.
+"""
+
+import warnings
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.database.bulk import frame_to_records, upsert_games, write_team_stats
+from app.database.session import Base
+from app.services.elo import EloEngine
+from app.services.team_features import build_team_stats
+from app.services.team_stats_updater import TeamStatsUpdater
+from app.utils.synthetic_league import synthetic_games
+from scripts import build_team_stats as script
+
+FIRST_SEASON = 2021
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(scope="module")
+def games() -> pd.DataFrame:
+    return synthetic_games(3, first_season=FIRST_SEASON, seed=3)
+
+
+def insert_games(db: Session, games: pd.DataFrame) -> None:
+    rows = games.assign(game_date=games["game_date"].dt.date, is_playoffs=False)
+    upsert_games(db, frame_to_records(rows))
+    db.commit()
+
+
+def test_incremental_update_loads_gap_seasons(db, games, monkeypatch):
+    monkeypatch.setattr(script, "current_season", lambda: FIRST_SEASON + 5)
+    first = games[games["season"] == FIRST_SEASON]
+    insert_games(db, first)
+    stats, updater = script.full_rebuild(db)
+    write_team_stats(db, stats)
+    db.commit()
+
+    # Two later seasons are ingested; neither is the current season
+    insert_games(db, games[games["season"] > FIRST_SEASON])
+    new_stats = script.incremental_update(db, updater)
+
+    assert set(new_stats["season"]) == {FIRST_SEASON + 1, FIRST_SEASON + 2}
+    expected = build_team_stats(games)
+    expected = expected[expected["season"] > FIRST_SEASON]
+    assert len(new_stats) == len(expected)
+
+
+def test_incremental_update_with_only_scheduled_games(db, monkeypatch):
+    monkeypatch.setattr(script, "current_season", lambda: FIRST_SEASON)
+    games = synthetic_games(1, first_season=FIRST_SEASON, seed=3, scheduled_fraction=0.2)
+    insert_games(db, games)
+    stats, updater = script.full_rebuild(db)
+
+    # Nothing newly final: no FutureWarning from concatenating the empty frame
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        upcoming = script.incremental_update(db, updater)
+
+    assert set(upcoming["game_id"]) == set(games.loc[games["game_status"] == "scheduled", "game_id"])
+
+
+def test_missing_season_fails_loudly(db, games):
+    first = games[games["season"] == FIRST_SEASON]
+    insert_games(db, first)
+
+    with pytest.raises(RuntimeError, match=str(FIRST_SEASON)):
+        script.check_stats_coverage(db, first, TeamStatsUpdater().apply(first.head(0)))
+
+
+def test_update_ratings_loads_gap_seasons(db, games, monkeypatch):
+    monkeypatch.setattr(script, "current_season", lambda: FIRST_SEASON + 5)
+    insert_games(db, games[games["season"] == FIRST_SEASON])
+    elo = EloEngine()
+    script.update_ratings(db, elo)
+
+    insert_games(db, games[games["season"] > FIRST_SEASON])
+    ratings = script.update_ratings(db, elo)
+
+    assert set(ratings["season"]) == {FIRST_SEASON + 1, FIRST_SEASON + 2}
+    full = EloEngine()
+    full.process(games)
+    assert elo.ratings.tolist() == pytest.approx(full.ratings.tolist())
@@ -0,0 +1,70 @@
+"""
+Incremental Elo updates must match a full pass over the history, late games included.
+"""
+
+import pandas as pd
+import pytest
+
+from app.services.elo import EloEngine
+from app.utils.synthetic_league import synthetic_games
+
+
+@pytest.fixture(scope="module")
+def games() -> pd.DataFrame:
+    return synthetic_games(2, seed=11, scheduled_fraction=0.3)
+
+
+def full_ratings(games: pd.DataFrame) -> tuple[EloEngine, pd.DataFrame]:
+    engine = EloEngine()
+    return engine, engine.process(games)
+
+
+def latest(rows: pd.DataFrame) -> pd.DataFrame:
+    return rows.drop_duplicates("game_id", keep="last").sort_values("game_id", ignore_index=True)
+
+
+def test_incremental_matches_full_pass(games, tmp_path):
+    final_dates = sorted(games.loc[games["game_status"] == "final", "game_date"].unique())
+    cutoff = final_dates[len(final_dates) * 3 // 4]
+
+    engine = EloEngine()
+    before = engine.process(games[games["game_date"] <= cutoff])
+    engine.save(tmp_path / "elo.json")
+    engine = EloEngine.load(tmp_path / "elo.json")
+    after = engine.process(games[games["season"] == engine.season])
+
+    full, expected = full_ratings(games)
+    assert engine.ratings.tolist() == pytest.approx(full.ratings.tolist())
+    pd.testing.assert_frame_equal(latest(pd.concat([before, after])), latest(expected))
+
+
+def test_late_game_replays_season(games, caplog, tmp_path):
+    final = games[games["game_status"] == "final"]
+    last_season = final[final["season"] == final["season"].max()]
+    late = last_season.iloc[len(last_season) // 2]
+
+    # Everything but one mid-season game, which then turns up after later games
+    engine = EloEngine()
+    before = engine.process(games[games["game_id"] != late["game_id"]])
+    engine.save(tmp_path / "elo.json")
+    engine = EloEngine.load(tmp_path / "elo.json")
+    with caplog.at_level("WARNING"):
+        after = engine.process(games[games["season"] == engine.season])
+
+    assert late["game_id"] in caplog.text
+    # Every final game of the season is re-rated
+    assert set(last_season["game_id"]) <= set(after["game_id"])
+
+    full, expected = full_ratings(games)
+    assert engine.ratings.tolist() == pytest.approx(full.ratings.tolist())
+    pd.testing.assert_frame_equal(latest(pd.concat([before, after])), latest(expected))
+
+
+def test_nothing_new_gives_only_scheduled_rows(games):
+    engine, _ = full_ratings(games)
+    ratings_before = engine.ratings.tolist()
+
+    rows = engine.process(games[games["season"] == engine.season])
+
+    assert set(rows["game_id"]) == set(games.loc[games["game_status"] != "final", "game_id"])
+    assert engine.ratings.tolist() == ratings_before
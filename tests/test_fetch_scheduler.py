@@ -0,0 +1,127 @@
+"""
+TokenBucket pacing and FetchScheduler retries, on a fake clock.
+"""
+
+import pytest
+
+from app.utils import fetch_scheduler
+from app.utils.fetch_scheduler import FetchScheduler
+from app.utils.rate_limit import TokenBucket
+from scripts import fetch_games
+
+
+class FakeClock:
+    """
+    Monotonic clock that only moves when something sleeps on it.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_token_bucket_burst_then_paced(clock):
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(6)]
+
+    # The burst goes straight through, then one request every 1 / rate seconds
+    assert waits == [0, 0, 0, 0.5, 0.5, 0.5]
+    assert clock.now == pytest.approx(1.5)
+
+
+def test_token_bucket_refills_while_idle(clock):
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    bucket.acquire()
+
+    clock.now += 10  # Refills up to capacity only
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 1]
+
+
+def test_token_bucket_validates_arguments():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=0)
+
+
+class Flaky:
+    """
+    Raises error the first `failures` calls, then returns "ok".
+    """
+
+    def __init__(self, failures: int, error: type[BaseException] = TimeoutError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("boom")
+        return "ok"
+
+
+@pytest.fixture
+def max_jitter(monkeypatch):
+    # Full jitter draws from [0, cap], take the cap so delays are predictable
+    monkeypatch.setattr(fetch_scheduler.random, "uniform", lambda low, high: high)
+
+
+def scheduler(clock: FakeClock, max_retries: int = 3) -> FetchScheduler:
+    limiter = TokenBucket(rate=10, capacity=1, clock=clock, sleep=clock.sleep)
+    return FetchScheduler(limiter, max_retries=max_retries, backoff_seconds=1.0, sleep=clock.sleep)
+
+
+def test_retries_with_exponential_backoff(clock, max_jitter, caplog):
+    fn = Flaky(failures=3)
+
+    with caplog.at_level("WARNING"):
+        assert scheduler(clock).call(fn) == "ok"
+
+    assert fn.calls == 4
+    # Backoff doubles each attempt; the 0.1s gaps were covered by the backoff sleeps
+    assert clock.sleeps == [1.0, 2.0, 4.0]
+    assert [record.getMessage() for record in caplog.records][-1] == "Request failed (TimeoutError), retrying in 4.0s"
+
+
+def test_gives_up_after_max_retries(clock, max_jitter):
+    fn = Flaky(failures=10)
+
+    with pytest.raises(TimeoutError):
+        scheduler(clock, max_retries=2).call(fn)
+    assert fn.calls == 3
+
+
+def test_other_errors_are_not_retried(clock):
+    fn = Flaky(failures=1, error=KeyError)
+
+    with pytest.raises(KeyError):
+        scheduler(clock).call(fn)
+    assert fn.calls == 1
+
+
+def test_map_keeps_order():
+    pool = FetchScheduler(None, max_workers=4)
+    assert pool.map(lambda item: pool.call(lambda: item * 2), range(10)) == [i * 2 for i in range(10)]
+
+
+def test_zero_delay_means_no_pacing(monkeypatch):
+    monkeypatch.setattr(fetch_games.settings, "nba_api_delay", 0)
+    assert fetch_games.build_scheduler().limiter is None
+
+    monkeypatch.setattr(fetch_games.settings, "nba_api_delay", 0.5)
+    assert fetch_games.build_scheduler().limiter.rate == 2
@@ -0,0 +1,60 @@
+"""
+Import-time budget for the API.
+
+Runs `python -c "import app.main"` in a fresh interpreter, as a server
+process starts, and checks that heavy libraries stay off the startup
+path and the import stays within budget.
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+from app.config import PROJECT_ROOT
+
+# Wall time of the whole subprocess, interpreter startup included.
+# Mostly FastAPI; loading pandas or pyarrow eagerly again would push past it.
+IMPORT_BUDGET_SECONDS = 2.0
+
+# Only loaded by the code paths that use them, or by the lifespan hook
+LAZY_MODULES = ["pandas", "numpy", "xgboost", "nba_api", "pyarrow", "psycopg"]
+
+CHILD = f"""
+import json, sys
+import app.main
+print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))
+"""
+
+
+def import_app() -> tuple[float, list[str]]:
+    """
+    Returns: Wall time of the import in a fresh interpreter and the lazy modules it loaded
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    seconds = time.perf_counter() - start
+    return seconds, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_leaves_heavy_modules_unloaded():
+    _, loaded = import_app()
+    assert loaded == []
+
+
+def test_import_within_budget():
+    # Best of three, so one slow run on a busy machine doesn't fail the suite
+    seconds = min(import_app()[0] for _ in range(3))
+    assert seconds < IMPORT_BUDGET_SECONDS, f"import app.main took {seconds:.2f}s"
+
+
+def test_import_is_warning_free():
+    # e.g. pydantic's protected namespace warning for a model_* field
+    result = subprocess.run(
+        [sys.executable, "-W", "error::UserWarning", "-c", "import app.main"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,60 @@
+"""
+MetricsMiddleware labels every metric, the in-flight gauge included, by route template.
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.metrics import MetricsMiddleware, MetricsRegistry
+
+
+def make_client() -> tuple[TestClient, MetricsRegistry, list[dict]]:
+    registry = MetricsRegistry()
+    seen_in_progress = []
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    @app.get("/teams/{abbr}")
+    async def team(abbr: str) -> dict:
+        seen_in_progress.append(dict(registry.in_progress))
+        return {"abbr": abbr}
+
+    @app.get("/metrics")
+    async def metrics() -> str:
+        return registry.render()
+
+    return TestClient(app), registry, seen_in_progress
+
+
+def test_in_progress_labelled_by_route():
+    client, registry, seen = make_client()
+
+    client.get("/teams/BOS")
+
+    assert seen == [{("GET", "/teams/{abbr}"): 1}]
+    assert registry.in_progress[("GET", "/teams/{abbr}")] == 0
+    assert registry.requests == {("GET", "/teams/{abbr}", "200"): 1}
+
+
+def test_unmatched_and_wrong_method():
+    client, registry, _ = make_client()
+
+    client.get("/nope/1")
+    client.post("/teams/BOS")
+
+    assert registry.requests == {
+        ("GET", "unmatched", "404"): 1,
+        ("POST", "/teams/{abbr}", "405"): 1,
+    }
+
+
+def test_render_includes_route_on_gauge():
+    client, _, _ = make_client()
+    client.get("/teams/BOS")
+    client.get("/teams/NYK")
+
+    text = client.get("/metrics").json()
+
+    assert 'http_requests_in_progress{method="GET",route="/metrics"} 1' in text
+    assert 'http_requests_in_progress{method="GET",route="/teams/{abbr}"} 0' in text
+    assert 'http_requests_total{method="GET",route="/teams/{abbr}",status="200"} 2' in text
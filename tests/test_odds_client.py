@@ -0,0 +1,160 @@
+"""
+OddsClient against httpx.MockTransport: caching, conditional requests and retries.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from app.services.odds_client import OddsClient
+from app.utils.response_cache import ResponseCache
+
+EVENTS = [{"id": "event-1", "home_team": "Boston Celtics", "away_team": "New York Knicks"}]
+ETAG = '"v1"'
+
+
+class FakeOddsApi:
+    """
+    Handler for httpx.MockTransport. Serves EVENTS with an ETag, answers
+    a matching If-None-Match with 304, and fails the first `failures`
+    requests with `failure_status`.
+    """
+
+    def __init__(self, failures: int = 0, failure_status: int = 503, retry_after: str | None = None):
+        self.failures = failures
+        self.failure_status = failure_status
+        self.retry_after = retry_after
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if len(self.requests) <= self.failures:
+            headers = {"retry-after": self.retry_after} if self.retry_after else {}
+            return httpx.Response(self.failure_status, headers=headers)
+        if request.headers.get("if-none-match") == ETAG:
+            return httpx.Response(304, headers={"x-requests-remaining": "99"})
+        return httpx.Response(200, json=EVENTS, headers={"etag": ETAG, "x-requests-remaining": "100"})
+
+
+class Sleeps:
+    def __init__(self):
+        self.delays: list[float] = []
+
+    async def __call__(self, seconds: float) -> None:
+        self.delays.append(seconds)
+
+
+def fetch(api: FakeOddsApi, cache: ResponseCache | None = None, sleep: Sleeps | None = None, **kwargs):
+    async def run():
+        async with OddsClient(
+            api_key="secret",
+            base_url="https://odds.test/v4",
+            cache=cache,
+            transport=httpx.MockTransport(api),
+            sleep=sleep or Sleeps(),
+            **kwargs,
+        ) as client:
+            return await client.fetch_odds(date(2025, 1, 15))
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def cache(tmp_path) -> ResponseCache:
+    return ResponseCache(tmp_path)
+
+
+def test_fetches_a_day_in_one_request():
+    api = FakeOddsApi()
+    response = fetch(api)
+
+    assert response.events == EVENTS
+    assert not response.from_cache
+    assert response.requests_remaining == "100"
+    assert len(api.requests) == 1
+    request = api.requests[0]
+    assert request.url.path == "/v4/sports/basketball_nba/odds"
+    assert request.url.params["apiKey"] == "secret"
+    # Eastern midnight to midnight, in UTC
+    assert request.url.params["commenceTimeFrom"] == "2025-01-15T05:00:00Z"
+    assert request.url.params["commenceTimeTo"] == "2025-01-16T05:00:00Z"
+
+
+def test_fresh_cache_makes_no_request(cache):
+    fetch(FakeOddsApi(), cache)
+    api = FakeOddsApi()
+
+    response = fetch(api, cache)
+
+    assert response.from_cache and response.events == EVENTS
+    assert api.requests == []
+    # The API key stays out of the cache
+    assert all(b"secret" not in path.read_bytes() for path in cache.root.rglob("*.json.gz"))
+
+
+def test_stale_cache_revalidates_with_etag(cache):
+    fetch(FakeOddsApi(), cache)
+    api = FakeOddsApi()
+
+    response = fetch(api, cache, cache_ttl=timedelta(0))
+
+    assert api.requests[0].headers["if-none-match"] == ETAG
+    assert response.from_cache
+    assert response.events == EVENTS
+    assert response.requests_remaining == "99"
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_retries_rate_limits_and_server_errors(status):
+    api = FakeOddsApi(failures=2, failure_status=status)
+    sleep = Sleeps()
+
+    response = fetch(api, sleep=sleep, backoff_seconds=1.0)
+
+    assert response.events == EVENTS
+    assert len(api.requests) == 3
+    # Full jitter stays under the doubling cap
+    assert len(sleep.delays) == 2
+    assert 0 <= sleep.delays[0] <= 1.0 and 0 <= sleep.delays[1] <= 2.0
+
+
+def test_retry_after_is_honoured():
+    sleep = Sleeps()
+    fetch(FakeOddsApi(failures=1, failure_status=429, retry_after="7"), sleep=sleep)
+    assert sleep.delays == [7.0]
+
+
+def test_gives_up_after_max_retries():
+    api = FakeOddsApi(failures=10, failure_status=503)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(api, max_retries=2)
+    assert len(api.requests) == 3
+
+
+def test_client_errors_are_not_retried():
+    api = FakeOddsApi(failures=1, failure_status=401)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(api)
+    assert len(api.requests) == 1
+
+
+def test_connection_errors_are_retried():
+    api = FakeOddsApi()
+    attempts = []
+
+    def flaky(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return api(request)
+
+    async def run():
+        async with OddsClient("secret", "https://odds.test/v4", transport=httpx.MockTransport(flaky), sleep=Sleeps()) as client:
+            return await client.fetch_odds(date(2025, 1, 15))
+
+    assert asyncio.run(run()).events == EVENTS
+    assert len(attempts) == 2
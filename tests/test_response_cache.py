@@ -0,0 +1,149 @@
+"""
+ResponseCache expiry, and how fetch_games.py uses it: completed seasons
+are cached forever once fetched after they ended, the current season
+for nba_cache_ttl_minutes.
+"""
+
+import gzip
+import json
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from app.utils.response_cache import ResponseCache
+from app.utils.seasons import current_season, season_end
+from scripts import fetch_games
+
+PARAMS = {"season_nullable": "2020-21", "league_id_nullable": "00"}
+
+
+def payload(game_id: str) -> dict:
+    return {"resultSets": [{"headers": ["GAME_ID"], "rowSet": [[game_id]]}]}
+
+
+def age_since(day: date) -> timedelta:
+    return datetime.now(timezone.utc) - datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def backdate(cache: ResponseCache, endpoint: str, params: dict, age: timedelta) -> None:
+    path = cache.path_for(endpoint, params)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entry = json.load(f)
+    entry["fetched_at"] = (datetime.now(timezone.utc) - age).isoformat()
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(entry, f)
+
+
+@pytest.fixture
+def cache(tmp_path) -> ResponseCache:
+    return ResponseCache(tmp_path)
+
+
+def test_key_ignores_parameter_order(cache):
+    reordered = dict(reversed(PARAMS.items()))
+    assert cache.path_for("games", PARAMS) == cache.path_for("games", reordered)
+    assert cache.path_for("games", PARAMS) != cache.path_for("other", PARAMS)
+
+
+def test_max_age(cache):
+    assert cache.get("games", PARAMS) is None
+
+    cache.put("games", PARAMS, payload("1"))
+    backdate(cache, "games", PARAMS, timedelta(minutes=30))
+
+    assert cache.get("games", PARAMS, max_age=timedelta(hours=1)) == payload("1")
+    assert cache.get("games", PARAMS, max_age=timedelta(minutes=10)) is None
+    # Without a max_age the entry never expires
+    assert cache.get("games", PARAMS) == payload("1")
+
+
+def test_corrupt_entry_is_a_miss(cache):
+    path = cache.put("games", PARAMS, payload("1"))
+    path.write_bytes(b"not gzip")
+    assert cache.get("games", PARAMS) is None
+
+
+class FakeScheduler:
+    def __init__(self, game_id: str):
+        self.game_id = game_id
+        self.calls = 0
+
+    def call(self, fn, params):
+        self.calls += 1
+        return payload(self.game_id)
+
+
+def season_params(season: int) -> dict:
+    return {
+        "season_nullable": fetch_games.season_string(season),
+        "league_id_nullable": "00",
+        "season_type_nullable": "Regular Season",
+    }
+
+
+def test_completed_season_cached_forever(cache):
+    # Fetched a year ago, well after the season ended
+    season = current_season() - 2
+    cache.put(fetch_games.LEAGUE_GAME_FINDER, season_params(season), payload("old"))
+    backdate(cache, fetch_games.LEAGUE_GAME_FINDER, season_params(season), timedelta(days=365))
+    scheduler = FakeScheduler("new")
+
+    games = fetch_games.fetch_league_games(season, cache, scheduler)
+
+    assert scheduler.calls == 0
+    assert list(games["GAME_ID"]) == ["old"]
+
+
+def test_entry_from_before_rollover_fetched_once_more(cache):
+    # Fetched while the season was still running, so it may be missing its last games
+    season = current_season() - 1
+    params = season_params(season)
+    cache.put(fetch_games.LEAGUE_GAME_FINDER, params, payload("partial"))
+    backdate(cache, fetch_games.LEAGUE_GAME_FINDER, params, age_since(season_end(season)) + timedelta(days=1))
+    scheduler = FakeScheduler("complete")
+
+    assert list(fetch_games.fetch_league_games(season, cache, scheduler)["GAME_ID"]) == ["complete"]
+    assert scheduler.calls == 1
+
+    # The new entry postdates the rollover and is kept for good
+    backdate(cache, fetch_games.LEAGUE_GAME_FINDER, params, age_since(season_end(season)) - timedelta(hours=1))
+    assert list(fetch_games.fetch_league_games(season, cache, scheduler)["GAME_ID"]) == ["complete"]
+    assert scheduler.calls == 1
+
+
+def test_fetched_since(cache):
+    cache.put("games", PARAMS, payload("1"))
+    backdate(cache, "games", PARAMS, timedelta(days=2))
+    now = datetime.now(timezone.utc)
+
+    assert cache.get("games", PARAMS, fetched_since=now - timedelta(days=3)) == payload("1")
+    assert cache.get("games", PARAMS, fetched_since=now - timedelta(days=1)) is None
+
+
+def test_current_season_expires(cache, monkeypatch):
+    monkeypatch.setattr(fetch_games.settings, "nba_cache_ttl_minutes", 60)
+    season = current_season()
+    params = season_params(season)
+    cache.put(fetch_games.LEAGUE_GAME_FINDER, params, payload("old"))
+    scheduler = FakeScheduler("new")
+
+    # Fresh entry: no request
+    assert list(fetch_games.fetch_league_games(season, cache, scheduler)["GAME_ID"]) == ["old"]
+    assert scheduler.calls == 0
+
+    # Past the TTL: requested again and the cache updated
+    backdate(cache, fetch_games.LEAGUE_GAME_FINDER, params, timedelta(minutes=61))
+    assert list(fetch_games.fetch_league_games(season, cache, scheduler)["GAME_ID"]) == ["new"]
+    assert scheduler.calls == 1
+    assert cache.get(fetch_games.LEAGUE_GAME_FINDER, params) == payload("new")
+
+
+def test_refresh_skips_the_cache(cache):
+    season = current_season() - 2
+    cache.put(fetch_games.LEAGUE_GAME_FINDER, season_params(season), payload("old"))
+    scheduler = FakeScheduler("new")
+
+    games = fetch_games.fetch_league_games(season, cache, scheduler, refresh=True)
+
+    assert scheduler.calls == 1
+    assert list(games["GAME_ID"]) == ["new"]
@@ -0,0 +1,39 @@
+"""
+build_league leaves out remaining games with teams the registry doesn't know.
+"""
+
+import pandas as pd
+
+from app.services import season_simulator
+from app.services.season_simulator import build_league, simulate
+from app.services.team_registry import TeamRegistry
+
+
+def test_unknown_team_games_left_out(monkeypatch, caplog):
+    registry = TeamRegistry.from_defaults()
+    final = pd.DataFrame({
+        "game_id": ["1"],
+        "home_team_id": [1],
+        "away_team_id": [2],
+        "home_score": pd.array([100], dtype="Int64"),
+        "away_score": pd.array([90], dtype="Int64"),
+        "game_status": ["final"],
+    })
+    remaining = pd.DataFrame({
+        "game_id": ["2", "3", "4"],
+        "home_team_id": [1, 99, 3],
+        "away_team_id": [2, 1, 4],
+        "elo_home_win_prob": [0.6, 0.5, None],
+    })
+    monkeypatch.setattr(season_simulator, "load_games_frame", lambda db, seasons: final)
+    monkeypatch.setattr(season_simulator, "remaining_games", lambda db, season: remaining)
+
+    with caplog.at_level("WARNING"):
+        league = build_league(None, 2024, registry, home_win_prob=lambda games: games["elo_home_win_prob"].fillna(0.5))
+
+    assert caplog.records[-1].getMessage().endswith("1 remaining games with teams not in the registry: 3")
+    assert league.n_games == 2
+    assert list(league.home) == [0, 2]
+    assert list(league.away) == [1, 3]
+    assert list(league.home_win_prob) == [0.6, 0.5]
+    assert simulate(league, sims=10, seed=1).sims == 10
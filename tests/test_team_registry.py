@@ -0,0 +1,122 @@
+"""
+The team registry reloads when stale and doesn't keep a defaults fallback.
+"""
+
+import threading
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.services import team_registry
+from app.services.team_registry import TeamInfo, TeamRegistry, get_team_registry, load_team_registry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTeams:
+    """
+    Stands in for TeamRegistry.from_db, returning whatever teams are set.
+    """
+
+    def __init__(self):
+        self.teams: list[TeamInfo] | None = None  # None: the database is down
+        self.calls = 0
+
+    def __call__(self, db) -> TeamRegistry:
+        self.calls += 1
+        if self.teams is None:
+            raise OperationalError("select", {}, Exception("connection refused"))
+        return TeamRegistry(self.teams)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(team_registry.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def fake_teams(monkeypatch) -> FakeTeams:
+    fake = FakeTeams()
+    monkeypatch.setattr(TeamRegistry, "from_db", staticmethod(fake))
+    monkeypatch.setattr(team_registry, "_registry", None)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def reload_inline(monkeypatch):
+    # Run background reloads synchronously so the test sees their result
+    class InlineThread:
+        def __init__(self, target, **kwargs):
+            self.target = target
+
+        def start(self):
+            self.target()
+
+    monkeypatch.setattr(team_registry.threading, "Thread", InlineThread)
+    monkeypatch.setattr(team_registry, "_refresh_lock", threading.Lock())
+
+
+@pytest.fixture(autouse=True)
+def ttl(monkeypatch):
+    monkeypatch.setattr(team_registry.get_settings(), "team_registry_ttl_seconds", 300)
+
+
+def teams(name: str) -> list[TeamInfo]:
+    return [TeamInfo(1, "BOS", name, "East", "Atlantic")]
+
+
+def test_defaults_fallback_is_retried(clock, fake_teams):
+    assert get_team_registry().source == "defaults"
+
+    # The database comes up before the retry is due, so nothing changes yet
+    fake_teams.teams = teams("Boston Celtics")
+    assert get_team_registry().source == "defaults"
+
+    clock.now += team_registry.DEFAULTS_RETRY_SECONDS + 1
+    get_team_registry()  # Stale: reloads in the background, returns the old one
+    assert get_team_registry().source == "database"
+
+
+def test_database_registry_reloads_after_ttl(clock, fake_teams):
+    fake_teams.teams = teams("Boston Celtics")
+    before = load_team_registry()
+
+    fake_teams.teams = teams("Boston Green")
+    clock.now += 299
+    assert get_team_registry() is before
+
+    clock.now += 2
+    get_team_registry()
+    after = get_team_registry()
+    assert after.by_id(1).team_name == "Boston Green"
+    assert after.version != before.version
+
+
+def test_failed_reload_keeps_database_teams(clock, fake_teams):
+    fake_teams.teams = teams("Boston Celtics")
+    before = load_team_registry()
+
+    fake_teams.teams = None
+    clock.now += 301
+    get_team_registry()
+
+    assert get_team_registry() is before
+    assert fake_teams.calls == 2
+
+
+def test_zero_ttl_loads_once(clock, fake_teams, monkeypatch):
+    monkeypatch.setattr(team_registry.get_settings(), "team_registry_ttl_seconds", 0)
+    fake_teams.teams = teams("Boston Celtics")
+    load_team_registry()
+
+    clock.now += 10**6
+    get_team_registry()
+    assert fake_teams.calls == 1
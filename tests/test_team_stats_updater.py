@@ -0,0 +1,93 @@
+"""
+Incremental TeamStats updates must match a full rebuild exactly.
+"""
+
+import pandas as pd
+import pytest
+
+from app.services.team_features import FEATURE_COLUMNS, build_team_stats
+from app.services.team_stats_updater import TeamStatsUpdater
+from app.utils.synthetic_league import synthetic_games
+
+KEY = ["team_id", "game_id"]
+
+
+@pytest.fixture(scope="module")
+def games() -> pd.DataFrame:
+    # The last season is partly played, so upcoming games get preview rows
+    return synthetic_games(2, seed=7, scheduled_fraction=0.3)
+
+
+def comparable(stats: pd.DataFrame) -> pd.DataFrame:
+    stats = stats.drop_duplicates(KEY, keep="last").sort_values(KEY, ignore_index=True)
+    return stats[[*KEY, "season", *FEATURE_COLUMNS]].astype({column: "float64" for column in FEATURE_COLUMNS})
+
+
+def run_in_batches(updater: TeamStatsUpdater, games: pd.DataFrame, batches: int) -> pd.DataFrame:
+    """
+    Apply final games a few dates at a time, each time passing every game
+    loaded so far, as build_team_stats.py does between fetches.
+    """
+    dates = sorted(games.loc[games["game_status"] == "final", "game_date"].unique())
+    cutoffs = [dates[len(dates) * (i + 1) // batches - 1] for i in range(batches)]
+
+    rows = [updater.apply(games[games["game_date"] <= cutoff]) for cutoff in cutoffs]
+    upcoming = games[games["game_status"] != "final"].sort_values(["game_date", "game_id"])
+    rows.append(updater.preview(upcoming))
+    return pd.concat(rows, ignore_index=True)
+
+
+def test_incremental_matches_full_rebuild(games):
+    incremental = run_in_batches(TeamStatsUpdater(), games, batches=7)
+
+    pd.testing.assert_frame_equal(comparable(incremental), comparable(build_team_stats(games)))
+
+
+def test_state_round_trips_through_json(games, tmp_path):
+    first_half = games[games["season"] == games["season"].min()]
+    updater = TeamStatsUpdater()
+    before = updater.apply(first_half)
+    updater.save(tmp_path / "state.json")
+
+    loaded = TeamStatsUpdater.load(tmp_path / "state.json")
+    after = loaded.apply(games)
+    upcoming = loaded.preview(games[games["game_status"] != "final"].sort_values(["game_date", "game_id"]))
+    incremental = pd.concat([before, after, upcoming], ignore_index=True)
+
+    pd.testing.assert_frame_equal(comparable(incremental), comparable(build_team_stats(games)))
+
+
+def test_late_final_game_rebuilds_team_season(games, caplog):
+    final = games[games["game_status"] == "final"]
+    last_season = final[final["season"] == final["season"].max()]
+    late = last_season.iloc[len(last_season) // 2]
+
+    # Everything but one mid-season game, which then turns up after later games
+    updater = TeamStatsUpdater()
+    before = updater.apply(games[games["game_id"] != late["game_id"]])
+    with caplog.at_level("WARNING"):
+        after = updater.apply(games)
+
+    assert late["game_id"] in caplog.text
+    assert set(after["team_id"]) == {late["home_team_id"], late["away_team_id"]}
+
+    upcoming = updater.preview(games[games["game_status"] != "final"].sort_values(["game_date", "game_id"]))
+    incremental = pd.concat([before, after, upcoming], ignore_index=True)
+    pd.testing.assert_frame_equal(comparable(incremental), comparable(build_team_stats(games)))
+
+
+def test_from_games_skips_seasons_without_final_games(games):
+    next_season = games[games["season"] == games["season"].max()].head(15).assign(
+        season=games["season"].max() + 1,
+        game_id=lambda frame: "next" + frame["game_id"],
+        game_date=lambda frame: frame["game_date"] + pd.Timedelta(days=365),
+        home_score=pd.NA,
+        away_score=pd.NA,
+        game_status="scheduled",
+    ).astype({"home_score": "Int64", "away_score": "Int64"})
+
+    updater = TeamStatsUpdater.from_games(pd.concat([games, next_season], ignore_index=True))
+
+    assert len(updater.states) == 30
+    assert {state.season for state in updater.states.values()} == {games["season"].max()}
+    assert all(state.wins + state.losses > 0 for state in updater.states.values())
@@ -0,0 +1,38 @@
+"""
+Validation metrics stay valid JSON when a fold has only one class.
+"""
+
+import json
+
+import numpy as np
+
+from scripts.train_model import score, summarize
+
+
+def test_single_class_fold_has_no_auc():
+    metrics = score(np.array([1, 1, 1]), np.array([0.7, 0.6, 0.9]))
+
+    assert metrics["auc"] is None
+    json.dumps(metrics, allow_nan=False)
+
+
+def test_summary_skips_undefined_auc():
+    grid = [{"max_depth": 3}]
+    folds = [
+        {"params_id": 0, **score(np.array([1, 1]), np.array([0.6, 0.8]))},
+        {"params_id": 0, **score(np.array([0, 1]), np.array([0.3, 0.8]))},
+    ]
+
+    [result] = summarize(folds, grid)
+
+    assert result["auc"] == 1.0
+    json.dumps(result, allow_nan=False)
+
+
+def test_summary_with_no_defined_auc():
+    folds = [{"params_id": 0, **score(np.array([0, 0]), np.array([0.3, 0.4]))}]
+
+    [result] = summarize(folds, [{}])
+
+    assert result["auc"] is None
+    assert json.loads(json.dumps(result, allow_nan=False))["auc"] is None